@@ -0,0 +1,55 @@
+"""
+Bar başına HealthChecker.analyze_roi ile tek geçişli BarAnalysisEngine'i karşılaştırır.
+Bar sayısı arttıkça (parti üyeleri, hedef HP...) tick başına süreyi ve bar başına ek maliyeti
+(bir önceki satıra göre) ölçer; engine'de dönüşüm ve morfoloji bar sayısından bağımsızdır.
+Çalıştırma (proje kökünden):  python -m benchmarks.bench_bar_engine
+"""
+import numpy as np
+
+import config
+from features.health_checker import HealthChecker
+from features.bar_analysis_engine import BarAnalysisEngine
+from benchmarks.timing import best_of
+from benchmarks.synthetic import make_bar
+
+RANGES = [
+    ("Health", config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV),
+    ("Mana", config.MANA_LIGHT_HSV, config.MANA_DARK_HSV),
+    ("Stamina", config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV),
+]
+
+
+def main(bar_w=120, bar_h=8, gap=4, method="projection"):
+    rng = np.random.default_rng(0)
+    print(f"method={method} bar={bar_w}x{bar_h}")
+    print(f"{'bars':>5} {'per-bar us':>11} {'engine us':>10} {'x':>6} {'us/bar':>7} {'+us/bar':>8} {'max |d%|':>9}")
+    prev = None
+    for n in (1, 2, 3, 6, 9, 12, 24):
+        checkers, rects, rows = {}, {}, []
+        for i in range(n):
+            colors, light, dark = RANGES[i % len(RANGES)]
+            feat = f"bar{i}"
+            checkers[feat] = HealthChecker(light, dark, method=method)
+            y0 = i * (bar_h + gap)
+            rects[feat] = (0, y0, bar_w, y0 + bar_h)
+            rows.append(make_bar(bar_w, bar_h, rng.uniform(0.1, 0.9), rng, feature=colors, bgra=True))
+            rows.append(np.zeros((gap, bar_w, 4), dtype=np.uint8))
+        frame = np.ascontiguousarray(np.vstack(rows))
+        engine = BarAnalysisEngine(checkers)
+
+        def per_bar():
+            return {f: checkers[f].analyze_roi(frame[y0:y1, x0:x1]) for f, (x0, y0, x1, y1) in rects.items()}
+
+        t_bar = best_of(per_bar, 100)
+        t_eng = best_of(lambda: engine.analyze(frame, rects), 100)
+        a, b = per_bar(), engine.analyze(frame, rects)
+        diff = max(abs(a[f] - b[f]) for f in rects)
+        marginal = "-" if prev is None else f"{(t_eng - prev[1]) / (n - prev[0]) * 1e6:8.1f}"
+        prev = (n, t_eng)
+        print(f"{n:5d} {t_bar * 1e6:11.1f} {t_eng * 1e6:10.1f} {t_bar / t_eng:6.2f} {t_eng / n * 1e6:7.1f}"
+              f" {marginal:>8} {diff:9.3f}")
+
+
+if __name__ == "__main__":
+    for m in ("projection", "pixel"):
+        main(method=m)
@@ -0,0 +1,73 @@
+"""
+Ekran yakalama: aktif platform backend'inin grab() süresi bölge boyutuna göre; mss kuruluysa
+aynı bölgeler mss ile de ölçülür ve pikseller (alfa hariç) karşılaştırılır.
+Bir X ekranı gerekir; Linux'ta Xvfb ile de çalışır:
+
+  python -m benchmarks.bench_capture
+  xvfb-run -s "-screen 0 1920x1080x24" python -m benchmarks.bench_capture --backend x11
+"""
+import argparse
+import time
+
+import numpy as np
+
+import config
+from core.backends import backend_name, get_backend
+
+# (w, h): bar bölgesi, çoklu istemci birleşik bölgesi, tam pencere
+SIZES = ((240, 40), (640, 120), (800, 600), (1280, 720))
+
+
+class _MssGrabber:
+    def __init__(self):
+        import mss
+        self.sct = mss.mss()
+
+    def grab(self, region):
+        s = self.sct.grab(region)
+        return np.frombuffer(s.raw, dtype=np.uint8).reshape(s.height, s.width, 4)
+
+
+def rate(fn, seconds):
+    fn()
+    n = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        fn()
+        n += 1
+    return (time.perf_counter() - t0) / n
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Screen capture latency per backend")
+    ap.add_argument("--backend", choices=("windows", "x11"), help="varsayılan: platforma göre")
+    ap.add_argument("--seconds", type=float, default=1.0, help="case başına ölçüm süresi")
+    args = ap.parse_args(argv)
+    if args.backend:
+        config.BACKEND = args.backend
+
+    grabbers = [(backend_name(), get_backend().open_capture())]
+    try:
+        grabbers.append(("mss", _MssGrabber()))
+    except Exception as e:
+        print("[bench] mss yok, karşılaştırma atlandı:", e)
+
+    print(f"{'size':<11} " + " ".join(f"{name + ' us':>12}" for name, _ in grabbers) + f" {'match':>6}")
+    for w, h in SIZES:
+        region = {"left": 0, "top": 0, "width": w, "height": h}
+        times, frames = [], []
+        try:
+            for _, g in grabbers:
+                times.append(rate(lambda: g.grab(region), args.seconds))
+                frames.append(np.array(g.grab(region)[..., :3]))
+        except Exception as e:
+            print(f"{w}x{h:<6} atlandı: {e}")
+            continue
+        match = "yes" if all(np.array_equal(frames[0], f) for f in frames[1:]) else "NO"
+        print(f"{f'{w}x{h}':<11} " + " ".join(f"{t * 1e6:12.0f}" for t in times)
+              + f" {match if len(frames) > 1 else '-':>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""
+HealthChecker.analyze_roi: HSV yolu (cvtColor + inRange + morfoloji) ile use_lut yolunu
+(ColorClassLUT gather, morfoloji yok) uçtan uca karşılaştırır; 'max |d%|' iki yolun
+yüzde farkıdır (tolerans: core/color_lut.py). Girişler bot'un kullandığı formatta
+(zero-copy capture'dan gelen BGRA) üretilir. Son tablo, Health/Mana/Stamina'nın bir tick'i:
+BarAnalysisEngine (ortak HSV) ve use_lut checker'lar.
+Çalıştırma (proje kökünden):  python -m benchmarks.bench_color_lut
+"""
+import time
+import numpy as np
+
+import config
+from core.color_lut import ColorClassLUT, LUT_TOLERANCE
+from features.health_checker import HealthChecker
+from features.bar_analysis_engine import BarAnalysisEngine
+from benchmarks.timing import best_of
+from benchmarks.synthetic import make_bar
+
+RANGES = {
+    "Health": (config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV),
+    "Mana": (config.MANA_LIGHT_HSV, config.MANA_DARK_HSV),
+    "Stamina": (config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV),
+}
+
+
+def build_times():
+    light, dark = RANGES["Health"]
+    t0 = time.perf_counter()
+    lut = ColorClassLUT(light, dark)
+    print(f"LUT build (cold): {(time.perf_counter() - t0) * 1000:.1f} ms")
+    t0 = time.perf_counter()
+    lut.set_light_hsv((0, 110, 120), light[1])
+    print(f"LUT incremental rebuild (one class): {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+
+def per_roi(method, samples=50):
+    rng = np.random.default_rng(0)
+    hsv = {f: HealthChecker(l, d, method=method) for f, (l, d) in RANGES.items()}
+    lut = {f: HealthChecker(l, d, method=method, use_lut=True) for f, (l, d) in RANGES.items()}
+    print(f"method={method}")
+    print(f"{'size':>10} {'hsv us':>8} {'lut us':>8} {'x':>6} {'max |d%|':>9}")
+    for w, h in [(120, 8), (240, 12), (480, 24)]:
+        roi = make_bar(w, h, 0.63, rng, bgra=True)
+        t_hsv = best_of(lambda: hsv["Health"].analyze_roi(roi), 200)
+        t_lut = best_of(lambda: lut["Health"].analyze_roi(roi), 200)
+        diff = 0.0
+        for i in range(samples):
+            feat = list(RANGES)[i % len(RANGES)]
+            bar = make_bar(w, h, rng.uniform(0.0, 1.0), rng, feature=feat, bgra=True)
+            diff = max(diff, abs(hsv[feat].analyze_roi(bar) - lut[feat].analyze_roi(bar)))
+        print(f"{w}x{h:<5} {t_hsv * 1e6:8.1f} {t_lut * 1e6:8.1f} {t_hsv / t_lut:6.2f} {diff:9.3f}")
+
+
+def per_tick(bar_w=120, bar_h=8, gap=4):
+    rng = np.random.default_rng(1)
+    rows, rects = [], {}
+    for i, feat in enumerate(RANGES):
+        rows.append(make_bar(bar_w, bar_h, rng.uniform(0.1, 0.9), rng, feature=feat, bgra=True))
+        rows.append(np.zeros((gap, bar_w, 4), dtype=np.uint8))
+        y0 = i * (bar_h + gap)
+        rects[feat] = (0, y0, bar_w, y0 + bar_h)
+    frame = np.ascontiguousarray(np.vstack(rows))
+    print(f"tick: {len(rects)} bars {bar_w}x{bar_h}")
+    for name, use_lut in (("engine (hsv)", False), ("use_lut", True)):
+        engine = BarAnalysisEngine({f: HealthChecker(l, d, use_lut=use_lut) for f, (l, d) in RANGES.items()})
+        print(f"  {name:<13} {best_of(lambda: engine.analyze(frame, rects), 200) * 1e6:8.1f} us")
+
+
+def main():
+    build_times()
+    for method in ("projection", "pixel", "contour"):
+        per_roi(method)
+    per_tick()
+    print(f"(süreler us; tolerans {LUT_TOLERANCE} puan)")
+
+
+if __name__ == "__main__":
+    main()
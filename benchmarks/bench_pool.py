@@ -0,0 +1,107 @@
+"""
+Çoklu istemci analizi: bot thread'inde seri (istemci başına BarAnalysisEngine) ile
+core.analysis_pool.AnalysisPool (shared memory + process havuzu) karşılaştırması.
+
+Sentetik masaüstü: yan yana N istemci penceresi, her birinde 3 bar'lı menü; tüm bar'lar
+tek birleşik bölge olarak (çoklu istemci modundaki gibi) analiz edilir. Her worker
+sayısı için tick/s ve seriye göre hızlanma raporlanır; sonuçların seriyle aynı olduğu
+kontrol edilir. Hızlanma çekirdek sayısıyla sınırlıdır (os.cpu_count() yazdırılır).
+
+  python -m benchmarks.bench_pool
+  python -m benchmarks.bench_pool --clients 16 --workers 1,2,4,8
+"""
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+import config
+from core.analysis_pool import AnalysisPool
+from features.health_checker import HealthChecker
+from features.bar_analysis_engine import BarAnalysisEngine
+from benchmarks.synthetic import make_menu_frame
+
+FEATURES = ("Health", "Mana", "Stamina")
+RANGES = {
+    "Health": (config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV),
+    "Mana": (config.MANA_LIGHT_HSV, config.MANA_DARK_HSV),
+    "Stamina": (config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV),
+}
+
+
+def make_desktop(n_clients, win_w, win_h, bar_w, rng):
+    """N pencere yan yana (satır başına 4) -> (BGRA masaüstü, {client: {feature: rect}}, {client: {feature: fill}})."""
+    cols = min(4, n_clients)
+    rows = (n_clients + cols - 1) // cols
+    desk = np.zeros((rows * win_h, cols * win_w, 4), dtype=np.uint8)
+    rects, fills = {}, {}
+    for ci in range(n_clients):
+        ox, oy = (ci % cols) * win_w, (ci // cols) * win_h
+        f = {feat: float(rng.uniform(0.1, 0.9)) for feat in FEATURES}
+        frame, _, bars = make_menu_frame(win_w, win_h, f, rng, bar_w=bar_w)
+        desk[oy:oy + win_h, ox:ox + win_w] = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
+        rects[ci] = {feat: (x + ox, y + oy, x + ox + w, y + oy + h) for feat, (x, y, w, h) in bars.items()}
+        fills[ci] = f
+    return desk, rects, fills
+
+
+def crop_to_bars(desk, rects):
+    """Çoklu istemci capture planı gibi: tüm bar'ları kapsayan tek bölge + bölge-lokal rect'ler."""
+    allr = [r for rs in rects.values() for r in rs.values()]
+    x0, y0 = min(r[0] for r in allr), min(r[1] for r in allr)
+    x1, y1 = max(r[2] for r in allr), max(r[3] for r in allr)
+    local = {ci: {f: (a - x0, b - y0, c - x0, d - y0) for f, (a, b, c, d) in rs.items()} for ci, rs in rects.items()}
+    return desk[y0:y1, x0:x1], local
+
+
+def rate(fn, seconds):
+    fn()
+    n = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        fn()
+        n += 1
+    return n / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Process-pool client analysis throughput")
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--workers", default="1,2,4")
+    ap.add_argument("--method", default="projection")
+    ap.add_argument("--bar-w", type=int, default=240, help="bar genişliği (px)")
+    ap.add_argument("--seconds", type=float, default=2.0, help="case başına ölçüm süresi")
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    desk, rects, _ = make_desktop(args.clients, 640, 360, args.bar_w, rng)
+    frame, local = crop_to_bars(desk, rects)
+    checkers = {ci: {f: HealthChecker(*RANGES[f], method=args.method) for f in FEATURES} for ci in local}
+    # aynı aralıklar -> tek analizci yeter (worker'lar da spec başına bir tane kurar)
+    engine = BarAnalysisEngine(checkers[0])
+
+    def serial():
+        return {ci: engine.analyze(frame, rs) for ci, rs in local.items()}
+
+    expected = serial()
+    print(f"cpu_count={os.cpu_count()} clients={args.clients} region={frame.shape[1]}x{frame.shape[0]} "
+          f"method={args.method}")
+    print(f"{'mode':<12} {'ticks/s':>9} {'ms/tick':>8} {'speedup':>8} {'match':>6}")
+    base = rate(serial, args.seconds)
+    print(f"{'serial':<12} {base:9.1f} {1e3 / base:8.2f} {1.0:8.2f} {'yes':>6}")
+    for n in (int(w) for w in args.workers.split(",")):
+        pool = AnalysisPool(n, checkers)
+        try:
+            got = pool.analyze(frame, local)
+            r = rate(lambda: pool.analyze(frame, local), args.seconds)
+        finally:
+            pool.close()
+        match = "yes" if got == expected else "NO"
+        print(f"{f'pool x{n}':<12} {r:9.1f} {1e3 / r:8.2f} {r / base:8.2f} {match:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
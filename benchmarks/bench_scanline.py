@@ -0,0 +1,73 @@
+"""
+method="scanline" ile method="projection" karşılaştırması (aynı ROI'ler üzerinde).
+Her bar boyutu için: ortalama süre, bilinen doluluğa göre ortalama mutlak hata (mae)
+ve iki yöntem arasındaki en büyük fark (yüzde puanı).
+
+İkinci tablo track_edge=True (kenar bandı takibi): doluluk frame'ler arasında yavaşça
+değişirken ara sıra büyük hasar / tam heal sıçramaları olan bir dizi; okuma başına süre,
+bantla çözülen okuma oranı ve tam analize göre en büyük fark.
+Çalıştırma (proje kökünden):  python -m benchmarks.bench_scanline
+"""
+import numpy as np
+
+import config
+from features.health_checker import HealthChecker
+from benchmarks.timing import timeit
+from benchmarks.synthetic import make_bar
+
+BAR_SIZES = ((60, 3), (120, 8), (240, 12), (480, 24))
+
+
+def main(n=200):
+    rng = np.random.default_rng(0)
+    proj = HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method="projection")
+    scan = HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method="scanline")
+    print(f"{'bar':>8} {'proj us':>8} {'scan us':>8} {'x':>6} {'proj mae':>9} {'scan mae':>9} {'max |d%|':>9}")
+    for w, h in BAR_SIZES:
+        fills = rng.uniform(0.0, 1.0, size=n)
+        rois = [make_bar(w, h, f, rng, bgra=True) for f in fills]
+        a = np.array([proj.analyze_roi(r) for r in rois])
+        b = np.array([scan.analyze_roi(r) for r in rois])
+        t_proj = timeit(lambda: [proj.analyze_roi(r) for r in rois], 5) / n
+        t_scan = timeit(lambda: [scan.analyze_roi(r) for r in rois], 5) / n
+        print(f"{f'{w}x{h}':>8} {t_proj * 1e6:8.1f} {t_scan * 1e6:8.1f} {t_proj / t_scan:6.2f} "
+              f"{np.abs(a - fills * 100).mean():9.3f} {np.abs(b - fills * 100).mean():9.3f} {np.abs(a - b).max():9.3f}")
+
+
+
+def make_sequence(n, rng, jump_every=50):
+    """Yavaş değişen doluluk dizisi (frame başına <= 0.5 puan); her jump_every frame'de bir sıçrama."""
+    fills = []
+    f = 0.8
+    for i in range(n):
+        if i and i % jump_every == 0:
+            f = float(rng.uniform(0.05, 1.0))
+        else:
+            f = min(1.0, max(0.0, f + float(rng.uniform(-0.005, 0.003))))
+        fills.append(f)
+    return fills
+
+
+def tracking(n=300):
+    rng = np.random.default_rng(1)
+    print(f"\n{'bar':>8} {'proj us':>8} {'scan us':>8} {'track us':>9} {'band %':>7} {'max |d%|':>9}")
+    for w, h in BAR_SIZES + ((960, 24),):
+        fills = make_sequence(n, rng)
+        rois = [make_bar(w, h, f, rng, bgra=True) for f in fills]
+        proj = HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method="projection")
+        scan = HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method="scanline")
+        track = HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method="scanline", track_edge=True)
+        full = np.array([scan.analyze_roi(r) for r in rois])
+        got = np.array([track.analyze_roi(r) for r in rois])
+        band = track.track_stats["band"] / float(n)
+        t_proj = timeit(lambda: [proj.analyze_roi(r) for r in rois], 3) / n
+        t_scan = timeit(lambda: [scan.analyze_roi(r) for r in rois], 3) / n
+        track.reset_tracking()
+        t_track = timeit(lambda: [track.analyze_roi(r) for r in rois], 3) / n
+        print(f"{f'{w}x{h}':>8} {t_proj * 1e6:8.1f} {t_scan * 1e6:8.1f} {t_track * 1e6:9.1f} {band * 100:7.1f} "
+              f"{np.abs(got - full).max():9.3f}")
+
+
+if __name__ == "__main__":
+    main()
+    tracking()
@@ -0,0 +1,231 @@
+"""
+Uçtan uca tepki süresi: ekranda can düştüğü an -> heal tuşunun gönderildiği an.
+
+Gerçek BotEngine döngüsü (scheduler, adaptif örnekleme, ROI cache, bar analizi,
+InputDispatcher) senaryolu bir frame kaynağı ve zaman damgalı sahte input ile çalıştırılır.
+--analyzer: hsv = BarAnalysisEngine (bar'lar tek ortak HSV dönüşümünde, varsayılan),
+lut = HealthChecker(use_lut=True) (bar başına renk tablosu, morfoloji yok; arayüzün kullandığı).
+Çalışan analizci başlıkta yazdırılır.
+Can bar'ı bilinen zamanlarda (döngü fazına göre rastgele) eşiğin altına düşer; her düşüş
+için ilk basışa kadar geçen süre ölçülür. Linux'ta headless çalışır.
+
+--scenario ramp: can bir burst hasarı gibi sabit hızla (--rate %/s) düşer; gecikme eşiğin
+geçildiği andan ölçülür. --predictive ile trend tahmini eşik geçilmeden basabilir (negatif gecikme).
+
+  python -m benchmarks.latency
+  python -m benchmarks.latency --quick --delays 10,50 --methods projection
+  python -m benchmarks.latency --scenario ramp --predictive --methods projection
+  python -m benchmarks.latency --quick --analyzer lut
+"""
+import argparse
+import json
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import config
+from core.bot_engine import BotEngine
+from core.input_dispatcher import RecordingBackend
+from features.health_checker import HealthChecker
+from benchmarks.synthetic import make_menu_frame
+
+DELAYS_MS = (10, 50, 100, 250)
+METHODS = ("projection", "pixel", "contour")
+ANALYZERS = ("hsv", "lut")
+
+HIGH_FILL = 0.9
+LOW_FILL = 0.2
+THRESHOLD = 50
+
+
+class ScriptedFrameSource:
+    """
+    capture/capture_bgra arayüzlü sahte ekran. Frame, clock()'a göre drops listesindeki
+    [start, end) aralıklarında düşük can, diğer zamanlarda yüksek can gösterir.
+    """
+    def __init__(self, high, low, drops, clock=time.perf_counter):
+        self.high = cv2.cvtColor(high, cv2.COLOR_BGR2BGRA)
+        self.low = cv2.cvtColor(low, cv2.COLOR_BGR2BGRA)
+        self.high.flags.writeable = False
+        self.low.flags.writeable = False
+        self.drops = drops
+        self.clock = clock
+
+    def _current(self):
+        now = self.clock()
+        for start, end in self.drops:
+            if start <= now < end:
+                return self.low
+        return self.high
+
+    def capture_bgra(self, region=None):
+        frame = self._current()
+        if region is None:
+            return frame
+        x, y = region["left"], region["top"]
+        return frame[y:y + region["height"], x:x + region["width"]]
+
+    def capture(self, region=None):
+        return np.ascontiguousarray(self.capture_bgra(region)[..., :3])
+
+
+class RampFrameSource(ScriptedFrameSource):
+    """Can, drops aralıklarının başında HIGH_FILL'den `rate` %/s hızla LOW_FILL'e kadar iner."""
+    def __init__(self, drops, rate, seed=1, clock=time.perf_counter):
+        self.rate = float(rate)
+        self.seed = seed
+        self._frames = {}
+        self.drops = drops
+        self.clock = clock
+
+    def frame_at(self, fill_pct):
+        frame = self._frames.get(fill_pct)
+        if frame is None:
+            fills = {"Health": fill_pct / 100.0, "Mana": 0.8}
+            bgr, _, _ = make_menu_frame(640, 360, fills, np.random.default_rng(self.seed))
+            frame = cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA)
+            frame.flags.writeable = False
+            self._frames[fill_pct] = frame
+        return frame
+
+    def _current(self):
+        now = self.clock()
+        fill = HIGH_FILL * 100
+        for start, end in self.drops:
+            if start <= now < end:
+                fill = max(LOW_FILL * 100, HIGH_FILL * 100 - self.rate * (now - start))
+        return self.frame_at(int(round(fill)))
+
+
+def make_frames(seed=1):
+    # aynı seed -> iki frame sadece can bar'ının doluluğunda farklı
+    fills = {"Health": HIGH_FILL, "Mana": 0.8}
+    high, _, bars = make_menu_frame(640, 360, fills, np.random.default_rng(seed))
+    low, _, _ = make_menu_frame(640, 360, dict(fills, Health=LOW_FILL), np.random.default_rng(seed))
+    return high, low, bars
+
+
+def make_schedule(t0, n, hold, rng):
+    """n adet düşüş: [start, start+hold) — aralarındaki boşluk rastgele (faz döngüye göre dağılsın)."""
+    drops = []
+    t = t0 + 0.2
+    for _ in range(n):
+        drops.append((t, t + hold))
+        t += hold + float(rng.uniform(hold, 2 * hold))
+    return drops
+
+
+def run_case(loop_delay_ms, method, n_drops, rng, adaptive=True, ramp_rate=None, predictive=False, analyzer="hsv"):
+    high, low, bars = make_frames()
+    win = {"left": 0, "top": 0, "width": high.shape[1], "height": high.shape[0]}
+    keymap = {"Health": "can", "Mana": "mana"}
+    positions = {keymap[f]: {"left": x, "top": y, "width": w, "height": h} for f, (x, y, w, h) in bars.items()}
+    use_lut = analyzer == "lut"
+    checkers = {
+        "Health": HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method=method, use_lut=use_lut),
+        "Mana": HealthChecker(config.MANA_LIGHT_HSV, config.MANA_DARK_HSV, method=method, use_lut=use_lut),
+    }
+    gs = dict(config.DEFAULT_GENERAL_SETTINGS, health_enabled=True, health_threshold=THRESHOLD, health_key="1",
+              mana_enabled=False, pickup_enabled=False, loop_delay_ms=loop_delay_ms, adaptive_sampling=adaptive,
+              health_predictive=predictive)
+
+    # düşük kalma süresi birkaç örnekleme aralığını kapsasın (adaptif yavaş mod = 2x)
+    hold = max(0.15, 4 * loop_delay_ms / 1000.0)
+    if ramp_rate:
+        source = RampFrameSource([], ramp_rate)
+        # olay anı = eşiğin geçildiği an; ramp'ın tamamı + birkaç örnek ekranda kalsın
+        lead = (HIGH_FILL * 100 - THRESHOLD) / ramp_rate
+        hold += (HIGH_FILL - LOW_FILL) * 100 / ramp_rate
+        for pct in range(int(LOW_FILL * 100), int(HIGH_FILL * 100) + 1):
+            source.frame_at(pct)
+    else:
+        source = ScriptedFrameSource(high, low, [])
+        lead = 0.0
+    backend = RecordingBackend()
+    engine = BotEngine(win, positions, loop_delay_ms, checkers, gs, frame_source=source, input_sink=backend)
+    # her düşüş ayrı bir olay: heal cooldown'u ölçümü karıştırmasın
+    engine.input.cooldowns["heal"] = 0.0
+
+    th = threading.Thread(target=engine.run, daemon=True)
+    th.start()
+    # senaryo, checker'lar (lut: renk tabloları) kurulduktan ve döngü başladıktan sonra başlar
+    drops = make_schedule(time.perf_counter(), n_drops, hold, rng)
+    source.drops = drops
+    end = drops[-1][1] + 0.1
+    while time.perf_counter() < end:
+        time.sleep(0.05)
+    engine.stop()
+    th.join(2.0)
+
+    presses = [t for t, k in backend.presses if k == "1"]
+    lat = []
+    missed = 0
+    for start, stop in drops:
+        hit = next((t for t in presses if start <= t < stop), None)
+        if hit is None:
+            missed += 1
+        else:
+            lat.append(hit - (start + lead))
+    return np.array(lat), missed, engine.metrics.snapshot()[0]
+
+
+def summarize(lat, missed):
+    ms = lat * 1e3
+    if len(ms) == 0:
+        return {"n": 0, "missed": missed}
+    return {
+        "n": int(len(ms)),
+        "missed": int(missed),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pixel-to-keypress latency benchmark")
+    ap.add_argument("--quick", action="store_true", help="case başına 5 düşüş (varsayılan 20)")
+    ap.add_argument("--drops", type=int, default=0)
+    ap.add_argument("--delays", default=",".join(str(d) for d in DELAYS_MS), help="loop_delay_ms listesi")
+    ap.add_argument("--methods", default=",".join(METHODS))
+    ap.add_argument("--no-adaptive", action="store_true", help="adaptif örneklemeyi kapat")
+    ap.add_argument("--scenario", choices=("step", "ramp"), default="step")
+    ap.add_argument("--rate", type=float, default=200.0, help="ramp senaryosunda düşüş hızı (%%/s)")
+    ap.add_argument("--predictive", action="store_true", help="health_predictive açık")
+    ap.add_argument("--analyzer", choices=ANALYZERS, default="hsv",
+                    help="hsv: BarAnalysisEngine (ortak HSV), lut: HealthChecker(use_lut=True)")
+    ap.add_argument("--json", help="sonuçları bu dosyaya yaz")
+    args = ap.parse_args(argv)
+
+    n = args.drops or (5 if args.quick else 20)
+    rng = np.random.default_rng(0)
+    results = {}
+    print("analyzer:", "BarAnalysisEngine (shared HSV)" if args.analyzer == "hsv" else "HealthChecker(use_lut=True)")
+    print(f"{'case':<28} {'n':>3} {'miss':>4} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+          f"  {'tick p50':>8}")
+    for delay in (int(d) for d in args.delays.split(",")):
+        for method in args.methods.split(","):
+            lat, missed, stages = run_case(delay, method, n, rng, adaptive=not args.no_adaptive,
+                                           ramp_rate=args.rate if args.scenario == "ramp" else None,
+                                           predictive=args.predictive, analyzer=args.analyzer)
+            r = summarize(lat, missed)
+            r["tick_p50_ms"] = stages.get("tick", {}).get("p50_ms", 0.0)
+            name = f"{method}/delay{delay}ms"
+            results[name] = r
+            if r["n"]:
+                print(f"{name:<28} {r['n']:3d} {r['missed']:4d} {r['mean_ms']:8.1f} {r['p50_ms']:8.1f} "
+                      f"{r['p95_ms']:8.1f} {r['p99_ms']:8.1f} {r['max_ms']:8.1f}  {r['tick_p50_ms']:8.3f}")
+            else:
+                print(f"{name:<28} {0:3d} {missed:4d}  (hiç basış yok)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
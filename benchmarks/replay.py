@@ -0,0 +1,35 @@
+"""
+Kaydedilmiş frame dizilerini okur: PNG dizini (isim sırasıyla) veya .npz
+(ya 'frames' anahtarı altında N x H x W x C array, ya da her anahtar bir frame).
+"""
+import os
+import cv2
+import numpy as np
+
+
+def iter_frames(path):
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith(".png"):
+                img = cv2.imread(os.path.join(path, name), cv2.IMREAD_COLOR)
+                if img is not None:
+                    yield img
+    elif path.lower().endswith(".npz"):
+        with np.load(path) as data:
+            if "frames" in data.files:
+                for frame in data["frames"]:
+                    yield frame
+            else:
+                for key in sorted(data.files):
+                    yield data[key]
+    else:
+        raise ValueError(f"Unsupported replay source (PNG dir or .npz expected): {path}")
+
+
+def load_frames(path, limit=None):
+    frames = []
+    for frame in iter_frames(path):
+        frames.append(frame)
+        if limit and len(frames) >= limit:
+            break
+    return frames
@@ -0,0 +1,218 @@
+"""
+Algılama hattı için headless benchmark paketi (canlı oyun / Windows gerekmez).
+
+Gerçek kod yollarını ölçer:
+  - HealthChecker.analyze_roi (pixel / projection / contour), farklı bar boyutlarında
+  - BarAnalysisEngine.analyze (3 bar, tek geçiş)
+  - BaseBarChecker.process_in_menu
+  - TemplateMatcher.find_best (tam çözünürlük ve pyramid)
+  - --replay ile kaydedilmiş frame dizileri (PNG dizini veya .npz)
+
+Her case için p50/p95/p99 gecikme ve throughput raporlanır; sentetik bar'larda bilinen
+doluluğa göre ortalama mutlak hata (mae, yüzde puanı) da verilir.
+
+  python -m benchmarks.run                      # çalıştır, baseline varsa karşılaştır
+  python -m benchmarks.run --save-baseline      # sonuçları baseline olarak kaydet
+  python -m benchmarks.run --replay rec/ --roi 412,980,120,8
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+import config
+from core.template_matcher import TemplateMatcher
+from features.health_checker import HealthChecker
+from features.base_bar_checker import BaseBarChecker
+from features.bar_analysis_engine import BarAnalysisEngine
+from benchmarks.synthetic import make_bar, make_menu_frame
+from benchmarks.replay import load_frames
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+METHODS = ("pixel", "projection", "contour", "scanline")
+BAR_SIZES = ((120, 8), (240, 12), (480, 24))
+FRAME_SIZES = ((1280, 720), (1920, 1080), (2560, 1440))
+
+
+def measure(fn, inputs, repeat=1, warmup=3):
+    """fn(x) her input için `repeat` kez çağrılır; dönüş: (saniye cinsinden gecikmeler, son çıktılar)."""
+    for x in inputs[:warmup]:
+        fn(x)
+    lat = []
+    outs = []
+    for _ in range(repeat):
+        outs = []
+        for x in inputs:
+            t0 = time.perf_counter()
+            outs.append(fn(x))
+            lat.append(time.perf_counter() - t0)
+    return np.array(lat), outs
+
+
+def summarize(lat, **extra):
+    us = lat * 1e6
+    out = {
+        "n": int(len(lat)),
+        "p50_us": float(np.percentile(us, 50)),
+        "p95_us": float(np.percentile(us, 95)),
+        "p99_us": float(np.percentile(us, 99)),
+        "ops_per_s": float(len(lat) / lat.sum()) if lat.sum() > 0 else 0.0,
+    }
+    out.update(extra)
+    return out
+
+
+def bench_analyze_roi(results, rng, quick):
+    light, dark = config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV
+    fills = rng.uniform(0.05, 0.95, size=10 if quick else 40)
+    for w, h in BAR_SIZES:
+        rois = [make_bar(w, h, f, rng, bgra=True) for f in fills]
+        for method in METHODS:
+            hc = HealthChecker(light, dark, method=method)
+            lat, outs = measure(hc.analyze_roi, rois, repeat=2 if quick else 10)
+            err = [abs(p - f * 100.0) for p, f in zip(outs, fills) if p is not None]
+            results[f"analyze_roi/{method}/{w}x{h}"] = summarize(lat, mae_pct=float(np.mean(err)) if err else None)
+
+
+def bench_engine(results, rng, quick):
+    feats = ("Health", "Mana", "Stamina")
+    checkers = {
+        "Health": HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV),
+        "Mana": HealthChecker(config.MANA_LIGHT_HSV, config.MANA_DARK_HSV),
+        "Stamina": HealthChecker(config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV),
+    }
+    engine = BarAnalysisEngine(checkers)
+    cases = []
+    for _ in range(10 if quick else 40):
+        fills = {f: float(rng.uniform(0.05, 0.95)) for f in feats}
+        frame, (mx, my, mw, mh), bars = make_menu_frame(320, 120, fills, rng)
+        region = cv2.cvtColor(frame[my:my + mh, mx:mx + mw], cv2.COLOR_BGR2BGRA)
+        rects = {f: (x - mx, y - my, x - mx + w, y - my + h) for f, (x, y, w, h) in bars.items()}
+        cases.append((region, rects, fills))
+    lat, outs = measure(lambda c: engine.analyze(c[0], c[1]), cases, repeat=2 if quick else 10)
+    err = [abs(o[f] - c[2][f] * 100.0) for o, c in zip(outs, cases) for f in feats if o.get(f) is not None]
+    results["engine/3bars"] = summarize(lat, mae_pct=float(np.mean(err)) if err else None)
+
+
+def bench_process_in_menu(results, rng, quick, tmpdir):
+    for fw, fh in FRAME_SIZES[:2]:
+        frame, menu_rect, bars = make_menu_frame(fw, fh, {"Health": 0.6, "Mana": 0.4}, rng)
+        bx, by, bw, bh = bars["Health"]
+        tpl_path = os.path.join(tmpdir, f"bar_{fw}.png")
+        cv2.imwrite(tpl_path, frame[by:by + bh, bx - 12:bx + bw])
+        checker = BaseBarChecker("Health", TemplateMatcher(tpl_path, threshold=0.8),
+                                 config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV)
+        lat, outs = measure(lambda fr: checker.process_in_menu(fr, menu_rect), [frame] * (10 if quick else 50))
+        results[f"process_in_menu/{fw}x{fh}"] = summarize(lat)
+
+
+def bench_template(results, rng, quick, tmpdir):
+    for fw, fh in FRAME_SIZES:
+        frame, (mx, my, mw, mh), _ = make_menu_frame(fw, fh, {"Health": 0.5, "Mana": 0.5, "Stamina": 0.5}, rng)
+        tpl_path = os.path.join(tmpdir, f"menu_{fw}.png")
+        cv2.imwrite(tpl_path, frame[my:my + mh, mx:mx + mw])
+        for levels in (0, 2):
+            m = TemplateMatcher(tpl_path, threshold=0.8, pyramid_levels=levels)
+            lat, outs = measure(m.find_best, [frame] * (2 if quick else 5), warmup=1)
+            ok = all(o is not None and (o[0], o[1]) == (mx, my) for o in outs)
+            results[f"template/{'full' if levels == 0 else f'pyramid{levels}'}/{fw}x{fh}"] = summarize(lat, hit=ok)
+
+
+def bench_replay(results, path, roi, template):
+    frames = load_frames(path)
+    if not frames:
+        print(f"[bench] replay: {path} içinde frame yok")
+        return
+    if roi:
+        x, y, w, h = roi
+        rois = [f[y:y + h, x:x + w] for f in frames]
+    else:
+        rois = frames
+    for method in METHODS:
+        hc = HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method=method)
+        lat, _ = measure(hc.analyze_roi, rois, warmup=1)
+        results[f"replay/analyze_roi/{method}"] = summarize(lat)
+    if template:
+        m = TemplateMatcher(template, threshold=config.MENU_MATCH_THRESHOLD)
+        lat, _ = measure(m.find_best, frames, warmup=1)
+        results["replay/template/full"] = summarize(lat)
+
+
+def print_report(results, baseline, tolerance):
+    print(f"{'case':<34} {'n':>5} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'ops/s':>10}  notes")
+    regressions = []
+    for name, r in results.items():
+        notes = []
+        if r.get("mae_pct") is not None:
+            notes.append(f"mae={r['mae_pct']:.2f}%")
+        if "hit" in r:
+            notes.append("hit" if r["hit"] else "MISS")
+        base = (baseline or {}).get(name)
+        if base:
+            ratio = r["p50_us"] / base["p50_us"] if base["p50_us"] else 1.0
+            notes.append(f"x{ratio:.2f} vs baseline")
+            if ratio > 1.0 + tolerance:
+                notes.append("REGRESSION")
+                regressions.append(name)
+        print(f"{name:<34} {r['n']:5d} {r['p50_us']:10.1f} {r['p95_us']:10.1f} {r['p99_us']:10.1f} "
+              f"{r['ops_per_s']:10.1f}  {' '.join(notes)}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless detection pipeline benchmarks")
+    ap.add_argument("--quick", action="store_true", help="daha az tekrar (hızlı kontrol)")
+    ap.add_argument("--only", default="", help="virgülle ayrılmış case grupları: roi,engine,menu,template")
+    ap.add_argument("--replay", help="PNG dizini veya .npz frame kaydı")
+    ap.add_argument("--roi", help="replay için bar ROI: x,y,w,h")
+    ap.add_argument("--template", help="replay frame'lerinde aranacak template (png)")
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="p50 bu orandan fazla yavaşlarsa REGRESSION")
+    ap.add_argument("--json", help="sonuçları ayrıca bu dosyaya yaz")
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    only = set(filter(None, args.only.split(",")))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # benchmark templates are throwaway files: keep their compiled cache out of assets/
+        config.TEMPLATE_CACHE_DIR = os.path.join(tmpdir, "template_cache")
+        if not only or "roi" in only:
+            bench_analyze_roi(results, rng, args.quick)
+        if not only or "engine" in only:
+            bench_engine(results, rng, args.quick)
+        if not only or "menu" in only:
+            bench_process_in_menu(results, rng, args.quick, tmpdir)
+        if not only or "template" in only:
+            bench_template(results, rng, args.quick, tmpdir)
+    if args.replay:
+        roi = tuple(int(v) for v in args.roi.split(",")) if args.roi else None
+        bench_replay(results, args.replay, roi, args.template)
+
+    baseline = None
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = print_report(results, baseline, args.tolerance)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[bench] baseline kaydedildi: {args.baseline}")
+    if regressions:
+        print(f"[bench] {len(regressions)} regresyon: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
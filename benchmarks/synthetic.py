@@ -0,0 +1,56 @@
+"""
+Bilinen doluluk oranlarıyla prosedürel bar / menü görüntüleri üretir.
+Renkler config'teki varsayılan HSV aralıklarına düşecek şekilde seçilmiştir.
+"""
+import numpy as np
+
+# feature -> (light BGR, dark BGR)
+BAR_COLORS = {
+    "Health": ((20, 40, 200), (10, 25, 75)),  # G > B keeps the hue at 0..10 instead of wrapping to ~179
+    "Mana": ((200, 80, 30), (70, 30, 20)),
+    "Stamina": ((30, 200, 200), (20, 70, 70)),
+}
+
+
+def make_bar(w, h, fill, rng=None, feature="Health", noise=8, bgra=False):
+    """
+    w x h bar: soldan round(w*fill) sütun açık renk, geri kalanı koyu renk + parlaklık gürültüsü
+    (üç kanala aynı değer eklenir; ton sabit kalır).
+    bgra=True: zero-copy capture'ın verdiği formatta (BGRA) döner.
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    light, dark = BAR_COLORS[feature]
+    img = np.empty((h, w, 3), dtype=np.uint8)
+    fw = int(round(w * fill))
+    img[:, :fw] = light
+    img[:, fw:] = dark
+    if noise:
+        img = np.clip(img.astype(np.int16) + rng.integers(-noise, noise + 1, size=(h, w, 1)), 0, 255).astype(np.uint8)
+    if bgra:
+        img = np.concatenate([img, np.full((h, w, 1), 255, dtype=np.uint8)], axis=2)
+    return img
+
+
+def make_menu_frame(frame_w, frame_h, fills, rng=None, bar_w=120, bar_h=8, gap=4):
+    """
+    Dokulu arka plan üzerinde, alt kısımda bir menü ve içinde fills={feature: oran} bar'ları.
+    Dönüş: (frame_bgr, menu_rect, {feature: (x, y, w, h)}) — rect'ler frame koordinatında.
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(frame_h, frame_w, 3), dtype=np.uint8)
+    # menü: dokulu çerçeve + bar'lar (template eşleşmesi için ayırt edici olmalı)
+    n = len(fills)
+    mw, mh = bar_w + 40, n * (bar_h + gap) + 24
+    mx, my = (frame_w - mw) // 3, frame_h - mh - 10
+    menu = np.empty((mh, mw, 3), dtype=np.uint8)
+    menu[:] = (60, 50, 40)
+    menu[::3, ::5] = (140, 150, 160)
+    frame[my:my + mh, mx:mx + mw] = menu
+    bars = {}
+    for i, (feat, fill) in enumerate(fills.items()):
+        bx, by = mx + 30, my + 12 + i * (bar_h + gap)
+        frame[by:by + bar_h, bx:bx + bar_w] = make_bar(bar_w, bar_h, fill, rng, feature=feat)
+        # bar'ın solunda feature'a özgü ikon (bar template'lerini ayırt etmek için)
+        frame[by:by + bar_h, bx - 12:bx - 2] = rng.integers(0, 256, size=(bar_h, 10, 3), dtype=np.uint8)
+        bars[feat] = (bx, by, bar_w, bar_h)
+    return frame, (mx, my, mw, mh), bars
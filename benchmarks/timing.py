@@ -0,0 +1,15 @@
+import time
+
+
+def timeit(fn, n):
+    """fn'in ortalama süresi (s); ilk çağrı ısınma olarak sayılmaz."""
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def best_of(fn, n, repeat=5):
+    """timeit'in repeat ölçümünün en kısası (tek CPU'lu / yüklü makinede gürültüyü azaltır)."""
+    return min(timeit(fn, n) for _ in range(repeat))
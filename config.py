@@ -2,14 +2,27 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+# runtime data written by the bot (readings ring file); not tracked, safe to delete
+DATA_DIR = os.path.join(BASE_DIR, "data")
 
 MENU_TEMPLATE = os.path.join(ASSETS_DIR, "menu.png")
 CANBAR_TEMPLATE = os.path.join(ASSETS_DIR, "canbar.png")
 MANABAR_TEMPLATE = os.path.join(ASSETS_DIR, "manabar.png")
 STAMINABAR_TEMPLATE = os.path.join(ASSETS_DIR, "staminabar.png")
+# decoded / resized templates (.npy, keyed by PNG hash and size); safe to delete
+TEMPLATE_CACHE_DIR = os.path.join(ASSETS_DIR, ".cache")
 
 MENU_MATCH_THRESHOLD = 0.80
 BAR_MATCH_THRESHOLD = 0.80
+# menu search on the full window: match at 1/2^N scale first, then refine (0 = off)
+MENU_PYRAMID_LEVELS = 2
+# BotThread re-verifies bar positions around their last hit every N bar samples
+RELOCATE_EVERY_TICKS = 20
+# a lost bar is searched in the whole window (off the bot thread) at these template scales,
+# so a UI-scale change is picked up; after each miss the next search waits twice as many
+# re-verifications, up to RELOCATE_MAX_BACKOFF
+RELOCATE_SCALES = (1.0, 0.75, 0.875, 1.125, 1.25, 1.5, 1.75, 2.0)
+RELOCATE_MAX_BACKOFF = 16
 
 # Default HSVs
 HEALTH_LIGHT_HSV = ((0, 120, 120), (10, 255, 255))
@@ -26,6 +39,7 @@ DEFAULT_GENERAL_SETTINGS = {
     "health_enabled": True,
     "health_threshold": 50,      # percent
     "health_key": "h",
+    "health_predictive": False,  # heal early when the loss trend crosses the threshold before the next sample
     "mana_enabled": False,
     "mana_threshold": 40,
     "mana_key": "m",
@@ -33,12 +47,27 @@ DEFAULT_GENERAL_SETTINGS = {
     "pickup_enabled": False,
     "pickup_key": "z",
     "pickup_interval_ms": 1500,
-    "loop_delay_ms": 250
+    "loop_delay_ms": 250,
+    "adaptive_sampling": True,   # sample bars faster while health falls, slower when idle
+    "record_readings": False     # GUI: keep bar readings in TIMESERIES_PATH (~63 MB preallocated)
 }
 
 # Paths for settings
 SETTINGS_PATH = os.path.join(BASE_DIR, "hsv_settings.json")       # HSV per-feature (existing)
 GENERAL_SETTINGS_PATH = os.path.join(BASE_DIR, "general_settings.json")
+# per-stage timing exports (Stats tab)
+METRICS_CSV_PATH = os.path.join(BASE_DIR, "metrics.csv")
+METRICS_PROM_PATH = os.path.join(BASE_DIR, "metrics.prom")
+# bar readings ring file (fixed size: 64 B + 15 B per record; 4M records ~ 7.5 h of 3 bars at 50 Hz)
+TIMESERIES_PATH = os.path.join(DATA_DIR, "readings.ts")
+TIMESERIES_CAPACITY = 1 << 22
+# HSV auto-calibration ("Öneri Al"): frames sampled off the GUI thread and the gap between them
+CALIBRATION_FRAMES = 60
+CALIBRATION_INTERVAL_MS = 30
+
+# Platform backend (capture / windows / input): "windows", "x11" or None = by platform
+# (PYBOT_BACKEND env var can also select it, see core/backends)
+BACKEND = None
 
 # Window title substring to find your game window (change this)
 WINDOW_TITLE_SUBSTRING = "METIN2"
@@ -0,0 +1,296 @@
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from features.bar_analysis_engine import BarAnalysisEngine
+from features.health_checker import HealthChecker
+
+# Çoklu istemci analizi için process havuzu.
+#
+# Frame tick başına bir kez shared memory'ye kopyalanır (tek memcpy); worker'lar aynı
+# buffer üzerinden kendi istemcilerinin ROI'lerini kopyasız okur. İstemciler worker'lara
+# sabit olarak dağıtılır (client i -> worker i % n), böylece her worker kendi
+# BarAnalysisEngine'ini bir kez kurar. Mesajlar worker başına bir Pipe
+# üzerinden gider: işe (shm adı, shape, {client: {feature: rect}}), cevaba {client: {feature: percent}}.
+# Aynı HSV aralıklarını kullanan istemciler worker içinde tek bir analizciyi paylaşır
+# (track_edge açıksa paylaşılmaz: kenar takibi istemci başına durumdur).
+# Ölen bir worker yeniden başlatılır; MAX_RESTARTS aşılırsa istemcileri bu process'te analiz edilir.
+
+# HealthChecker ayarları (constructor dışında) worker'daki kopyaya aynen aktarılır
+TUNING = ("track_edge", "scan_rows", "track_band", "track_verify", "col_thresh", "use_lut")
+
+
+def checker_specs(checkers):
+    """{feature: HealthChecker} -> {feature: (light_hsv, dark_hsv, method, TUNING değerleri)} (pickle'lanabilir)."""
+    out = {}
+    for feat, ch in checkers.items():
+        light = tuple(tuple(int(v) for v in b) for b in ch.light_hsv)
+        dark = tuple(tuple(int(v) for v in b) for b in ch.dark_hsv)
+        tuning = tuple(getattr(ch, name) for name in TUNING)
+        out[feat] = (light, dark, getattr(ch, "method", "projection"), tuning)
+    return out
+
+
+def checker_from_spec(spec):
+    light, dark, method, tuning = spec
+    ch = HealthChecker(light, dark, method=method)
+    for name, value in zip(TUNING, tuning):
+        setattr(ch, name, value)
+    return ch
+
+
+def _worker_main(conn):
+    engines = {}    # spec signature -> BarAnalysisEngine
+    clients = {}    # client index -> spec signature
+    shm = None
+    try:
+        while True:
+            msg = conn.recv()
+            kind = msg[0]
+            if kind == "stop":
+                break
+            if kind == "specs":
+                for ci, specs in msg[1].items():
+                    sig = tuple(sorted(specs.items()))
+                    if any(spec[3][0] for spec in specs.values()):
+                        sig = (ci,) + sig     # track_edge: per-client state, never shared
+                    if sig not in engines:
+                        checkers = {f: checker_from_spec(spec) for f, spec in specs.items()}
+                        engines[sig] = BarAnalysisEngine(checkers)
+                    clients[ci] = sig
+                conn.send(("ok",))
+                continue
+            _, name, shape, jobs = msg
+            if shm is None or shm.name != name:
+                if shm is not None:
+                    shm.close()
+                shm = shared_memory.SharedMemory(name=name)
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            out = {}
+            for ci, rects in jobs.items():
+                try:
+                    out[ci] = engines[clients[ci]].analyze(frame, rects)
+                except Exception as e:
+                    print(f"[AnalysisPool] worker: client {ci} hata:", e)
+                    out[ci] = {}
+            del frame
+            conn.send(("result", out))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if shm is not None:
+            shm.close()
+
+
+class AnalysisPool:
+    """
+    n_workers process'lik analiz havuzu.
+    client_checkers: {client index: {feature: HealthChecker}} — aralıklar ve ayarlar her
+        analyze()'da kontrol edilir; değişen (slider) istemcilerin spec'leri worker'lara yeniden gönderilir.
+    timeout: bir tick'te worker cevapları için beklenecek en uzun süre (s); aşılırsa o
+        worker'ın istemcileri bu tick sonuçsuz kalır. Pipe'tan hiçbir okuma bundan uzun bloklamaz.
+    """
+    MAX_RESTARTS = 3    # per worker; after that its clients are analyzed in this process
+
+    def __init__(self, n_workers, client_checkers, timeout=1.0, context="spawn"):
+        if int(n_workers) < 1:
+            raise ValueError(f"n_workers must be >= 1, got {n_workers}")
+        self.n_workers = int(n_workers)
+        self.client_checkers = client_checkers
+        self.timeout = float(timeout)
+        self._specs = {}
+        self._late = [0] * self.n_workers       # timed-out answers still in each pipe
+        self._restarts = [0] * self.n_workers
+        self._serial = {}                       # client index -> analyzer, for disabled workers
+        self._shm = None
+        self._frame = None
+        self._ctx = mp.get_context(context)
+        self._conns = [None] * self.n_workers   # None: worker disabled (MAX_RESTARTS exceeded)
+        self._procs = [None] * self.n_workers
+        for w in range(self.n_workers):
+            self._spawn(w)
+        self._sync_specs()
+
+    def worker_of(self, ci):
+        return ci % self.n_workers
+
+    def _spawn(self, w):
+        parent, child = self._ctx.Pipe()
+        p = self._ctx.Process(target=_worker_main, args=(child,), name=f"analysis-{w}", daemon=True)
+        p.start()
+        child.close()
+        self._conns[w] = parent
+        self._procs[w] = p
+        self._late[w] = 0
+
+    def _kill(self, w):
+        conn, p = self._conns[w], self._procs[w]
+        self._conns[w] = self._procs[w] = None
+        if conn is not None:
+            conn.close()
+        if p is not None:
+            p.join(0.1)
+            if p.is_alive():
+                p.terminate()
+                p.join(1.0)
+
+    def _worker_failed(self, w, err):
+        """Worker öldü / pipe koptu: yeniden başlatılır ve istemcilerinin spec'leri tekrar gönderilir."""
+        print(f"[AnalysisPool] worker {w} hata: {err!r}")
+        self._kill(w)
+        if self._restarts[w] >= self.MAX_RESTARTS:
+            print(f"[AnalysisPool] worker {w} devre dışı; istemcileri seri analiz edilecek")
+            return
+        self._restarts[w] += 1
+        self._spawn(w)
+        specs = {ci: spec for ci, spec in self._specs.items() if self.worker_of(ci) == w}
+        if not specs:
+            return
+        try:
+            self._conns[w].send(("specs", specs))
+            if self._recv(w, time.perf_counter() + self.timeout) is None:
+                print(f"[AnalysisPool] worker {w} spec zaman aşımı")
+        except (OSError, EOFError) as e:
+            self._worker_failed(w, e)   # bounded by MAX_RESTARTS
+
+    def _drain(self, w):
+        """Zaman aşımına uğramış eski cevaplardan gelmiş olanları atar (bloklamaz); pipe temizse True."""
+        conn = self._conns[w]
+        while self._late[w] and conn.poll(0):
+            conn.recv()
+            self._late[w] -= 1
+        return not self._late[w]
+
+    def _recv(self, w, deadline):
+        """Son gönderilen isteğin cevabı (önce gelen eski cevaplar atlanır); deadline'a kadar gelmezse None."""
+        conn = self._conns[w]
+        while True:
+            if not conn.poll(max(0.0, deadline - time.perf_counter())):
+                self._late[w] += 1
+                return None
+            msg = conn.recv()
+            if self._late[w]:
+                self._late[w] -= 1
+                continue
+            return msg
+
+    def _sync_specs(self):
+        """Değişen istemci spec'lerini sahibi olan worker'a gönderir."""
+        changed = {}
+        for ci, checkers in self.client_checkers.items():
+            specs = checker_specs(checkers)
+            if self._specs.get(ci) != specs:
+                self._specs[ci] = specs
+                changed.setdefault(self.worker_of(ci), {})[ci] = specs
+        sent = []
+        for w, specs in changed.items():
+            if self._conns[w] is None:
+                continue
+            try:
+                self._drain(w)
+                self._conns[w].send(("specs", specs))
+                sent.append(w)
+            except (OSError, EOFError) as e:
+                self._worker_failed(w, e)    # the restarted worker gets all of its specs
+        deadline = time.perf_counter() + self.timeout
+        for w in sent:
+            try:
+                if self._recv(w, deadline) is None:
+                    print(f"[AnalysisPool] worker {w} spec zaman aşımı")
+            except (OSError, EOFError) as e:
+                self._worker_failed(w, e)
+
+    def publish(self, frame):
+        """Frame'i shared memory'ye kopyalar (gerekirse buffer büyütülür); dönüş: (shm adı, shape)."""
+        nbytes = frame.size * frame.itemsize
+        if self._shm is None or self._shm.size < nbytes:
+            self._release_shm()
+            self._shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        self._frame = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shm.buf)
+        np.copyto(self._frame, frame)
+        return self._shm.name, frame.shape
+
+    def analyze(self, frame, jobs):
+        """
+        frame: BGR/BGRA bölge (ör. MultiRegionCapture.grab() çıktısı).
+        jobs: {client index: {feature: (x0, y0, x1, y1)}} frame-lokal rect'ler.
+        Dönüş: {client index: {feature: percent or None}}
+        """
+        if not jobs:
+            return {}
+        self._sync_specs()
+        name, shape = self.publish(frame)
+        shards = {}
+        for ci, rects in jobs.items():
+            shards.setdefault(self.worker_of(ci), {})[ci] = rects
+        serial = {}
+        sent = []
+        for w, part in shards.items():
+            if self._conns[w] is None:
+                serial.update(part)
+                continue
+            try:
+                if not self._drain(w):
+                    # still busy with an earlier frame: do not queue more work behind it
+                    print(f"[AnalysisPool] worker {w} meşgul, tick atlandı")
+                    continue
+                self._conns[w].send(("frame", name, shape, part))
+                sent.append(w)
+            except (OSError, EOFError) as e:
+                self._worker_failed(w, e)
+                serial.update(part)
+        out = {}
+        deadline = time.perf_counter() + self.timeout
+        for w in sent:
+            try:
+                msg = self._recv(w, deadline)
+            except (OSError, EOFError) as e:
+                self._worker_failed(w, e)
+                serial.update(shards[w])
+                continue
+            if msg is None:
+                print(f"[AnalysisPool] worker {w} zaman aşımı")
+                continue
+            out.update(msg[1])
+        if serial:
+            out.update(self._analyze_serial(frame, serial))
+        return out
+
+    def _analyze_serial(self, frame, jobs):
+        """Worker'ı olmayan (ölmüş / devre dışı) istemciler bu process'te analiz edilir."""
+        out = {}
+        for ci, rects in jobs.items():
+            engine = self._serial.get(ci)
+            if engine is None:
+                engine = self._serial[ci] = BarAnalysisEngine(self.client_checkers[ci])
+            engine.refresh()
+            out[ci] = engine.analyze(frame, rects)
+        return out
+
+    def _release_shm(self):
+        if self._shm is not None:
+            self._frame = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self):
+        for conn in self._conns:
+            if conn is None:
+                continue
+            try:
+                conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        for p in self._procs:
+            if p is None:
+                continue
+            p.join(1.0)
+            if p.is_alive():
+                p.terminate()
+        for conn in self._conns:
+            if conn is not None:
+                conn.close()
+        self._conns = []
+        self._procs = []
+        self._release_shm()
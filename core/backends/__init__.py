@@ -0,0 +1,43 @@
+import importlib
+import os
+import sys
+import threading
+
+import config
+from core.backends.base import Backend
+
+# Backend seçimi: get_backend(name) > config.BACKEND > PYBOT_BACKEND env > platform.
+# Modüller seçilince import edilir; kütüphaneleri (mss, win32gui, interception, libX11...)
+# ise ilk kullanımda yüklenir.
+BACKENDS = {
+    "windows": ("core.backends.windows", "WindowsBackend"),
+    "x11": ("core.backends.x11", "X11Backend"),
+}
+
+_instances = {}
+_lock = threading.Lock()
+
+
+def backend_name(name=None):
+    name = name or config.BACKEND or os.environ.get("PYBOT_BACKEND")
+    if not name:
+        name = "windows" if sys.platform == "win32" else "x11"
+    name = name.lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}' (available: {', '.join(BACKENDS)})")
+    return name
+
+
+def get_backend(name=None):
+    """Process-wide backend nesnesi (isim başına tek)."""
+    name = backend_name(name)
+    with _lock:
+        inst = _instances.get(name)
+        if inst is None:
+            module, cls = BACKENDS[name]
+            inst = getattr(importlib.import_module(module), cls)()
+            _instances[name] = inst
+        return inst
+
+
+__all__ = ["Backend", "BACKENDS", "backend_name", "get_backend"]
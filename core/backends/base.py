@@ -0,0 +1,27 @@
+class Backend:
+    """
+    Platform backend'i: ekran yakalama, pencere bulma ve tuş basma.
+
+    open_capture() -> grab(region) sağlayan nesne; region dict (left/top/width/height, mutlak
+        ekran koordinatı), dönüş read-only (h, w, 4) BGRA uint8 array. Dönen array backend'in
+        buffer'ı üzerinde view olabilir; farklı bölgelerin view'leri birbirini ezmemeli, aynı
+        bölge tekrar yakalanınca üzerine yazılabilir (saklanacaksa kopyalanmalı). Nesne açıldığı
+        thread'de kullanılmalı.
+    find_windows(substring) -> başlığında substring geçen görünür pencereler, öndeki önce:
+        [{"hwnd", "left", "top", "width", "height"}, ...] ("hwnd": platformun pencere id'si).
+    focus_window(hwnd) -> pencereyi öne alır (global tuş olayları ona gitsin).
+    open_input() -> press_key(key) sağlayan nesne (cihaz oturumu burada açılır).
+    """
+    name = None
+
+    def open_capture(self):
+        raise NotImplementedError
+
+    def find_windows(self, substring):
+        raise NotImplementedError
+
+    def focus_window(self, hwnd):
+        raise NotImplementedError
+
+    def open_input(self):
+        raise NotImplementedError
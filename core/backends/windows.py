@@ -0,0 +1,65 @@
+import numpy as np
+
+from core.backends.base import Backend
+
+# mss (yakalama), win32gui (pencereler) ve interception (tuş) ilk kullanımda import edilir.
+
+
+class MssGrabber:
+    """mss oturumu; grab() mss raw buffer'ı üzerinde zero-copy BGRA view döner."""
+    def __init__(self):
+        import mss
+        self.sct = mss.mss()
+
+    def grab(self, region):
+        s = self.sct.grab(region)
+        arr = np.frombuffer(s.raw, dtype=np.uint8).reshape(s.height, s.width, 4)
+        arr.flags.writeable = False
+        return arr
+
+    def close(self):
+        self.sct.close()
+
+
+class InterceptionInput:
+    def __init__(self):
+        import interception
+        self._interception = interception
+        interception.auto_capture_devices()
+
+    def press_key(self, key):
+        self._interception.press(key)
+
+
+class WindowsBackend(Backend):
+    name = "windows"
+
+    def open_capture(self):
+        return MssGrabber()
+
+    def open_input(self):
+        return InterceptionInput()
+
+    def find_windows(self, substring):
+        import win32gui
+        substring = substring.lower()
+        hwnds = []
+
+        def _enum(h, _):
+            try:
+                title = win32gui.GetWindowText(h)
+                if title and substring in title.lower() and win32gui.IsWindowVisible(h):
+                    hwnds.append(h)
+            except Exception:
+                pass
+
+        win32gui.EnumWindows(_enum, None)
+        out = []
+        for hwnd in hwnds:
+            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+            out.append({"hwnd": hwnd, "left": left, "top": top, "width": right - left, "height": bottom - top})
+        return out
+
+    def focus_window(self, hwnd):
+        import win32gui
+        win32gui.SetForegroundWindow(hwnd)
@@ -0,0 +1,537 @@
+import ctypes
+import ctypes.util
+import re
+import threading
+
+import numpy as np
+
+from core.backends.base import Backend
+
+# Linux / X11 backend; libX11, libXext (MIT-SHM) ve libXtst (XTest) ctypes ile ilk kullanımda
+# yüklenir, ek Python paketi gerekmez. DISPLAY ortam değişkenindeki ekran kullanılır, bu
+# yüzden Xvfb altında da çalışır:  xvfb-run -s "-screen 0 1280x720x24" python -m headless
+#
+# Yakalama: MIT-SHM varsa XShmGetImage, X sunucusunun doğrudan yazdığı kalıcı shared memory
+# segmentlerine (bölge başına bir tane) kopyalar; grab() segment üzerinde numpy view döner
+# (Python tarafında kopya yok). MIT-SHM yoksa (uzak ekran) XGetImage ile kopyalayarak okunur.
+# Pencereler: root'taki _NET_CLIENT_LIST_STACKING / _NET_CLIENT_LIST (pencere yöneticisi
+# yoksa XQueryTree), başlık _NET_WM_NAME (yoksa WM_NAME).
+# Tuşlar: XTestFakeKeyEvent; tuş adları interception'daki gibi ("1", "f1", "space", ...).
+
+_Display_p = ctypes.c_void_p
+_Window = ctypes.c_ulong
+_Atom = ctypes.c_ulong
+
+ZPixmap = 2
+AllPlanes = 0xFFFFFFFF
+IsViewable = 2
+ClientMessage = 33
+SubstructureNotifyMask = 1 << 19
+SubstructureRedirectMask = 1 << 20
+RevertToParent = 2
+CurrentTime = 0
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+
+class XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int), ("height", ctypes.c_int), ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int), ("data", ctypes.c_void_p), ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int), ("bitmap_bit_order", ctypes.c_int), ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int), ("bytes_per_line", ctypes.c_int), ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong), ("green_mask", ctypes.c_ulong), ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        # struct funcs: create_image, destroy_image, get_pixel, put_pixel, sub_image, add_pixel
+        ("f_create_image", ctypes.c_void_p), ("f_destroy_image", ctypes.c_void_p),
+        ("f_get_pixel", ctypes.c_void_p), ("f_put_pixel", ctypes.c_void_p),
+        ("f_sub_image", ctypes.c_void_p), ("f_add_pixel", ctypes.c_void_p),
+    ]
+
+
+class XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [("shmseg", ctypes.c_ulong), ("shmid", ctypes.c_int),
+                ("shmaddr", ctypes.c_void_p), ("readOnly", ctypes.c_int)]
+
+
+class XWindowAttributes(ctypes.Structure):
+    _fields_ = [
+        ("x", ctypes.c_int), ("y", ctypes.c_int), ("width", ctypes.c_int), ("height", ctypes.c_int),
+        ("border_width", ctypes.c_int), ("depth", ctypes.c_int), ("visual", ctypes.c_void_p),
+        ("root", _Window), ("class_", ctypes.c_int), ("bit_gravity", ctypes.c_int),
+        ("win_gravity", ctypes.c_int), ("backing_store", ctypes.c_int),
+        ("backing_planes", ctypes.c_ulong), ("backing_pixel", ctypes.c_ulong),
+        ("save_under", ctypes.c_int), ("colormap", ctypes.c_ulong), ("map_installed", ctypes.c_int),
+        ("map_state", ctypes.c_int), ("all_event_masks", ctypes.c_long),
+        ("your_event_mask", ctypes.c_long), ("do_not_propagate_mask", ctypes.c_long),
+        ("override_redirect", ctypes.c_int), ("screen", ctypes.c_void_p),
+    ]
+
+
+class XClientMessageEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int), ("serial", ctypes.c_ulong), ("send_event", ctypes.c_int),
+        ("display", _Display_p), ("window", _Window), ("message_type", _Atom),
+        ("format", ctypes.c_int), ("l", ctypes.c_long * 5),
+    ]
+
+
+class XEvent(ctypes.Union):
+    _fields_ = [("xclient", XClientMessageEvent), ("pad", ctypes.c_long * 24)]
+
+
+class XErrorEvent(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_int), ("display", _Display_p), ("resourceid", ctypes.c_ulong),
+                ("serial", ctypes.c_ulong), ("error_code", ctypes.c_ubyte),
+                ("request_code", ctypes.c_ubyte), ("minor_code", ctypes.c_ubyte)]
+
+
+_DestroyImage = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(XImage))
+_ErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, _Display_p, ctypes.POINTER(XErrorEvent))
+
+_libs = {}
+_libs_lock = threading.Lock()
+_errors = threading.local()
+
+
+@_ErrorHandler
+def _on_x_error(dpy, event):
+    # Xlib's default handler exits the process (e.g. BadMatch for a region outside the screen);
+    # record the error instead and let the caller raise
+    _errors.code = event.contents.error_code
+    return 0
+
+
+def _load(name):
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise OSError(f"lib{name} bulunamadı")
+    return ctypes.CDLL(path)
+
+
+def _sig(lib, name, restype, *argtypes):
+    fn = getattr(lib, name)
+    fn.restype = restype
+    fn.argtypes = list(argtypes)
+
+
+def _xlib():
+    with _libs_lock:
+        x = _libs.get("X11")
+        if x is not None:
+            return x
+        x = _load("X11")
+        P, W, A = _Display_p, _Window, _Atom
+        c_int, c_uint, c_ulong, c_char_p, c_void_p = ctypes.c_int, ctypes.c_uint, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_void_p
+        _sig(x, "XInitThreads", c_int)
+        _sig(x, "XOpenDisplay", P, c_char_p)
+        _sig(x, "XCloseDisplay", c_int, P)
+        _sig(x, "XSetErrorHandler", c_void_p, _ErrorHandler)
+        _sig(x, "XDefaultRootWindow", W, P)
+        _sig(x, "XDefaultScreen", c_int, P)
+        _sig(x, "XDefaultVisual", c_void_p, P, c_int)
+        _sig(x, "XDefaultDepth", c_int, P, c_int)
+        _sig(x, "XGetImage", ctypes.POINTER(XImage), P, W, c_int, c_int, c_uint, c_uint, c_ulong, c_int)
+        _sig(x, "XInternAtom", A, P, c_char_p, c_int)
+        _sig(x, "XGetWindowProperty", c_int, P, W, A, ctypes.c_long, ctypes.c_long, c_int, A,
+             ctypes.POINTER(A), ctypes.POINTER(c_int), ctypes.POINTER(c_ulong), ctypes.POINTER(c_ulong),
+             ctypes.POINTER(c_void_p))
+        _sig(x, "XFree", c_int, c_void_p)
+        _sig(x, "XQueryTree", c_int, P, W, ctypes.POINTER(W), ctypes.POINTER(W),
+             ctypes.POINTER(ctypes.POINTER(W)), ctypes.POINTER(c_uint))
+        _sig(x, "XGetWindowAttributes", c_int, P, W, ctypes.POINTER(XWindowAttributes))
+        _sig(x, "XTranslateCoordinates", c_int, P, W, W, c_int, c_int,
+             ctypes.POINTER(c_int), ctypes.POINTER(c_int), ctypes.POINTER(W))
+        _sig(x, "XSendEvent", c_int, P, W, c_int, ctypes.c_long, ctypes.POINTER(XEvent))
+        _sig(x, "XRaiseWindow", c_int, P, W)
+        _sig(x, "XSetInputFocus", c_int, P, W, c_int, c_ulong)
+        _sig(x, "XSync", c_int, P, c_int)
+        _sig(x, "XFlush", c_int, P)
+        _sig(x, "XStringToKeysym", c_ulong, c_char_p)
+        _sig(x, "XKeysymToKeycode", ctypes.c_ubyte, P, c_ulong)
+        # every Display is used by one thread, but capture / input / UI may run in different ones
+        x.XInitThreads()
+        x.XSetErrorHandler(_on_x_error)
+        _libs["X11"] = x
+        return x
+
+
+def _xext():
+    _xlib()
+    with _libs_lock:
+        xext = _libs.get("Xext")
+        if xext is not None:
+            return xext
+        xext = _load("Xext")
+        P, c_int, c_uint = _Display_p, ctypes.c_int, ctypes.c_uint
+        info = ctypes.POINTER(XShmSegmentInfo)
+        _sig(xext, "XShmQueryExtension", c_int, P)
+        _sig(xext, "XShmCreateImage", ctypes.POINTER(XImage), P, ctypes.c_void_p, c_uint, c_int,
+             ctypes.c_void_p, info, c_uint, c_uint)
+        _sig(xext, "XShmAttach", c_int, P, info)
+        _sig(xext, "XShmDetach", c_int, P, info)
+        _sig(xext, "XShmGetImage", c_int, P, _Window, ctypes.POINTER(XImage), c_int, c_int, ctypes.c_ulong)
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        _sig(libc, "shmget", c_int, c_int, ctypes.c_size_t, c_int)
+        _sig(libc, "shmat", ctypes.c_void_p, c_int, ctypes.c_void_p, c_int)
+        _sig(libc, "shmdt", c_int, ctypes.c_void_p)
+        _sig(libc, "shmctl", c_int, c_int, c_int, ctypes.c_void_p)
+        xext.libc = libc
+        _libs["Xext"] = xext
+        return xext
+
+
+def _xtst():
+    _xlib()
+    with _libs_lock:
+        xtst = _libs.get("Xtst")
+        if xtst is None:
+            xtst = _load("Xtst")
+            _sig(xtst, "XTestQueryExtension", ctypes.c_int, _Display_p, ctypes.POINTER(ctypes.c_int),
+                 ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int))
+            _sig(xtst, "XTestFakeKeyEvent", ctypes.c_int, _Display_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong)
+            _libs["Xtst"] = xtst
+        return xtst
+
+
+def _open_display(display=None):
+    x = _xlib()
+    dpy = x.XOpenDisplay(display.encode() if display else None)
+    if not dpy:
+        raise OSError(f"X display açılamadı: {display or 'DISPLAY'}")
+    return dpy
+
+
+def _check(what):
+    code = getattr(_errors, "code", 0)
+    _errors.code = 0
+    if code:
+        raise OSError(f"{what} failed (X error {code})")
+
+
+class _ShmSegment:
+    """
+    Tek bir bölgenin MIT-SHM segmenti + XImage başlığı. numpy view'leri bu nesneyi base olarak
+    tutar (__array_interface__); segment ancak son view de bırakılınca unmap edilir (shmdt).
+    release(): X sunucusu tarafını bırakır (XShmDetach), mevcut view'ler geçerli kalır.
+    """
+    def __init__(self, grabber, w, h):
+        self.libc = grabber.xext.libc
+        self.info = XShmSegmentInfo()
+        self.img = None
+        self.addr = None
+        self.attached = False
+        try:
+            self._setup(grabber, w, h)
+        except Exception:
+            self.release(grabber)
+            raise
+
+    def _setup(self, grabber, w, h):
+        xext, x, dpy = grabber.xext, grabber.x, grabber.dpy
+        img = xext.XShmCreateImage(dpy, grabber.visual, grabber.depth, ZPixmap, None,
+                                   ctypes.byref(self.info), w, h)
+        if not img:
+            raise OSError("XShmCreateImage failed")
+        self.img = img
+        if img.contents.bits_per_pixel != 32:
+            raise OSError(f"unsupported X visual: {img.contents.bits_per_pixel} bpp (32 expected)")
+        self.bpl = img.contents.bytes_per_line
+        self.size = self.bpl * h
+        shmid = self.libc.shmget(IPC_PRIVATE, self.size, IPC_CREAT | 0o600)
+        if shmid < 0:
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        addr = self.libc.shmat(shmid, None, 0)
+        # marked for removal now: freed by the kernel once both sides have detached (or died)
+        self.libc.shmctl(shmid, IPC_RMID, None)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            raise OSError(ctypes.get_errno(), "shmat failed")
+        self.addr = addr
+        self.info.shmid = shmid
+        self.info.shmaddr = addr
+        self.info.readOnly = 0
+        ok = xext.XShmAttach(dpy, ctypes.byref(self.info))
+        x.XSync(dpy, 0)
+        try:
+            _check("XShmAttach")
+        except OSError:
+            ok = 0
+        if not ok:
+            raise OSError("XShmAttach failed")
+        self.attached = True
+        img.contents.data = addr
+        self.__array_interface__ = {"shape": (self.size,), "typestr": "|u1",
+                                    "data": (addr, False), "version": 3}
+
+    def release(self, grabber):
+        """Sunucu tarafını ve XImage başlığını bırakır; bellek view'ler yaşadıkça map'li kalır."""
+        if self.attached and grabber.dpy:
+            grabber.xext.XShmDetach(grabber.dpy, ctypes.byref(self.info))
+            grabber.x.XSync(grabber.dpy, 0)
+        self.attached = False
+        if self.img:
+            _DestroyImage(self.img.contents.f_destroy_image)(self.img)   # XShm images don't free their data
+            self.img = None
+
+    def __del__(self):
+        if self.addr:
+            self.libc.shmdt(self.addr)
+            self.addr = None
+
+
+class XShmGrabber:
+    """
+    MIT-SHM yakalama; her bölgenin kendi kalıcı segmenti vardır (en fazla MAX_SEGMENTS, LRU).
+    grab() o segment üzerinde read-only BGRA view döner: farklı bölgelerin view'leri birbirini
+    ezmez (MultiRegionCapture tüm bölgeleri alıp sonra işler), aynı bölge tekrar yakalanınca
+    üzerine yazılır. Segment listeden düşse de view'ler onu canlı tutar (unmap sonra yapılır).
+    """
+    MAX_SEGMENTS = 16
+
+    def __init__(self, display=None):
+        self.x = _xlib()
+        self.dpy = _open_display(display)
+        self.root = self.x.XDefaultRootWindow(self.dpy)
+        screen = self.x.XDefaultScreen(self.dpy)
+        self.visual = self.x.XDefaultVisual(self.dpy, screen)
+        self.depth = self.x.XDefaultDepth(self.dpy, screen)
+        try:
+            self.xext = _xext()
+            self.use_shm = bool(self.xext.XShmQueryExtension(self.dpy))
+        except OSError as e:
+            print("[X11] MIT-SHM yüklenemedi -> XGetImage:", e)
+            self.xext = None
+            self.use_shm = False
+        self._segments = {}   # (left, top, w, h) -> _ShmSegment, oldest first
+
+    def _segment(self, key):
+        seg = self._segments.pop(key, None)
+        if seg is None:
+            if len(self._segments) >= self.MAX_SEGMENTS:
+                oldest = next(iter(self._segments))
+                self._segments.pop(oldest).release(self)
+            seg = _ShmSegment(self, key[2], key[3])
+        self._segments[key] = seg   # most recently used last
+        return seg
+
+    def _release_all(self):
+        for seg in self._segments.values():
+            seg.release(self)
+        self._segments.clear()
+
+    # ---- capture ----
+    def grab(self, region):
+        left, top = int(region["left"]), int(region["top"])
+        w, h = int(region["width"]), int(region["height"])
+        if self.use_shm:
+            seg = self._segment((left, top, w, h))
+            ok = self.xext.XShmGetImage(self.dpy, self.root, seg.img, left, top, AllPlanes)
+            _check("XShmGetImage")
+            if not ok:
+                raise OSError("XShmGetImage failed")
+            arr = np.asarray(seg).reshape(h, seg.bpl)[:, :w * 4].reshape(h, w, 4)
+        else:
+            img = self.x.XGetImage(self.dpy, self.root, left, top, w, h, AllPlanes, ZPixmap)
+            _check("XGetImage")
+            if not img:
+                raise OSError("XGetImage failed")
+            try:
+                c = img.contents
+                if c.bits_per_pixel != 32:
+                    raise OSError(f"unsupported X visual: {c.bits_per_pixel} bpp (32 expected)")
+                buf = (ctypes.c_ubyte * (c.bytes_per_line * h)).from_address(c.data)
+                arr = np.frombuffer(buf, dtype=np.uint8).reshape(h, c.bytes_per_line)[:, :w * 4]
+                arr = arr.reshape(h, w, 4).copy()
+            finally:
+                _DestroyImage(img.contents.f_destroy_image)(img)
+        arr.flags.writeable = False
+        return arr
+
+    def close(self):
+        if self.dpy:
+            self._release_all()
+            self.x.XCloseDisplay(self.dpy)
+            self.dpy = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# interception key names -> X keysym names (anything else is passed through, e.g. "a", "1")
+_KEYSYMS = {
+    "enter": "Return", "return": "Return", "esc": "Escape", "escape": "Escape", "space": "space",
+    "tab": "Tab", "backspace": "BackSpace", "delete": "Delete", "insert": "Insert",
+    "home": "Home", "end": "End", "pageup": "Prior", "pagedown": "Next",
+    "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "shift": "Shift_L", "ctrl": "Control_L", "alt": "Alt_L",
+}
+
+
+def keysym_name(key):
+    k = str(key)
+    if re.fullmatch(r"[fF]\d{1,2}", k):
+        return k.upper()
+    return _KEYSYMS.get(k.lower(), k)
+
+
+class XTestInput:
+    """
+    XTest ile sahte tuş olayı (X sunucusu, gerçek klavyeden gelmiş gibi odaktaki pencereye iletir).
+    hold_ms: basma ile bırakma arası; gecikmeyi sunucu uygular, çağıran thread beklemez.
+    """
+    def __init__(self, display=None, hold_ms=30):
+        self.x = _xlib()
+        self.xtst = _xtst()
+        self.dpy = _open_display(display)
+        self.hold_ms = int(hold_ms)
+        dummy = [ctypes.c_int() for _ in range(4)]
+        if not self.xtst.XTestQueryExtension(self.dpy, *[ctypes.byref(d) for d in dummy]):
+            self.x.XCloseDisplay(self.dpy)
+            raise OSError("XTEST extension not available")
+        self._keycodes = {}
+
+    def keycode(self, key):
+        kc = self._keycodes.get(key)
+        if kc is None:
+            sym = self.x.XStringToKeysym(keysym_name(key).encode())
+            kc = self.x.XKeysymToKeycode(self.dpy, sym) if sym else 0
+            if not kc:
+                raise ValueError(f"No X keycode for key '{key}'")
+            self._keycodes[key] = kc
+        return kc
+
+    def press_key(self, key):
+        kc = self.keycode(key)
+        self.xtst.XTestFakeKeyEvent(self.dpy, kc, 1, CurrentTime)
+        self.xtst.XTestFakeKeyEvent(self.dpy, kc, 0, self.hold_ms)
+        self.x.XFlush(self.dpy)
+
+    def close(self):
+        if self.dpy:
+            self.x.XCloseDisplay(self.dpy)
+            self.dpy = None
+
+
+class X11Backend(Backend):
+    name = "x11"
+
+    def __init__(self, display=None):
+        self.display = display   # None -> $DISPLAY
+
+    def open_capture(self):
+        return XShmGrabber(self.display)
+
+    def open_input(self):
+        return XTestInput(self.display)
+
+    # ---- windows ----
+    @staticmethod
+    def _property(x, dpy, win, atom, req_type=0):
+        """Dönüş: (actual_type, format, nitems, c pointer) veya None; pointer XFree ile bırakılmalı."""
+        actual_type, fmt = _Atom(), ctypes.c_int()
+        nitems, after = ctypes.c_ulong(), ctypes.c_ulong()
+        data = ctypes.c_void_p()
+        st = x.XGetWindowProperty(dpy, win, atom, 0, 1 << 16, 0, req_type, ctypes.byref(actual_type),
+                                  ctypes.byref(fmt), ctypes.byref(nitems), ctypes.byref(after), ctypes.byref(data))
+        _check("XGetWindowProperty")
+        if st != 0 or not data.value:
+            return None
+        if not actual_type.value:
+            x.XFree(data)
+            return None
+        return actual_type.value, fmt.value, nitems.value, data
+
+    def _windows_list(self, x, dpy, root):
+        """Üst seviye pencereler, öndeki önce."""
+        for name in (b"_NET_CLIENT_LIST_STACKING", b"_NET_CLIENT_LIST"):
+            prop = self._property(x, dpy, root, x.XInternAtom(dpy, name, 0))
+            if prop is None:
+                continue
+            _, fmt, n, data = prop
+            # format 32 properties are arrays of C longs
+            wins = list(ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))[:n]) if fmt == 32 else []
+            x.XFree(data)
+            if wins:
+                # stacking list is bottom-to-top; plain client list is mapping order
+                return wins[::-1] if name == b"_NET_CLIENT_LIST_STACKING" else wins
+        # no window manager (bare Xvfb): children of root, bottom-to-top
+        root_ret, parent = _Window(), _Window()
+        children, n = ctypes.POINTER(_Window)(), ctypes.c_uint()
+        if not x.XQueryTree(dpy, root, ctypes.byref(root_ret), ctypes.byref(parent),
+                            ctypes.byref(children), ctypes.byref(n)):
+            return []
+        wins = list(children[:n.value]) if n.value else []
+        if children:
+            x.XFree(children)
+        return wins[::-1]
+
+    def _title(self, x, dpy, win):
+        for name, enc in ((b"_NET_WM_NAME", "utf-8"), (b"WM_NAME", "latin-1")):
+            prop = self._property(x, dpy, win, x.XInternAtom(dpy, name, 0))
+            if prop is None:
+                continue
+            _, fmt, n, data = prop
+            raw = ctypes.string_at(data, n) if fmt == 8 else b""
+            x.XFree(data)
+            if raw:
+                return raw.decode(enc, "replace")
+        return ""
+
+    def find_windows(self, substring):
+        x = _xlib()
+        dpy = _open_display(self.display)
+        try:
+            root = x.XDefaultRootWindow(dpy)
+            substring = substring.lower()
+            out = []
+            for win in self._windows_list(x, dpy, root):
+                try:
+                    title = self._title(x, dpy, win)
+                    if not title or substring not in title.lower():
+                        continue
+                    attrs = XWindowAttributes()
+                    ok = x.XGetWindowAttributes(dpy, win, ctypes.byref(attrs))
+                    _check("XGetWindowAttributes")
+                    if not ok or attrs.map_state != IsViewable:
+                        continue
+                    rx, ry, child = ctypes.c_int(), ctypes.c_int(), _Window()
+                    x.XTranslateCoordinates(dpy, win, root, 0, 0, ctypes.byref(rx), ctypes.byref(ry), ctypes.byref(child))
+                    _check("XTranslateCoordinates")
+                except OSError:
+                    # window closed while enumerating (BadWindow)
+                    continue
+                out.append({"hwnd": int(win), "left": rx.value, "top": ry.value,
+                            "width": attrs.width, "height": attrs.height})
+            return out
+        finally:
+            x.XCloseDisplay(dpy)
+
+    def focus_window(self, hwnd):
+        x = _xlib()
+        dpy = _open_display(self.display)
+        try:
+            root = x.XDefaultRootWindow(dpy)
+            supported = self._property(x, dpy, root, x.XInternAtom(dpy, b"_NET_SUPPORTED", 0))
+            if supported is not None:
+                x.XFree(supported[3])
+                # EWMH window manager: ask it to activate (source 2 = pager, honoured without timestamps)
+                ev = XEvent()
+                ev.xclient.type = ClientMessage
+                ev.xclient.send_event = 1
+                ev.xclient.window = hwnd
+                ev.xclient.message_type = x.XInternAtom(dpy, b"_NET_ACTIVE_WINDOW", 0)
+                ev.xclient.format = 32
+                ev.xclient.l[0] = 2
+                ev.xclient.l[1] = CurrentTime
+                x.XSendEvent(dpy, root, 0, SubstructureRedirectMask | SubstructureNotifyMask, ctypes.byref(ev))
+            else:
+                x.XRaiseWindow(dpy, hwnd)
+                x.XSetInputFocus(dpy, hwnd, RevertToParent, CurrentTime)
+            x.XSync(dpy, 0)
+            _check("focus")
+        finally:
+            x.XCloseDisplay(dpy)
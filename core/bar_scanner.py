@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+import config
+from core.template_matcher import get_matcher
+
+# bar key -> template (can = Health)
+BAR_TEMPLATES = {"can": config.CANBAR_TEMPLATE, "mana": config.MANABAR_TEMPLATE, "stamina": config.STAMINABAR_TEMPLATE}
+
+_pool = None
+
+def _executor():
+    # cv2.matchTemplate releases the GIL, so bar searches really run in parallel
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=len(BAR_TEMPLATES), thread_name_prefix="bar-scan")
+    return _pool
+
+def find_menu(frame):
+    """
+    frame: pencere BGR görüntüsü. Dönüş: (x, y, w, h, score) frame koordinatında veya None.
+    Önce tüm frame'de (pyramid), bulunamazsa alt %40'ta arar.
+    """
+    matcher = get_matcher(config.MENU_TEMPLATE, threshold=config.MENU_MATCH_THRESHOLD, auto_scale=True,
+                          pyramid_levels=config.MENU_PYRAMID_LEVELS)
+    hit = matcher.find_best(frame)
+    if not hit:
+        # try bottom region
+        h = frame.shape[0]; w = frame.shape[1]
+        bottom_region = frame[int(h*0.6):h, 0:w]
+        hitb = matcher.find_best(bottom_region)
+        if hitb:
+            bx, by, bw, bh, score = hitb
+            hit = (bx, int(by + int(h*0.6)), bw, bh, score)
+    return hit
+
+def find_bars(frame, menu_hit, win_info):
+    """
+    Menü içinde tüm bar'ları eşzamanlı arar.
+    Dönüş: (bar_positions, matchers) — positions mutlak ekran koordinatında; matcher'ların
+    last_hit'i bulunan konuma ayarlanır (BotThread tracking buradan devam eder).
+    """
+    mx, my, mw, mh = menu_hit[:4]
+    menu_img = frame[my:my+mh, mx:mx+mw]
+    matchers = {name: get_matcher(tpl, threshold=config.BAR_MATCH_THRESHOLD, auto_scale=True)
+                for name, tpl in BAR_TEMPLATES.items()}
+    futures = {name: _executor().submit(m.find_best, menu_img) for name, m in matchers.items()}
+
+    found_bars = {}
+    found_matchers = {}
+    for name, fut in futures.items():
+        bhit = fut.result()
+        if bhit:
+            bx, by, bw, bh, score = bhit
+            # absolute in full screen coordinates: win left/top + menu offset + bx/by
+            abs_left = win_info["left"] + mx + bx
+            abs_top = win_info["top"] + my + by
+            found_bars[name] = {"left": abs_left, "top": abs_top, "width": bw, "height": bh, "score": score}
+            matchers[name].last_hit = (abs_left, abs_top, bw, bh, score)
+            found_matchers[name] = matchers[name]
+    return found_bars, found_matchers
@@ -0,0 +1,417 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config
+from core.screen import ScreenCapture, MultiRegionCapture, clamp_rect
+from core.scheduler import Scheduler, AdaptiveInterval
+from core.change_detector import RoiChangeDetector
+from core.metrics import Metrics
+from core.input_dispatcher import InputDispatcher, LazyBackend, FocusBackend
+from features.bar_analysis_engine import BarAnalysisEngine
+from features.trend import TrendEstimator
+
+
+def _default_input():
+    # one input device session (interception / XTest) per process, shared by every engine / restart
+    from core.input_controller import shared_controller
+    return shared_controller()
+
+
+def _focus_window(hwnd):
+    from core.window_finder import focus_window
+    focus_window(hwnd)
+
+
+class Client:
+    """
+    Tek bir oyun penceresinin durumu: bar konumları, checker'lar, eşikler ve tuş hedefi.
+    general_settings: bu istemcinin eşik/tuş ayarları (health_threshold, mana_key, ...).
+    target: tuşların gönderileceği pencere (hwnd); None = odaktaki pencere (tek istemci).
+    """
+    def __init__(self, name, win_info, bar_positions, checkers, general_settings, bar_matchers=None, target=None):
+        self.name = name
+        self.win_info = win_info
+        self.bar_positions = dict(bar_positions)  # dict of abs positions (own copy, updated by tracking)
+        # bar key -> TemplateMatcher; bars are re-verified every RELOCATE_EVERY_TICKS samples
+        self.bar_matchers = bar_matchers or {}
+        self.checkers = checkers  # dict of Feature->Checker
+        self.general_settings = general_settings
+        self.target = target
+        self.engine = BarAnalysisEngine(checkers)
+        self.engine_version = self.engine.version
+        self.percents = {}
+        # lost bars: bar key -> (misses, relocation round of the next whole-window search)
+        self.relocate_backoff = {}
+        # health_predictive: heal when the loss trend will cross the threshold before the next sample
+        self.health_trend = TrendEstimator()
+
+
+class BotEngine:
+    """
+    capture -> analyze -> act döngüsü (PyQt5'ten bağımsız).
+
+    frame_source: capture(region=None) / capture_bgra(region=None) sağlayan nesne
+        (varsayılan: pencere bölgesinde ScreenCapture). Replay / sentetik kaynak verilebilir.
+    input_sink: press_key(key) sağlayan nesne (varsayılan: InputController, ilk basışta açılır).
+        Çoklu istemcide press_key(key, target) ile çağrılır; varsayılan sink hedef pencereye odaklanır.
+        Basımlar capture döngüsünde değil, InputDispatcher thread'inde yapılır (self.input).
+    on_percent(feature, percent), on_preview(feature, roi), on_positions(bar_positions):
+        opsiyonel callback'ler (sadece ilk istemci için). on_preview'e giden roi capture buffer'ı
+        üzerinde BGRA view'dir ve sadece çağrı süresince geçerlidir; saklanacaksa kopyalanmalı.
+        on_preview True dönerse (ör. PreviewChannel rate limit) bar değişmese de sonraki tick'lerde
+        güncel view'i tekrar gönderilir, False / None dönene kadar.
+    metrics: core.metrics.Metrics — aşama süreleri (capture/slice/analyze/emit/input/relocate) ve FPS.
+    timeseries: opsiyonel core.timeseries.TimeSeriesStore — her okuma ve tetiklenen aksiyon kaydedilir.
+    workers: >0 ise istemciler core.analysis_pool.AnalysisPool ile ayrı process'lerde analiz edilir
+        (frame shared memory'den kopyasız okunur; GIL'e takılmadan çekirdek sayısıyla ölçeklenir).
+
+    Çoklu istemci: BotEngine.for_clients([Client, ...], ...). Tüm istemcilerin bar'ları her
+    tick'te tek bir birleşik bölge olarak bir kez yakalanır; her istemci kendi dilimini kendi
+    checker'ları ve eşikleriyle analiz eder, tuşlar kendi penceresine yönlendirilir.
+    """
+    def __init__(self, win_info, bar_positions, loop_delay_ms, checkers, general_settings, bar_matchers=None,
+                 frame_source=None, input_sink=None, on_percent=None, on_preview=None, on_positions=None,
+                 metrics=None, timeseries=None, extra_clients=None, workers=0):
+        primary = Client("main", win_info, bar_positions, checkers, general_settings, bar_matchers)
+        self.clients = [primary] + list(extra_clients or [])
+        multi = len(self.clients) > 1
+        if multi:
+            primary.target = (win_info or {}).get("hwnd")
+        self.win_info = win_info
+        self.checkers = checkers
+        self.general_settings = general_settings
+        self.engine = primary.engine
+        self._ticks = 0
+        self.loop_delay = max(10, int(loop_delay_ms)) / 1000.0
+        self.on_percent = on_percent
+        self.on_preview = on_preview
+        self.on_positions = on_positions
+        self._preview_owed = set()   # features whose last preview was held back by on_preview
+        # whole-window searches for lost bars run here, not on the bot thread
+        self._relocator = None
+        self._searches = {}          # (client index, bar key) -> (Future of the search, window origin)
+        self._relocate_round = 0
+        self._running = False
+        self._looping = False
+        self.sc = frame_source if frame_source is not None else ScreenCapture(region=self.win_info, reuse_buffers=True)
+        # only grab the bar area(s), not the whole window; rois are zero-copy BGRA views.
+        # several clients: one union region per tick, so capture cost stays ~flat per client
+        if multi:
+            self.mc = MultiRegionCapture(self.sc, self._capture_rects(), max_gap=None, bgra=True)
+        else:
+            self.mc = MultiRegionCapture(self.sc, self._capture_rects(), bounds=self.win_info, bgra=True)
+        # unchanged bars reuse their last percent and skip analysis + preview
+        self.roi_cache = RoiChangeDetector()
+        # bar sampling speeds up while health is falling, slows down when nothing changes
+        self.sample_rate = AdaptiveInterval(self.loop_delay)
+        self.scheduler = Scheduler()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.timeseries = timeseries
+        if input_sink is None:
+            input_sink = LazyBackend(_default_input)
+            if multi:
+                # keys go to each client's own window: focus it before pressing
+                input_sink = FocusBackend(input_sink, _focus_window)
+        # seconds between auto-heal / auto-mana keypresses are enforced by the dispatcher
+        self.input = InputDispatcher(input_sink, cooldowns={"heal": 0.5, "mana": 0.5}, metrics=self.metrics)
+        # workers > 0: clients are analyzed in a process pool instead of this thread
+        self.pool = None
+        if workers:
+            from core.analysis_pool import AnalysisPool
+            self.pool = AnalysisPool(workers, {ci: c.checkers for ci, c in enumerate(self.clients)})
+        self._setup_jobs()
+
+    @classmethod
+    def for_clients(cls, clients, loop_delay_ms, **kwargs):
+        """clients: [Client, ...]; ilk istemci UI callback'lerini ve örnekleme ayarlarını belirler."""
+        c0 = clients[0]
+        engine = cls(c0.win_info, c0.bar_positions, loop_delay_ms, c0.checkers, c0.general_settings,
+                     bar_matchers=c0.bar_matchers, extra_clients=clients[1:], **kwargs)
+        engine.clients[0].name = c0.name
+        if c0.target is not None:
+            engine.clients[0].target = c0.target
+        return engine
+
+    @property
+    def bar_positions(self):
+        return self.clients[0].bar_positions
+
+    @staticmethod
+    def _bar_feature(key):
+        return "Health" if key == "can" else ("Mana" if key == "mana" else "Stamina")
+
+    @property
+    def percents(self):
+        return dict(self.clients[0].percents)
+
+    def _capture_rects(self):
+        """{(client index, bar key): pos} — çoklu istemcide her rect kendi penceresine kırpılır."""
+        if len(self.clients) == 1:
+            return {(0, key): pos for key, pos in self.clients[0].bar_positions.items()}
+        rects = {}
+        for ci, client in enumerate(self.clients):
+            for key, pos in client.bar_positions.items():
+                r = clamp_rect(pos, client.win_info)
+                if r is not None:
+                    rects[(ci, key)] = {"left": r[0], "top": r[1], "width": r[2] - r[0], "height": r[3] - r[1]}
+        return rects
+
+    def _setup_jobs(self):
+        self.scheduler.add_job("bars", self.loop_delay, self._sample_bars)
+        for ci, client in enumerate(self.clients):
+            gs = client.general_settings
+            if gs.get("pickup_enabled", False):
+                interval = max(10, int(gs.get("pickup_interval_ms", 1000))) / 1000.0
+                name = "pickup" if ci == 0 else f"pickup:{client.name}"
+                self.scheduler.add_job(name, interval, lambda now, c=client: self._pickup(now, c))
+
+    def run_pending(self):
+        """Zamanı gelen job'ları bir kez çalıştırır (dış döngüye gömmek için); sıradaki deadline'ı döner."""
+        return self.scheduler.run_pending()
+
+    def tick(self):
+        """Tek bar örneklemesi, zamanlamadan bağımsız (test / replay)."""
+        return self._sample_bars(self.scheduler.clock())
+
+    def run(self):
+        """stop() çağrılana kadar bloklar."""
+        self._running = True
+        self._looping = True
+        self.input.start()      # reopens the dispatcher after a previous stop()
+        try:
+            self.scheduler.run(lambda: self._running)
+        finally:
+            self._looping = False
+            self._close_pool()
+            self._close_relocator()
+
+    def stop(self):
+        self._running = False
+        self.input.stop()
+        if not self._looping:
+            # otherwise run() closes the pool once the current tick is done
+            self._close_pool()
+            self._close_relocator()
+
+    def _close_pool(self):
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.close()
+
+    def _close_relocator(self):
+        relocator, self._relocator = self._relocator, None
+        self._searches.clear()
+        if relocator is not None:
+            relocator.shutdown(wait=False, cancel_futures=True)
+
+    def _sample_bars(self, tnow):
+        record = self.metrics.record
+        t0 = time.perf_counter()
+        try:
+            groups = self.mc.grab()
+        except Exception as e:
+            print("[BotEngine] capture hata:", e)
+            return 0.2
+        record("capture", time.perf_counter() - t0)
+        t_slice = t_analyze = t_emit = 0.0
+
+        # HSV ranges changed (sliders) -> cached percents are stale
+        for ci, client in enumerate(self.clients):
+            client.engine.refresh()
+            if client.engine.version != client.engine_version:
+                client.engine_version = client.engine.version
+                for feature in client.checkers:
+                    self.roi_cache.invalidate((ci, feature))
+
+        health = None
+        # process bars: one shared-region classification per captured group and client
+        for frame, local in groups:
+            # map bar key naming: can -> Health, mana -> Mana, stamina -> Stamina
+            per_client = {}
+            for (ci, key), r in local.items():
+                per_client.setdefault(ci, {})[self._bar_feature(key)] = r
+            t = time.perf_counter()
+            dirty = {}
+            for ci, rects in per_client.items():
+                percents = self.clients[ci].percents
+                for feature, (x0, y0, x1, y1) in rects.items():
+                    if self.roi_cache.changed((ci, feature), frame[y0:y1, x0:x1]) or feature not in percents:
+                        dirty.setdefault(ci, {})[feature] = rects[feature]
+            t_slice += time.perf_counter() - t
+            if dirty:
+                t = time.perf_counter()
+                results = None
+                if self.pool is not None:
+                    # one shared-memory publish, clients analyzed in parallel by the workers
+                    try:
+                        results = self.pool.analyze(frame, dirty)
+                    except Exception as e:
+                        # dead workers are restarted by the pool; anything else: drop to in-thread analysis
+                        print("[BotEngine] analysis pool hata, seri analize geçiliyor:", e)
+                        self._close_pool()
+                if results is not None:
+                    for ci, res in results.items():
+                        self.clients[ci].percents.update(res)
+                else:
+                    for ci, rects in dirty.items():
+                        self.clients[ci].percents.update(self.clients[ci].engine.analyze(frame, rects))
+                t_analyze += time.perf_counter() - t
+            for ci, rects in per_client.items():
+                client = self.clients[ci]
+                emit = ci == 0
+                for feature, (x0, y0, x1, y1) in rects.items():
+                    percent = client.percents.get(feature)
+                    changed = feature in dirty.get(ci, ())
+
+                    if percent is not None:
+                        if changed and emit and self.on_percent:
+                            t = time.perf_counter()
+                            self.on_percent(feature, percent)
+                            t_emit += time.perf_counter() - t
+                        if feature == "Health":
+                            health = percent if health is None else min(health, percent)
+                        self._act(ci, client, feature, percent, tnow)
+
+                    # send preview to UI (so mask preview etc. can be rendered)
+                    if emit and self.on_preview and (changed or feature in self._preview_owed):
+                        t = time.perf_counter()
+                        if self.on_preview(feature, frame[y0:y1, x0:x1]):
+                            self._preview_owed.add(feature)
+                        else:
+                            self._preview_owed.discard(feature)
+                        t_emit += time.perf_counter() - t
+
+        record("slice", t_slice)
+        # analyze / emit only count ticks where something changed (cache hits would pull p50 to 0)
+        if t_analyze:
+            record("analyze", t_analyze)
+        if t_emit:
+            record("emit", t_emit)
+        self._ticks += 1
+        if self._ticks % config.RELOCATE_EVERY_TICKS == 0 and any(c.bar_matchers for c in self.clients):
+            t = time.perf_counter()
+            self._relocate_bars()
+            record("relocate", time.perf_counter() - t)
+        record("tick", time.perf_counter() - t0)
+        self.metrics.tick(t0)
+
+        if self.general_settings.get("adaptive_sampling", True):
+            # several clients: the lowest health sets the pace
+            return self.sample_rate.update(health)
+        return None
+
+    def _act(self, ci, client, feature, percent, tnow):
+        # if Health auto enabled & below threshold -> queue heal key (dispatcher applies cooldown)
+        action = None
+        gs = client.general_settings
+        if feature == "Health" and gs.get("health_enabled", False):
+            thr = float(gs.get("health_threshold", 50))
+            low = percent < thr
+            if gs.get("health_predictive", False):
+                # unchanged (cached) readings count too, so the loss rate decays toward 0
+                client.health_trend.update(tnow, percent)
+                low = low or client.health_trend.will_cross(thr, self.scheduler.jobs["bars"].interval)
+            if low and self.input.submit("heal", gs.get("health_key", "h"), target=client.target):
+                action = "heal"
+        # Mana similar
+        if feature == "Mana" and gs.get("mana_enabled", False):
+            if percent < float(gs.get("mana_threshold", 40)) and \
+                    self.input.submit("mana", gs.get("mana_key", "m"), target=client.target):
+                action = "mana"
+        if self.timeseries is not None:
+            self.timeseries.append(feature, percent, action, client=ci)
+
+    def _relocate_bars(self):
+        """
+        Re-verify each bar around its last position with a small capture. A lost bar is searched
+        in the whole window at several template scales (config.RELOCATE_SCALES, UI-scale
+        changes) on a background thread; the result is picked up by a later call. After
+        each miss the next whole-window search waits twice as many calls (up to
+        config.RELOCATE_MAX_BACKOFF). Moved bars update bar_positions and the capture plan.
+        """
+        self._relocate_round += 1
+        moved_any = False
+        for ci, client in enumerate(self.clients):
+            win = client.win_info
+            full = None
+            moved = False
+            for key, matcher in client.bar_matchers.items():
+                pos = client.bar_positions.get(key)
+                if pos is None:
+                    continue
+                hit = self._search_result(ci, client, key)
+                if hit is None:
+                    # matchers come from the shared registry: seed from this client's own position
+                    matcher.last_hit = (pos["left"], pos["top"], pos["width"], pos["height"], pos.get("score", 1.0))
+                    m = matcher.track_margin
+                    r = clamp_rect({"left": pos["left"] - m, "top": pos["top"] - m,
+                                    "width": pos["width"] + 2 * m, "height": pos["height"] + 2 * m}, win)
+                    try:
+                        if r is not None:
+                            region = {"left": r[0], "top": r[1], "width": r[2] - r[0], "height": r[3] - r[1]}
+                            hit = matcher.track(self.sc.capture(region=region), origin=(r[0], r[1]), widen=False)
+                        if hit is None and self._search_due(ci, client, key):
+                            if full is None:
+                                full = self.sc.capture(region=win).copy()
+                            self._start_search(ci, key, matcher, full, win)
+                    except Exception as e:
+                        print("[Tracking] hata:", e)
+                        continue
+                if hit is None:
+                    continue
+                client.relocate_backoff.pop(key, None)
+                x, y, w, h, score = hit
+                if (x, y, w, h) != (pos["left"], pos["top"], pos["width"], pos["height"]):
+                    client.bar_positions[key] = {"left": x, "top": y, "width": w, "height": h, "score": score}
+                    moved = True
+            if moved:
+                moved_any = True
+                for feature in client.checkers:
+                    self.roi_cache.invalidate((ci, feature))
+                if ci == 0 and self.on_positions:
+                    self.on_positions(dict(client.bar_positions))
+                print(f"[Tracking] {client.name}: bar konumları güncellendi: {list(client.bar_positions.keys())}")
+        if moved_any:
+            self.mc.set_rects(self._capture_rects())
+
+    def _search_due(self, ci, client, key):
+        """Bu bar için arka planda arama yok ve backoff süresi dolmuşsa True."""
+        if (ci, key) in self._searches:
+            return False
+        return self._relocate_round >= client.relocate_backoff.get(key, (0, 0))[1]
+
+    def _start_search(self, ci, key, matcher, full, win):
+        if self._relocator is None:
+            self._relocator = ThreadPoolExecutor(max_workers=1, thread_name_prefix="relocate")
+        fut = self._relocator.submit(matcher.find_scaled, full, config.RELOCATE_SCALES)
+        self._searches[(ci, key)] = (fut, (win["left"], win["top"]))
+
+    def _search_result(self, ci, client, key):
+        """Biten arka plan aramasının isabeti (ekran koordinatında) veya None; bulunamadıysa backoff uzar."""
+        fut, (ox, oy) = self._searches.get((ci, key), (None, (0, 0)))
+        if fut is None or not fut.done():
+            return None
+        del self._searches[(ci, key)]
+        try:
+            hit = fut.result()
+        except Exception as e:
+            print("[Tracking] hata:", e)
+            hit = None
+        if hit is None:
+            misses = client.relocate_backoff.get(key, (0, 0))[0] + 1
+            wait = min(1 << misses, config.RELOCATE_MAX_BACKOFF)
+            client.relocate_backoff[key] = (misses, self._relocate_round + wait)
+            print(f"[Tracking] {client.name}: '{key}' bar bulunamadı, eski konum kullanılıyor "
+                  f"(sonraki tam arama {wait} doğrulama sonra)")
+            return None
+        x, y, w, h, score = hit
+        return (ox + x, oy + y, w, h, score)
+
+    def _pickup(self, tnow, client=None):
+        # pickup job (z key), lowest priority in the dispatcher
+        client = client or self.clients[0]
+        key = client.general_settings.get("pickup_key", "z")
+        if self.input.submit("pickup", key, target=client.target) and self.timeseries is not None:
+            self.timeseries.append(None, None, "pickup", client=self.clients.index(client))
+
+    def roi_cache_stats(self):
+        return self.roi_cache.stats()
@@ -0,0 +1,41 @@
+import zlib
+import numpy as np
+
+class RoiChangeDetector:
+    """
+    Bar ROI'lerinin değişip değişmediğini ucuz bir parmak iziyle tespit eder.
+    Parmak izi: her row_step'inci satırın (tüm sütunlar) crc32'si. Bar dolulukları yatay
+    değiştiği için sütunlar seyreltilmez; 1 piksellik kenar kayması da yakalanır.
+    hits/misses ile ne kadar analizin atlandığı izlenebilir.
+    """
+    def __init__(self, row_step=2):
+        self.row_step = max(1, int(row_step))
+        self._prints = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, roi):
+        sub = np.ascontiguousarray(roi[::self.row_step])
+        return (roi.shape, zlib.crc32(sub))
+
+    def changed(self, key, roi):
+        """ROI son çağrıdan beri değiştiyse True (ve yeni parmak izini saklar)."""
+        fp = self.fingerprint(roi)
+        if self._prints.get(key) == fp:
+            self.hits += 1
+            return False
+        self._prints[key] = fp
+        self.misses += 1
+        return True
+
+    def invalidate(self, key=None):
+        """key verilmezse tüm cache; ör. HSV aralıkları değişince."""
+        if key is None:
+            self._prints.clear()
+        else:
+            self._prints.pop(key, None)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0}
@@ -0,0 +1,121 @@
+import cv2
+import numpy as np
+
+# Quantized BGR -> {light, dark} color-class lookup tables (HealthChecker(use_lut=True)).
+#
+# Her kanal `bits` bite quantize edilir; 2^(3*bits) hücrenin her biri, hücre merkezinin
+# HSV değerine cv2.inRange uygulanarak sınıflandırılır. Bir ROI'nin sınıflandırılması
+# cvtColor + inRange yerine bir shift, bir AND ve bir tablo gather'ıdır (table[idx]).
+# LUT yolunda maskeler morfolojiden (open + close) geçmez: kazancın çoğu buradan gelir.
+# Bar boyutundaki ROI'ler içindir; tam ekran görüntülerde cv2'nin SIMD dönüşümü daha hızlıdır.
+#
+# Tolerans (bits=6, varsayılan; sınıf başına 4 MB tablo, kurulum ~6 ms, slider ile tek sınıf ~3 ms):
+#   - quantization: HSV değeri bir aralık sınırına kanal başına ~2 BGR seviyesi kadar
+#     yakın pikseller farklı sınıflanabilir.
+#   - morfoloji yok: tekil gürültü pikselleri silinmez, bar kenarındaki 1 px'lik
+#     boşluklar kapatılmaz; dolu kenar en fazla ~1 sütun kayar.
+#   Gürültülü sentetik bar'larda (40 px ve üzeri genişlik) yüzde, analyze_roi'den en fazla
+#   LUT_TOLERANCE puan farklıdır (tests/test_color_lut.py).
+# Ölçümler: python -m benchmarks.bench_color_lut
+
+CLASS_LIGHT = 1
+CLASS_DARK = 2
+
+LUT_BITS = 6
+LUT_TOLERANCE = 2.5  # percent points
+
+_grid_cache = {}
+
+def _spread(bits):
+    """Kanal başına `bits` bitlik alanlar, BGRA uint32 düzeninde: B=0.., G=8.., R=16.. (aralarda boşluk)."""
+    m = (1 << bits) - 1
+    return m | (m << 8) | (m << 16)
+
+def _grid_hsv(bits):
+    """
+    Tüm quantize BGR hücre merkezlerinin HSV karşılığı (1xN) ve tablo indeksleri (N),
+    bit başına bir kez hesaplanır.
+    """
+    grid = _grid_cache.get(bits)
+    if grid is None:
+        shift = 8 - bits
+        q = np.arange(1 << bits, dtype=np.uint32)
+        centers = ((q << shift) + ((1 << shift) >> 1)).astype(np.uint8)
+        r, g, b = np.meshgrid(centers, centers, centers, indexing="ij")
+        bgr = np.stack([b, g, r], axis=-1).reshape(1, -1, 3)
+        # index düzeni: idx = b_q | g_q << 8 | r_q << 16  (bkz. bgra_index)
+        qr, qg, qb = np.meshgrid(q, q, q, indexing="ij")
+        index = (qb | (qg << 8) | (qr << 16)).reshape(-1)
+        grid = _grid_cache[bits] = (cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV), index)
+    return grid
+
+def range_mask(lower, upper, bits=LUT_BITS):
+    """Grid'in (bkz. _grid_hsv) bir HSV aralığına düşen hücreleri: düz 0/255 uint8 array (grid sırasında)."""
+    mask = cv2.inRange(_grid_hsv(bits)[0], np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8))
+    return mask.reshape(-1)
+
+def bgra_index(roi_bgr, bits=LUT_BITS):
+    """
+    BGR/BGRA ROI -> tablo indeksleri (uint32, HxW): idx = b_q | g_q << 8 | r_q << 16.
+    BGRA girişte (zero-copy capture view) pikseller kopyalanmadan uint32 olarak okunur
+    (B=bit 0-7, G=8-15, R=16-23, little-endian); kanallar yerinde bırakıldığı için indeks
+    bir shift ve bir AND'dir. Bedeli seyrek tablo: bits=6'da 4 MB (256K hücre dolu).
+    """
+    if roi_bgr.shape[2] == 3:
+        roi_bgr = cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2BGRA)
+    v = roi_bgr.view(np.uint32)[..., 0]
+    shift = 8 - bits
+    if not shift:
+        return v & _spread(bits)
+    idx = v >> shift
+    idx &= _spread(bits)
+    return idx
+
+class ColorClassLUT:
+    """
+    light_hsv / dark_hsv: ((h,s,v), (h,s,v)) — HealthChecker ile aynı format.
+    Her sınıf (light, dark) kendi 0/255 tablosunu tutar: gather'ın sonucu doğrudan
+    cv2.inRange formatında maskedir. Aralık değişince sadece değişen sınıfın tablosu
+    yeniden kurulur; yeni tablo ayrı bir array'de kurulup referansı değiştirilir, bot
+    thread'i okurken GUI thread'i güvenle güncelleyebilir.
+    """
+    def __init__(self, light_hsv, dark_hsv, bits=LUT_BITS):
+        self.bits = int(bits)
+        self.light_hsv = None
+        self.dark_hsv = None
+        self.version = 0
+        self._light = self._dark = None
+        self.set_light_hsv(*light_hsv)
+        self.set_dark_hsv(*dark_hsv)
+
+    @staticmethod
+    def _norm(lower, upper):
+        return (tuple(int(v) for v in lower), tuple(int(v) for v in upper))
+
+    def _build(self, rng):
+        table = np.zeros(_spread(self.bits) + 1, dtype=np.uint8)
+        table[_grid_hsv(self.bits)[1]] = range_mask(rng[0], rng[1], self.bits)
+        self.version += 1
+        return table
+
+    def set_light_hsv(self, lower, upper):
+        rng = self._norm(lower, upper)
+        if rng != self.light_hsv:
+            self.light_hsv = rng
+            self._light = self._build(rng)
+
+    def set_dark_hsv(self, lower, upper):
+        rng = self._norm(lower, upper)
+        if rng != self.dark_hsv:
+            self.dark_hsv = rng
+            self._dark = self._build(rng)
+
+    def classify(self, roi_bgr):
+        """Dönüş: HxW uint8 sınıf haritası (CLASS_LIGHT / CLASS_DARK bitleri; ikisi de değilse 0)."""
+        light, dark = self.masks(roi_bgr)
+        return (light & CLASS_LIGHT) | (dark & CLASS_DARK)
+
+    def masks(self, roi_bgr, dark=True):
+        """cv2.inRange ile aynı formatta (0/255) light ve dark maskeleri; dark=False -> (light, None)."""
+        idx = bgra_index(roi_bgr, self.bits)
+        return np.take(self._light, idx), (np.take(self._dark, idx) if dark else None)
@@ -1,12 +1,23 @@
-import interception
+import threading
+
+_shared = None
+_lock = threading.Lock()
 
 class InputController:
-    def __init__(self):
-        interception.auto_capture_devices()
+    # the platform input (interception on Windows, XTest on X11) is opened here, not at import:
+    # the driver is only loaded (and devices captured) when a key is actually about to be pressed
+    def __init__(self, backend=None):
+        from core.backends import get_backend
+        self._input = get_backend(backend).open_input()
 
     def press_key(self, key):
-        try:
-            interception.press(key)
-            print(f"pressed {key}")
-        except Exception as e:
-            print(f"Error pressing {key}: {e}")
\ No newline at end of file
+        # errors propagate: InputDispatcher counts them and does not start the action's cooldown
+        self._input.press_key(key)
+
+def shared_controller():
+    """Process-wide tek InputController (tek cihaz oturumu); ilk çağrıda oluşturulur."""
+    global _shared
+    with _lock:
+        if _shared is None:
+            _shared = InputController()
+        return _shared
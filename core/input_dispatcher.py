@@ -0,0 +1,255 @@
+import heapq
+import threading
+import time
+
+# düşük değer = önce basılır
+PRIORITIES = {"heal": 0, "mana": 1, "pickup": 2}
+DEFAULT_PRIORITY = 5
+
+
+class RecordingBackend:
+    """Gerçek tuş basmayan backend: basılan tuşları (zaman, tuş) olarak kaydeder (benchmark / deneme)."""
+    def __init__(self, delay=0.0, clock=time.perf_counter):
+        self.delay = float(delay)  # sürücü çağrısının süresini taklit eder
+        self.clock = clock
+        self.presses = []
+        self.targets = []        # presses ile aynı sırada; hedefsiz basımda None
+
+    def press_key(self, key, target=None):
+        if self.delay:
+            time.sleep(self.delay)
+        self.presses.append((self.clock(), key))
+        self.targets.append(target)
+
+    @property
+    def keys(self):
+        return [k for _, k in self.presses]
+
+
+class LazyBackend:
+    """Backend'i ilk basışta oluşturur (ör. InputController -> interception cihaz yakalama)."""
+    def __init__(self, factory):
+        self.factory = factory
+        self._backend = None
+
+    def press_key(self, key, target=None):
+        if self._backend is None:
+            self._backend = self.factory()
+        if target is None:
+            self._backend.press_key(key)
+        else:
+            self._backend.press_key(key, target)
+
+
+class FocusBackend:
+    """
+    Hedefli basımlar için: tuştan önce hedef pencereyi öne getirir (focus(target)).
+    interception / pyautogui tuşları odaktaki pencereye gönderdiği için çoklu istemcide
+    yönlendirme pencere odağıyla yapılır. Hedef değişmedikçe tekrar odaklanılmaz.
+    """
+    def __init__(self, base, focus, focus_delay=0.02):
+        self.base = base
+        self.focus = focus
+        self.focus_delay = float(focus_delay)  # pencerenin odağı alması için bekleme
+        self._current = None
+
+    def press_key(self, key, target=None):
+        if target is not None and target != self._current:
+            self.focus(target)
+            self._current = target
+            if self.focus_delay:
+                time.sleep(self.focus_delay)
+        self.base.press_key(key)
+
+
+class InputDispatcher:
+    """
+    Tuş basımlarını capture döngüsünden ayıran, öncelikli kuyruklu input thread'i.
+
+    submit(action, key) sadece kuyruğa ekler ve hemen döner; yavaş bir sürücü çağrısı
+    bir sonraki frame'i geciktirmez.
+      - öncelik: heal > mana > pickup (PRIORITIES); aynı öncelikte FIFO
+      - coalescing: aynı action kuyruktayken gelen tekrarlar birleştirilir
+      - cooldowns: action başına bekleme (ör. heal 0.5 s); süresi dolmamış istekler düşürülür.
+        Hata veren basım (backend exception) stats["errors"]'a sayılır ve cooldown başlatmaz
+      - key_interval: aynı tuşa iki basım arasındaki en kısa süre
+      - max_rate: tüm tuşlar için saniyede en fazla basım (token bucket; fazlası bekletilir)
+    backend: press_key(key) sağlayan nesne (InputController, RecordingBackend, ...).
+        submit(..., target=hwnd) ile gelen istekler press_key(key, target) olarak iletilir
+        (FocusBackend); cooldown ve coalescing o zaman (action, target) başınadır.
+    metrics: opsiyonel core.metrics.Metrics -> "input" (basım süresi), "input_queue" (kuyrukta bekleme).
+    """
+    def __init__(self, backend, cooldowns=None, key_interval=0.03, max_rate=20.0, metrics=None,
+                 verbose=False, clock=time.perf_counter):
+        self.backend = backend
+        self.cooldowns = dict(cooldowns or {})
+        self.key_interval = float(key_interval)
+        self.max_rate = float(max_rate)
+        self.metrics = metrics
+        self.verbose = verbose
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._heap = []
+        self._pending = {}       # slot -> key (queued, not yet pressed); slot = action / (action, target)
+        self._seq = 0
+        self._last_action = {}   # slot -> press time
+        self._last_key = {}      # (key, target) -> press time
+        self._tokens = self.max_rate
+        self._token_time = clock()
+        self._busy = False
+        self._thread = None
+        self._running = False
+        self._closed = False     # stop() çağrıldı: start() ile tekrar açılana kadar submit reddedilir
+        self.stats = {"submitted": 0, "pressed": 0, "coalesced": 0, "cooldown": 0, "errors": 0,
+                      "rejected": 0}
+
+    # ---- producer side (capture loop) ----
+    def ready(self, action, now=None, target=None):
+        """action'ın (hedef verilirse o hedefteki) cooldown'u dolmuş mu (kuyruğa eklemeden önce ucuz kontrol)."""
+        cd = self.cooldowns.get(action, 0.0)
+        if not cd:
+            return True
+        now = self.clock() if now is None else now
+        slot = action if target is None else (action, target)
+        return (now - self._last_action.get(slot, float("-inf"))) >= cd
+
+    def submit(self, action, key, priority=None, target=None):
+        """Basım isteğini kuyruğa ekler; birleştirildi / cooldown'da / stop() sonrası ise False döner."""
+        if not key:
+            return False
+        now = self.clock()
+        slot = action if target is None else (action, target)
+        with self._cond:
+            if self._closed:
+                self.stats["rejected"] += 1
+                return False
+            self.stats["submitted"] += 1
+            if self._pending.get(slot) == key:
+                self.stats["coalesced"] += 1
+                return False
+            if not self.ready(action, now, target):
+                self.stats["cooldown"] += 1
+                return False
+            prio = PRIORITIES.get(action, DEFAULT_PRIORITY) if priority is None else priority
+            self._seq += 1
+            heapq.heappush(self._heap, (prio, self._seq, action, key, target, now))
+            self._pending[slot] = key
+            self._cond.notify()
+            # same lock as stop(): a submit racing stop() cannot bring the thread back
+            self._start_locked()
+        return True
+
+    # ---- consumer side (input thread) ----
+    def start(self):
+        """Thread'i başlatır; stop() ile kapatılmış dispatcher'ı tekrar açar."""
+        with self._cond:
+            self._closed = False
+            self._start_locked()
+
+    def _start_locked(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="input-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Kuyruktaki basımları atar ve thread'i durdurur; döndükten sonra tuş basılmaz."""
+        with self._cond:
+            self._closed = True
+            self._running = False
+            self._heap.clear()
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self, timeout=1.0):
+        """Kuyruk boşalana (ve son basım bitene) kadar bekler; boşaldıysa True."""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while self._heap or self._busy:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _take_token(self, now):
+        """Token bucket; token yoksa beklenecek süreyi döner."""
+        if self.max_rate <= 0:
+            return 0.0
+        self._tokens = min(self.max_rate, self._tokens + (now - self._token_time) * self.max_rate)
+        self._token_time = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.max_rate
+
+    def _next(self):
+        """Sıradaki basılabilir istek (kilit altında çağrılır); bekleme gerekiyorsa (None, saniye)."""
+        while self._heap:
+            prio, seq, action, key, target, t_submit = self._heap[0]
+            slot = action if target is None else (action, target)
+            now = self.clock()
+            if not self.ready(action, now, target):
+                heapq.heappop(self._heap)
+                self._pending.pop(slot, None)
+                self.stats["cooldown"] += 1
+                continue
+            wait = self.key_interval - (now - self._last_key.get((key, target), float("-inf")))
+            if wait <= 0:
+                wait = self._take_token(now)
+            if wait > 0:
+                return None, wait
+            heapq.heappop(self._heap)
+            self._pending.pop(slot, None)
+            # previous times: restored if the press fails (no cooldown for a key that was not sent)
+            prev = (self._last_action.get(slot), self._last_key.get((key, target)))
+            self._last_action[slot] = now
+            self._last_key[(key, target)] = now
+            return (action, key, target, t_submit, prev), 0.0
+        return None, None
+
+    def _restore_times(self, slot, key_slot, prev):
+        for times, k, t in ((self._last_action, slot, prev[0]), (self._last_key, key_slot, prev[1])):
+            if t is None:
+                times.pop(k, None)
+            else:
+                times[k] = t
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                item, wait = self._next()
+                while item is None:
+                    self._cond.wait(wait)
+                    if not self._running:
+                        return
+                    item, wait = self._next()
+                self._busy = True
+            action, key, target, t_submit, prev = item
+            t = self.clock()
+            ok = False
+            try:
+                if target is None:
+                    self.backend.press_key(key)
+                else:
+                    self.backend.press_key(key, target)
+                ok = True
+                if self.verbose:
+                    print(f"[Input] {action}: '{key}'")
+            except Exception as e:
+                print(f"[Input] {action} '{key}' hata:", e)
+            if self.metrics is not None:
+                self.metrics.record("input_queue", t - t_submit)
+                self.metrics.record("input", self.clock() - t)
+            with self._cond:
+                self.stats["pressed" if ok else "errors"] += 1
+                if not ok:
+                    self._restore_times(action if target is None else (action, target), (key, target), prev)
+                self._busy = False
+                self._cond.notify_all()
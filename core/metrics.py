@@ -0,0 +1,124 @@
+import bisect
+import os
+import threading
+import time
+from collections import deque
+
+# Aşama süreleri için sabit boyutlu histogram: 1 us .. ~10 s, on yılda 10 log-aralıklı kova.
+# record() bir bisect + sayaç artırımı (~0.5 us); bellek kullanımı aşama başına sabit.
+BUCKET_BOUNDS = [10 ** (e / 10.0) * 1e-6 for e in range(71)]
+
+STAGES = ("capture", "slice", "analyze", "emit", "input_queue", "input", "relocate", "tick")
+
+
+class StageHistogram:
+    def __init__(self, bounds=BUCKET_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # son kova: +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """q (0-100) -> saniye; kovanın üst sınırı (en fazla bir kova genişliği, ~%26 yukarı yuvarlar)."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= rank and c:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+
+class Metrics:
+    """
+    Bot döngüsü için aşama bazlı süre ölçümü (capture / slice / analyze / emit / input / relocate)
+    ve efektif FPS. Bot thread'i record() yazar, UI snapshot() okur.
+
+        t = time.perf_counter(); ...; metrics.record("capture", time.perf_counter() - t)
+    """
+    def __init__(self, clock=time.perf_counter, fps_window=120):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.stages = {}
+        self._ticks = deque(maxlen=fps_window)
+
+    def record(self, stage, seconds):
+        hist = self.stages.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self.stages.setdefault(stage, StageHistogram())
+        hist.record(seconds)
+
+    def tick(self, now=None):
+        """Bir bar örneklemesi tamamlandı (FPS için)."""
+        self._ticks.append(self.clock() if now is None else now)
+
+    def fps(self):
+        ticks = list(self._ticks)
+        if len(ticks) < 2 or ticks[-1] <= ticks[0]:
+            return 0.0
+        return (len(ticks) - 1) / (ticks[-1] - ticks[0])
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self._ticks.clear()
+
+    def snapshot(self):
+        """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}, fps"""
+        out = {}
+        with self._lock:
+            items = list(self.stages.items())
+        order = {s: i for i, s in enumerate(STAGES)}
+        for name, h in sorted(items, key=lambda kv: order.get(kv[0], len(order))):
+            out[name] = {
+                "count": h.count,
+                "mean_ms": (h.total / h.count * 1e3) if h.count else 0.0,
+                "p50_ms": h.percentile(50) * 1e3,
+                "p95_ms": h.percentile(95) * 1e3,
+                "p99_ms": h.percentile(99) * 1e3,
+                "max_ms": h.max * 1e3,
+            }
+        return out, self.fps()
+
+    def export_csv(self, path):
+        stats, fps = self.snapshot()
+        cols = ("count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("stage," + ",".join(cols) + "\n")
+            for name, s in stats.items():
+                f.write(name + "," + ",".join(f"{s[c]:.4f}" if c != "count" else str(s[c]) for c in cols) + "\n")
+            f.write(f"fps,{fps:.3f},,,,,\n")
+
+    def export_prometheus(self, path, prefix="bot"):
+        """Prometheus text exposition formatı (node_exporter textfile collector ile okunabilir)."""
+        lines = [f"# HELP {prefix}_stage_seconds Duration of each bot loop stage.",
+                 f"# TYPE {prefix}_stage_seconds histogram"]
+        with self._lock:
+            items = list(self.stages.items())
+        for name, h in items:
+            acc = 0
+            for bound, c in zip(h.bounds, h.counts):
+                acc += c
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound:.6g}"}} {acc}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {h.total:.9f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {h.count}')
+        lines += [f"# HELP {prefix}_fps Effective bar sampling rate.",
+                  f"# TYPE {prefix}_fps gauge",
+                  f"{prefix}_fps {self.fps():.3f}"]
+        # atomik yazım: scraper yarım dosya görmesin
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
@@ -0,0 +1,106 @@
+import time
+
+# Windows'ta time.sleep çözünürlüğü ~15 ms; deadline'a bu kadar kala sleep(0) ile beklenir.
+SPIN_WINDOW = 0.0015
+
+def sleep_until(deadline, clock=time.perf_counter, spin=SPIN_WINDOW):
+    """clock() değeri deadline'a ulaşana kadar uyur; sadece son `spin` saniyede CPU'ya yield eder."""
+    while True:
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return
+        if remaining > spin:
+            time.sleep(remaining - spin)
+        else:
+            time.sleep(0)
+
+class Job:
+    def __init__(self, name, interval, fn, next_run):
+        self.name = name
+        self.interval = float(interval)
+        self.fn = fn
+        self.next_run = next_run
+
+class Scheduler:
+    """
+    Deadline tabanlı periyodik iş zamanlayıcı.
+    Her job kendi aralığıyla çalışır; döngü sadece sıradaki job'un zamanına kadar uyur.
+    Job fonksiyonu fn(now) float dönerse o değer yeni aralık olur (adaptif örnekleme).
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.jobs = {}
+
+    def add_job(self, name, interval, fn, start_delay=0.0):
+        job = Job(name, interval, fn, self.clock() + float(start_delay))
+        self.jobs[name] = job
+        return job
+
+    def remove_job(self, name):
+        self.jobs.pop(name, None)
+
+    def set_interval(self, name, interval):
+        job = self.jobs.get(name)
+        if job is None:
+            return
+        # deadline'ı yeni aralığa göre öne/arkaya çek
+        job.next_run = job.next_run - job.interval + float(interval)
+        job.interval = float(interval)
+
+    def next_deadline(self):
+        if not self.jobs:
+            return None
+        return min(job.next_run for job in self.jobs.values())
+
+    def run_pending(self):
+        """Zamanı gelen job'ları çalıştırır; sıradaki deadline'ı döner."""
+        for job in sorted(self.jobs.values(), key=lambda j: j.next_run):
+            now = self.clock()
+            if job.next_run > now:
+                continue
+            new_interval = job.fn(now)
+            if new_interval is not None:
+                job.interval = float(new_interval)
+            # drift'siz: bir önceki deadline'a ekle; geride kaldıysak kaçırılanları atla
+            job.next_run += job.interval
+            if job.next_run <= now:
+                job.next_run = now + job.interval
+        return self.next_deadline()
+
+    def run(self, should_continue, max_sleep=0.1):
+        """should_continue() False olana kadar job'ları çalıştırır (max_sleep: durdurma tepkisi)."""
+        while should_continue():
+            deadline = self.run_pending()
+            limit = self.clock() + max_sleep
+            sleep_until(limit if deadline is None else min(deadline, limit), self.clock)
+
+class AdaptiveInterval:
+    """
+    Bar örnekleme aralığı: değer düşerken hızlı, uzun süre değişmezse yavaş örnekler.
+    base: normal aralık (loop_delay), fast/slow: sınırlar.
+    """
+    def __init__(self, base, fast=None, slow=None, idle_after=5, eps=0.5):
+        self.base = float(base)
+        self.fast = float(fast) if fast is not None else max(0.01, self.base / 4.0)
+        self.slow = float(slow) if slow is not None else max(self.base, min(self.base * 2.0, 1.0))
+        self.idle_after = int(idle_after)
+        self.eps = float(eps)
+        self._last = None
+        self._still = 0
+
+    def update(self, value):
+        """Yeni örnek (ör. health %) -> sıradaki aralık (saniye)."""
+        last, self._last = self._last, value
+        if value is None or last is None:
+            self._still = 0
+            return self.base
+        if value < last - self.eps:
+            self._still = 0
+            return self.fast
+        if abs(value - last) <= self.eps:
+            self._still += 1
+            if self._still >= self.idle_after:
+                return self.slow
+        else:
+            self._still = 0
+        return self.base
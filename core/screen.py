@@ -1,17 +1,37 @@
-import mss
 import numpy as np
 import cv2
-import pyautogui
 import time
 
 class ScreenCapture:
-    def __init__(self, region=None):
+    """
+    reuse_buffers=True: capture() her çağrıda yeni BGR array ayırmak yerine bölge
+    boyutu başına önceden ayrılmış bir buffer'a yazar (cvtColor dst=). Dönen frame
+    bir sonraki capture() ile üzerine yazılır; saklanacaksa kopyalanmalı.
+    """
+    def __init__(self, region=None, reuse_buffers=False):
         self.region = None
         self.set_region(region)
-        try:
-            self.sct = mss.mss()
-        except Exception:
-            self.sct = None
+        self.reuse_buffers = bool(reuse_buffers)
+        self._bgr_buffers = {}  # (h, w) -> preallocated BGR output
+        # the platform grabber (mss / X11 MIT-SHM) is opened on first capture, in the thread that
+        # captures (mss and Xlib handles are per-thread)
+        self._grabber = None
+        self._grabber_failed = False
+
+    @property
+    def grabber(self):
+        if self._grabber is None and not self._grabber_failed:
+            try:
+                from core.backends import get_backend
+                self._grabber = get_backend().open_capture()
+            except Exception as e:
+                print("[ScreenCapture] yakalama backend'i açılamadı -> pyautogui:", e)
+                self._grabber_failed = True
+        return self._grabber
+
+    @grabber.setter
+    def grabber(self, value):
+        self._grabber = value
 
     def set_region(self, region):
         if region is None:
@@ -28,27 +48,162 @@ class ScreenCapture:
             left, top, width, height = region
             self.region = {"left": int(left), "top": int(top), "width": int(width), "height": int(height)}
 
-    def capture(self):
-        if self.region is None:
+    def _out_buffer(self, h, w):
+        if not self.reuse_buffers:
+            return None
+        buf = self._bgr_buffers.get((h, w))
+        if buf is None:
+            buf = np.empty((h, w, 3), dtype=np.uint8)
+            self._bgr_buffers[(h, w)] = buf
+        return buf
+
+    def capture_bgra(self, region=None):
+        """
+        Zero-copy yakalama: backend buffer'ı (mss raw / X11 shared memory) üzerinde read-only
+        BGRA numpy view döner. X11'de buffer bölge başına kalıcıdır: view aynı bölge tekrar
+        yakalanınca değişir.
+        HealthChecker.analyze_roi BGRA ROI'leri doğrudan işleyebilir.
+        """
+        if region is None:
+            region = self.region
+        if region is None:
             raise ValueError("Region not set for ScreenCapture.")
-        # try mss
-        if self.sct:
+        if self.grabber:
             try:
-                s = self.sct.grab(self.region)
-                arr = np.array(s)  # BGRA usually
-                if arr.shape[2] == 4:
-                    bgr = cv2.cvtColor(arr, cv2.COLOR_BGRA2BGR)
-                else:
-                    bgr = arr[..., :3]
-                return bgr
+                return self.grabber.grab(region)
+            except Exception as e:
+                print("[ScreenCapture] capture error -> fallback pyautogui:", e)
+                time.sleep(0.01)
+        left = region["left"]; top = region["top"]
+        w = region["width"]; h = region["height"]
+        import pyautogui  # fallback only; importing it needs a display server
+        img = pyautogui.screenshot(region=(left, top, w, h))
+        return cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGRA)
+
+    def capture(self, region=None):
+        """
+        region verilirse (dict: left/top/width/height, mutlak ekran koordinatı)
+        self.region yerine o bölge yakalanır.
+        """
+        if region is None:
+            region = self.region
+        if region is None:
+            raise ValueError("Region not set for ScreenCapture.")
+        # try the platform grabber
+        if self.grabber:
+            try:
+                arr = self.grabber.grab(region)  # BGRA
+                return cv2.cvtColor(arr, cv2.COLOR_BGRA2BGR, dst=self._out_buffer(arr.shape[0], arr.shape[1]))
             except Exception as e:
                 # fallback to pyautogui
-                print("[ScreenCapture] mss error -> fallback pyautogui:", e)
+                print("[ScreenCapture] capture error -> fallback pyautogui:", e)
                 time.sleep(0.01)
         # fallback
-        left = self.region["left"]; top = self.region["top"]
-        w = self.region["width"]; h = self.region["height"]
+        left = region["left"]; top = region["top"]
+        w = region["width"]; h = region["height"]
+        import pyautogui  # fallback only; importing it needs a display server
         img = pyautogui.screenshot(region=(left, top, w, h))
-        arr = np.array(img)  # RGB
-        bgr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
+        arr = np.asarray(img)  # RGB
+        bgr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR, dst=self._out_buffer(arr.shape[0], arr.shape[1]))
         return bgr
+
+def clamp_rect(pos, bounds=None):
+    """
+    pos: {"left","top","width","height"} mutlak ekran koordinatı.
+    bounds: aynı formatta pencere bölgesi (opsiyonel) — rect buna kırpılır.
+    Dönüş: (x0, y0, x1, y1) mutlak koordinat veya None (boş kesişim).
+    """
+    x0 = int(pos["left"]); y0 = int(pos["top"])
+    x1 = x0 + int(pos["width"]); y1 = y0 + int(pos["height"])
+    if bounds is not None:
+        bx0 = int(bounds["left"]); by0 = int(bounds["top"])
+        bx1 = bx0 + int(bounds["width"]); by1 = by0 + int(bounds["height"])
+        x0 = max(bx0, x0); y0 = max(by0, y0)
+        x1 = min(bx1, x1); y1 = min(by1, y1)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1, y1)
+
+def plan_capture_regions(rects, bounds=None, max_gap=32):
+    """
+    Bar rect'lerini yakalama bölgelerine gruplar.
+    Birbirine yakın bar'lar (aradaki boşluk <= max_gap px) tek bir bounding box
+    içinde yakalanır; uzak olanlar ayrı ayrı. max_gap=None: hepsi tek bir birleşik
+    bölgede (çoklu istemci: tick başına tek masaüstü yakalaması).
+    rects: {key: {"left","top","width","height"}} (mutlak)
+    Dönüş: [(region_dict, {key: (x0, y0, x1, y1) bölge-lokal}), ...]
+    """
+    boxes = []
+    for key, pos in rects.items():
+        r = clamp_rect(pos, bounds)
+        if r is not None:
+            boxes.append(([key], r))
+
+    # greedy merge: yakın kutuları birleşene kadar birleştir
+    merged = True
+    while merged and len(boxes) > 1:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                ka, a = boxes[i]
+                kb, b = boxes[j]
+                gap_x = max(a[0], b[0]) - min(a[2], b[2])
+                gap_y = max(a[1], b[1]) - min(a[3], b[3])
+                if max_gap is None or (gap_x <= max_gap and gap_y <= max_gap):
+                    u = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    boxes[i] = (ka + kb, u)
+                    del boxes[j]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    plan = []
+    for keys, (x0, y0, x1, y1) in boxes:
+        region = {"left": x0, "top": y0, "width": x1 - x0, "height": y1 - y0}
+        local = {}
+        for key in keys:
+            r = clamp_rect(rects[key], bounds)
+            local[key] = (r[0] - x0, r[1] - y0, r[2] - x0, r[3] - y0)
+        plan.append((region, local))
+    return plan
+
+class MultiRegionCapture:
+    """
+    Tüm pencere yerine sadece bar'ların bulunduğu bölge(ler)i yakalar.
+    Yakalama maliyeti pencere çözünürlüğüyle değil bar alanıyla ölçeklenir.
+    bgra=True: bölgeler zero-copy BGRA view olarak döner (bkz. capture_bgra).
+    """
+    def __init__(self, screen_capture, rects, bounds=None, max_gap=32, bgra=False):
+        self.sc = screen_capture
+        self.bgra = bool(bgra)
+        self.bounds = bounds
+        self.max_gap = None if max_gap is None else int(max_gap)
+        self.plan = []
+        self.set_rects(rects)
+
+    def set_rects(self, rects):
+        self.rects = dict(rects)
+        self.plan = plan_capture_regions(self.rects, self.bounds, self.max_gap)
+
+    def grab(self):
+        """
+        Her bölgeyi bir kez yakalar.
+        Dönüş: [(frame, {key: (x0, y0, x1, y1)}), ...]
+        """
+        out = []
+        for region, local in self.plan:
+            if self.bgra:
+                frame = self.sc.capture_bgra(region=region)
+            else:
+                frame = self.sc.capture(region=region)
+            out.append((frame, local))
+        return out
+
+    def grab_rois(self):
+        """Dönüş: {key: roi} — her roi kendi bölge frame'inin view'i."""
+        rois = {}
+        for frame, local in self.grab():
+            for key, (x0, y0, x1, y1) in local.items():
+                rois[key] = frame[y0:y1, x0:x1]
+        return rois
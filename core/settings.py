@@ -0,0 +1,46 @@
+import os
+import json
+import config
+
+# load/save helpers
+def save_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+def load_json(path):
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# default general settings loader -> ensure file exists
+def load_or_create_general_settings():
+    data = load_json(config.GENERAL_SETTINGS_PATH)
+    if data is None:
+        data = config.DEFAULT_GENERAL_SETTINGS.copy()
+        save_json(config.GENERAL_SETTINGS_PATH, data)
+    # ensure all keys exist
+    for k, v in config.DEFAULT_GENERAL_SETTINGS.items():
+        if k not in data:
+            data[k] = v
+    return data
+
+DEFAULT_HSV = {
+    "Health": (config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV),
+    "Mana": (config.MANA_LIGHT_HSV, config.MANA_DARK_HSV),
+    "Stamina": (config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV),
+}
+
+def load_hsv_ranges(feature, data=None):
+    """
+    hsv_settings.json'daki kayıt (yoksa config varsayılanları) -> (light_hsv, dark_hsv),
+    her biri ((h,s,v), (h,s,v)) — HealthChecker ile aynı format.
+    """
+    if data is None:
+        data = load_json(config.SETTINGS_PATH) or {}
+    item = data.get(feature)
+    if item:
+        light = (tuple(item.get("light", (0, 0, 0))), tuple(item.get("light_up", (0, 0, 0))))
+        dark = (tuple(item.get("dark", (0, 0, 0))), tuple(item.get("dark_up", (0, 0, 0))))
+        return light, dark
+    return DEFAULT_HSV.get(feature, DEFAULT_HSV["Stamina"])
@@ -0,0 +1,133 @@
+import builtins
+import json
+import os
+import sys
+import time
+
+# Başlangıç profili (python main.py --profile-startup): modül başına import süresi,
+# init adımlarının süresi ve pencere gösterildiğindeki bellek kullanımı.
+#
+# Import süreleri builtins.__import__ sarılarak ölçülür; her modülün *kendi* süresi
+# (içinde yüklediği alt modüller hariç) tutulur ve üçüncü parti paketler en üst paket
+# adında toplanır (numpy.core.* -> numpy). Backend'ler (mss, pyautogui, interception,
+# win32gui) lazy yüklendiği için pencere açılışında listede görünmemeleri beklenir.
+
+BACKENDS = ("mss", "pyautogui", "interception", "win32gui", "core.backends.windows", "core.backends.x11")
+FIRST_PARTY = ("config", "core", "features", "ui", "main", "headless", "benchmarks")
+
+
+def _group(name):
+    top = name.split(".")[0]
+    return name if top in FIRST_PARTY else top
+
+
+def rss_mb():
+    """Process'in resident bellek kullanımı (MB); ölçülemezse None."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PMC(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        pmc = PMC()
+        pmc.cb = ctypes.sizeof(PMC)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(pmc), pmc.cb)
+        return pmc.WorkingSetSize / 1e6
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfiler:
+    """
+    with StartupProfiler() as prof:
+        with prof.step("MainUI()"):
+            ...
+    prof.report()  -> tablo yazdırır; save(path) JSON'a ekler (zaman içinde takip için).
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.imports = {}     # group -> self time (s)
+        self.steps = []       # (name, seconds)
+        self._stack = []      # child time accumulators of in-progress imports
+        self._orig_import = None
+        self.t0 = clock()
+
+    # ---- import timing ----
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        t = self.clock()
+        self._stack.append(0.0)
+        try:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        finally:
+            child = self._stack.pop()
+            total = self.clock() - t
+            key = _group(name)
+            self.imports[key] = self.imports.get(key, 0.0) + (total - child)
+            if self._stack:
+                self._stack[-1] += total
+
+    def __enter__(self):
+        self._orig_import = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._orig_import
+        return False
+
+    # ---- init steps ----
+    def step(self, name):
+        prof = self
+
+        class _Step:
+            def __enter__(self):
+                self.t = prof.clock()
+
+            def __exit__(self, *exc):
+                prof.steps.append((name, prof.clock() - self.t))
+                return False
+        return _Step()
+
+    def summary(self):
+        return {
+            "time_to_window_ms": (self.clock() - self.t0) * 1e3,
+            "rss_mb": rss_mb(),
+            "imports_ms": {k: v * 1e3 for k, v in sorted(self.imports.items(), key=lambda kv: -kv[1])},
+            "steps_ms": {k: v * 1e3 for k, v in self.steps},
+            "backends_loaded": [b for b in BACKENDS if b in sys.modules],
+        }
+
+    def report(self, top=15):
+        s = self.summary()
+        print(f"[Startup] pencereye kadar {s['time_to_window_ms']:.0f} ms | RSS "
+              + (f"{s['rss_mb']:.0f} MB" if s["rss_mb"] is not None else "?"))
+        print(f"{'import':<36} {'ms':>8}")
+        for name, ms in list(s["imports_ms"].items())[:top]:
+            print(f"{name:<36} {ms:8.1f}")
+        print(f"{'init step':<36} {'ms':>8}")
+        for name, ms in s["steps_ms"].items():
+            print(f"{name:<36} {ms:8.1f}")
+        print("[Startup] yüklü backend'ler: " + (", ".join(s["backends_loaded"]) or "yok (lazy)"))
+        return s
+
+    def save(self, path, summary=None):
+        """Sonucu JSON satırı olarak dosyaya ekler."""
+        summary = summary or self.summary()
+        summary["time"] = time.time()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import threading
+import cv2
+import numpy as np
+import config
+
+# Derlenmiş template cache'i: decode edilmiş PNG ve yeniden boyutlanmış varyantları
+# assets/.cache altında .npy olarak saklanır. Anahtar, PNG dosyasının içerik hash'i ve
+# hedef boyuttur (w x h = ölçek); PNG değişirse hash değişir, eski dosyalar kullanılmaz.
+# .npy'ler mmap_mode="r" ile açılır: decode / resize yapılmaz, sayfalar ihtiyaç oldukça okunur.
+#
+# Not: cv2.matchTemplate (TM_CCOEFF_NORMED) template'in ortalama/norm terimlerini her çağrıda
+# kendisi hesaplar ve dışarıdan almaz; bu yüzden normalizasyon terimleri saklanmaz.
+
+# template başına diskte tutulacak en fazla varyant (auto-scale farklı ROI boyutlarında çok sayıda üretebilir)
+MAX_DISK_VARIANTS = 32
+
+_digests = {}   # abs path -> (mtime_ns, size, digest)
+_lock = threading.Lock()
+
+
+def file_digest(path):
+    """PNG içeriğinin kısa hash'i (mtime/size değişmedikçe process içinde tekrar okunmaz)."""
+    st = os.stat(path)
+    with _lock:
+        hit = _digests.get(path)
+    if hit is not None and hit[:2] == (st.st_mtime_ns, st.st_size):
+        return hit[2]
+    with open(path, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    with _lock:
+        _digests[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def _cache_path(path, digest, size=None, cache_dir=None):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = f"{stem}-{digest}" + ("" if size is None else f"-{size[0]}x{size[1]}") + ".npy"
+    return os.path.join(cache_dir or config.TEMPLATE_CACHE_DIR, name)
+
+
+def _load(cpath):
+    try:
+        return np.load(cpath, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        print("[TemplateCache] bozuk cache dosyası yok sayıldı:", cpath, e)
+        return None
+
+
+def _save(cpath, arr):
+    """Atomik yazım (yarım dosya okunmasın); yazılamazsa (salt okunur dizin) sadece uyarır."""
+    try:
+        os.makedirs(os.path.dirname(cpath), exist_ok=True)
+        tmp = f"{cpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(arr))
+        os.replace(tmp, cpath)
+    except OSError as e:
+        print("[TemplateCache] yazılamadı:", cpath, e)
+
+
+def load_compiled(path, cache_dir=None):
+    """
+    PNG -> BGR array. Cache'te varsa memory-mapped .npy (decode yok), yoksa cv2.imread
+    ile okunup cache'e yazılır. Dönüş: (array, digest).
+    """
+    digest = file_digest(path)
+    cpath = _cache_path(path, digest, cache_dir=cache_dir)
+    if os.path.isfile(cpath):
+        tpl = _load(cpath)
+        if tpl is not None:
+            return tpl, digest
+    tpl = cv2.imread(path, cv2.IMREAD_COLOR)
+    if tpl is None:
+        raise IOError(f"Template can't be read: {path}")
+    _save(cpath, tpl)
+    return tpl, digest
+
+
+def load_variant(path, digest, tpl, size, cache_dir=None):
+    """
+    tpl'nin size=(w, h) boyutuna INTER_AREA ile küçültülmüş hali; diskte varsa mmap'lenir,
+    yoksa hesaplanıp (varyant sınırı aşılmadıysa) yazılır.
+    """
+    cpath = _cache_path(path, digest, size, cache_dir)
+    if os.path.isfile(cpath):
+        arr = _load(cpath)
+        if arr is not None and arr.shape[:2] == (size[1], size[0]):
+            return arr
+    arr = cv2.resize(np.asarray(tpl), size, interpolation=cv2.INTER_AREA)
+    prefix = os.path.basename(_cache_path(path, digest, cache_dir=cache_dir))[:-4] + "-"
+    try:
+        n = sum(1 for f in os.listdir(os.path.dirname(cpath)) if f.startswith(prefix))
+    except OSError:
+        n = 0
+    if n < MAX_DISK_VARIANTS:
+        _save(cpath, arr)
+    return arr
@@ -1,17 +1,75 @@
 import cv2
 import os
+import threading
+from core import template_cache
+
+# pyramid modunda template'in en kısa kenarı bu değerin altına inmez
+PYRAMID_MIN_TEMPLATE = 12
+
+# in-memory resized variants per matcher (auto-scale may produce one per ROI size)
+MAX_MEMORY_VARIANTS = 64
+
+# process-wide caches: decoded templates per path (-> (array, content digest)), matchers per (path, options)
+_templates = {}
+_matchers = {}
+_lock = threading.Lock()
+
+def _load_entry(template_path):
+    path = os.path.abspath(template_path)
+    with _lock:
+        entry = _templates.get(path)
+    if entry is not None:
+        return entry
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Template not found: {template_path}")
+    # decoded array comes from the compiled cache (assets/.cache, memory-mapped) when available
+    entry = template_cache.load_compiled(path)
+    with _lock:
+        return _templates.setdefault(path, entry)
+
+def load_template(template_path):
+    """Template'i diskten bir kez okur; sonraki çağrılar aynı array'i döner."""
+    return _load_entry(template_path)[0]
+
+def get_matcher(template_path, threshold=0.85, auto_scale=True, **kwargs):
+    """
+    Process-wide matcher registry: aynı template + ayarlar için her zaman aynı
+    TemplateMatcher döner (template bir kez yüklenir, piramit cache'i korunur).
+    """
+    key = (os.path.abspath(template_path), float(threshold), bool(auto_scale), tuple(sorted(kwargs.items())))
+    with _lock:
+        m = _matchers.get(key)
+    if m is None:
+        m = TemplateMatcher(template_path, threshold=threshold, auto_scale=auto_scale, **kwargs)
+        with _lock:
+            m = _matchers.setdefault(key, m)
+    return m
 
 class TemplateMatcher:
-    def __init__(self, template_path, threshold=0.85, auto_scale=True):
-        if not os.path.isfile(template_path):
-            raise FileNotFoundError(f"Template not found: {template_path}")
-        tpl = cv2.imread(template_path, cv2.IMREAD_COLOR)
-        if tpl is None:
-            raise IOError(f"Template can't be read: {template_path}")
+    """
+    pyramid_levels > 0: önce 1/2^L ölçekte eşleştirir, sonra sadece en iyi top_k adayın
+    çevresinde tam çözünürlükte arar. Büyük (1440p/4K) pencerelerde tarama süresini
+    yüzlerce ms'den onlarca ms'ye indirir. Template piramidi matcher üzerinde cache'lenir.
+
+    Tracking modu (track()): son isabet hatırlanır ve önce onun çevresindeki küçük bir
+    pencerede (± track_margin), son isabetin boyutundaki template ile doğrulanır; sadece skor
+    eşik altına düşerse tüm görüntüde aranır. find_scaled() UI ölçeği değiştiğinde template'i
+    birkaç ölçekte dener (auto_scale sadece görüntüden büyük template'i küçültür).
+    """
+    def __init__(self, template_path, threshold=0.85, auto_scale=True, pyramid_levels=0, top_k=3,
+                 track_margin=16):
+        tpl, self.digest = _load_entry(template_path)
+        self.template_path = os.path.abspath(template_path)
         self.template = tpl
+        self._variants = {}  # (w, h) -> resized template (auto-scale / pyramid)
         self.t_h, self.t_w = tpl.shape[:2]
         self.threshold = float(threshold)
         self.auto_scale = bool(auto_scale)
+        self.pyramid_levels = int(pyramid_levels)
+        self.top_k = max(1, int(top_k))
+        self._pyramid_cache = {}  # (tw, th, level) -> downscaled template
+        self.track_margin = int(track_margin)
+        self.last_hit = None  # (x, y, w, h, score) in the caller's coordinate space (see track)
 
     def _prepare_template_for(self, image):
         ih, iw = image.shape[:2]
@@ -23,23 +81,118 @@ class TemplateMatcher:
         scale = min(max( (ih / th) if th else 0, 0.01), max( (iw / tw) if tw else 0, 0.01))
         new_w = max(1, int(tw * scale))
         new_h = max(1, int(th * scale))
-        tpl_resized = cv2.resize(self.template, (new_w, new_h), interpolation=cv2.INTER_AREA)
-        return tpl_resized, new_w, new_h
+        return self._variant((new_w, new_h)), new_w, new_h
+
+    def _variant(self, size):
+        """Template'in size=(w, h) boyutlu hali: önce bellekte, sonra diskteki derlenmiş cache'te."""
+        tpl = self._variants.get(size)
+        if tpl is None:
+            if len(self._variants) >= MAX_MEMORY_VARIANTS:
+                self._variants.clear()
+            tpl = template_cache.load_variant(self.template_path, self.digest, self.template, size)
+            self._variants[size] = tpl
+        return tpl
+
+    def _pyramid_template(self, tpl, level):
+        th, tw = tpl.shape[:2]
+        f = 1 << level
+        size = (max(1, tw // f), max(1, th // f))
+        if tpl is self.template:
+            return self._variant(size)
+        # pyramid of an auto-scaled variant: memory only
+        key = (tw, th, level)
+        small = self._pyramid_cache.get(key)
+        if small is None:
+            small = cv2.resize(tpl, size, interpolation=cv2.INTER_AREA)
+            self._pyramid_cache[key] = small
+        return small
+
+    def _usable_levels(self, image, tw, th, levels):
+        ih, iw = image.shape[:2]
+        while levels > 0:
+            f = 1 << levels
+            if min(tw, th) // f >= PYRAMID_MIN_TEMPLATE and iw // f >= tw // f and ih // f >= th // f:
+                break
+            levels -= 1
+        return levels
 
-    def find_best(self, image):
+    def _find_best_pyramid(self, image, tpl, tw, th, levels):
+        f = 1 << levels
+        ih, iw = image.shape[:2]
+        small_img = cv2.resize(image, (iw // f, ih // f), interpolation=cv2.INTER_AREA)
+        small_tpl = self._pyramid_template(tpl, levels)
+        res = cv2.matchTemplate(small_img, small_tpl, cv2.TM_CCOEFF_NORMED)
+        sth, stw = small_tpl.shape[:2]
+
+        # coarse seviyede en iyi top_k aday (non-max suppression ile)
+        candidates = []
+        for _ in range(self.top_k):
+            _, val, _, (cx, cy) = cv2.minMaxLoc(res)
+            candidates.append((cx, cy))
+            res[max(0, cy - sth // 2):cy + sth // 2 + 1, max(0, cx - stw // 2):cx + stw // 2 + 1] = -1.0
+
+        # tam çözünürlükte sadece adayların çevresinde ara
+        best = None
+        pad = f + 2
+        for cx, cy in candidates:
+            x0 = max(0, cx * f - pad); y0 = max(0, cy * f - pad)
+            x1 = min(iw, cx * f + tw + pad); y1 = min(ih, cy * f + th + pad)
+            if x1 - x0 < tw or y1 - y0 < th:
+                continue
+            r = cv2.matchTemplate(image[y0:y1, x0:x1], tpl, cv2.TM_CCOEFF_NORMED)
+            _, val, _, (x, y) = cv2.minMaxLoc(r)
+            if best is None or val > best[2]:
+                best = (x0 + x, y0 + y, val)
+        return best
+
+    def _sized(self, image, size):
+        """Template'in size=(w, h) hali; görüntüye sığmıyorsa (None, None, None)."""
+        tw, th = size
+        ih, iw = image.shape[:2]
+        if tw > iw or th > ih or tw < 1 or th < 1:
+            return None, None, None
+        if (tw, th) == (self.t_w, self.t_h):
+            return self.template, tw, th
+        return self._variant((tw, th)), tw, th
+
+    def find_best(self, image, pyramid_levels=None, size=None):
+        """size=(w, h): template'i bu boyutta ara (ör. son isabetin boyutu); None = doğal boyut / auto_scale."""
         if image is None:
             return None
-        tpl, tw, th = self._prepare_template_for(image)
+        if size is None:
+            tpl, tw, th = self._prepare_template_for(image)
+        else:
+            tpl, tw, th = self._sized(image, size)
         if tpl is None:
             return None
-        res = cv2.matchTemplate(image, tpl, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        levels = self.pyramid_levels if pyramid_levels is None else int(pyramid_levels)
+        levels = self._usable_levels(image, tw, th, levels) if levels > 0 else 0
+        if levels > 0:
+            best = self._find_best_pyramid(image, tpl, tw, th, levels)
+            if best is None:
+                return None
+            x, y, max_val = best
+        else:
+            res = cv2.matchTemplate(image, tpl, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, (x, y) = cv2.minMaxLoc(res)
         if max_val >= self.threshold:
-            x, y = max_loc
             return (int(x), int(y), int(tw), int(th), float(max_val))
         return None
 
-    def find_in_roi(self, parent_image, roi_rect):
+    def find_scaled(self, image, scales):
+        """
+        Template'i doğal boyutunun her `scales` katında arar; eşiği geçen en yüksek skorlu
+        isabet (x, y, w, h, score) veya None. last_hit'e dokunmaz (başka thread'den çağrılabilir).
+        """
+        best = None
+        for s in scales:
+            size = (max(1, int(round(self.t_w * s))), max(1, int(round(self.t_h * s))))
+            hit = self.find_best(image, size=size)
+            if hit is not None and (best is None or hit[4] > best[4]):
+                best = hit
+        return best
+
+    def find_in_roi(self, parent_image, roi_rect, size=None):
         px, py, pw, ph = roi_rect
         ih, iw = parent_image.shape[:2]
         px = max(0, int(px)); py = max(0, int(py))
@@ -47,8 +200,30 @@ class TemplateMatcher:
         if pw <= 0 or ph <= 0:
             return None
         roi = parent_image[py:py+ph, px:px+pw]
-        hit = self.find_best(roi)
+        hit = self.find_best(roi, size=size)
         if hit is None:
             return None
         x, y, w, h, score = hit
         return (px + x, py + y, w, h, score)
+
+    def track(self, image, origin=(0, 0), widen=True):
+        """
+        image: aranacak görüntü; origin: image'in (0,0) pikselinin çağıranın koordinat
+        sistemindeki (ör. ekran) yeri. last_hit ve dönüş değeri bu koordinat sistemindedir.
+        Önce last_hit ± track_margin penceresinde, last_hit boyutundaki template ile arar;
+        bulamazsa ve widen=True ise tüm image'de.
+        Dönüş: (x, y, w, h, score) veya None.
+        """
+        ox, oy = int(origin[0]), int(origin[1])
+        hit = None
+        if self.last_hit is not None:
+            x, y, w, h, _ = self.last_hit
+            m = self.track_margin
+            hit = self.find_in_roi(image, (x - ox - m, y - oy - m, w + 2 * m, h + 2 * m), size=(w, h))
+        if hit is None and widen:
+            hit = self.find_best(image)
+        if hit is None:
+            return None
+        x, y, w, h, score = hit
+        self.last_hit = (ox + x, oy + y, w, h, score)
+        return self.last_hit
@@ -0,0 +1,138 @@
+import os
+import time
+import numpy as np
+
+# Sabit boyutlu, memory-mapped halka dosyası: (t, feature, percent, action, client) kayıtları.
+#
+# Dosya düzeni: 64 baytlık başlık (magic, version, capacity, head, count) + capacity adet
+# 15 baytlık paketlenmiş kayıt. Yazma tek thread'den (bot) yapılır; head/count kayıt
+# yazıldıktan sonra güncellenir. Okuyucular (UI) kopyasız view'ler ve searchsorted ile
+# çalışır; en eski kayıt üzerine yazılırken okunursa o tek kayıt yeni değeri gösterebilir.
+
+RECORD_DTYPE = np.dtype([("t", "<f8"), ("feature", "u1"), ("percent", "<f4"), ("action", "u1"),
+                         ("client", "u1")])
+
+FEATURE_CODES = {"Health": 1, "Mana": 2, "Stamina": 3}
+FEATURE_NAMES = {v: k for k, v in FEATURE_CODES.items()}
+ACTION_CODES = {None: 0, "heal": 1, "mana": 2, "pickup": 3}
+ACTION_NAMES = {v: k for k, v in ACTION_CODES.items()}
+
+_MAGIC = 0x42415253  # "BARS"
+_VERSION = 2
+_HEADER_BYTES = 64
+_H_MAGIC, _H_VERSION, _H_CAPACITY, _H_HEAD, _H_COUNT = range(5)
+
+
+class TimeSeriesStore:
+    """
+    path: halka dosyası (yoksa veya kapasitesi farklıysa yeniden oluşturulur).
+    capacity: kayıt sayısı; dosya boyutu 64 + 15 * capacity bayt, bellek kullanımı sabit.
+    Zaman damgaları varsayılan olarak time.time() (oturumlar arası karşılaştırılabilir).
+    """
+    def __init__(self, path, capacity=1 << 22, clock=time.time):
+        self.path = path
+        self.clock = clock
+        capacity = int(capacity)
+        size = _HEADER_BYTES + RECORD_DTYPE.itemsize * capacity
+        reuse = False
+        if os.path.isfile(path) and os.path.getsize(path) == size:
+            hdr = np.memmap(path, dtype="<i8", mode="r", shape=(5,))
+            reuse = int(hdr[_H_MAGIC]) == _MAGIC and int(hdr[_H_VERSION]) == _VERSION \
+                and int(hdr[_H_CAPACITY]) == capacity
+            del hdr
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        mode = "r+" if reuse else "w+"
+        self._hdr = np.memmap(path, dtype="<i8", mode=mode, shape=(5,))
+        if not reuse:
+            self._hdr[:] = (_MAGIC, _VERSION, capacity, 0, 0)
+        self.data = np.memmap(path, dtype=RECORD_DTYPE, mode="r+", offset=_HEADER_BYTES, shape=(capacity,))
+        self.capacity = capacity
+
+    def __len__(self):
+        return int(self._hdr[_H_COUNT])
+
+    # ---- writer ----
+    def append(self, feature, percent, action=None, t=None, client=0):
+        i = int(self._hdr[_H_HEAD])
+        self.data[i] = (self.clock() if t is None else t, FEATURE_CODES.get(feature, 0),
+                        np.nan if percent is None else percent, ACTION_CODES.get(action, 0), client)
+        self._hdr[_H_HEAD] = (i + 1) % self.capacity
+        if self._hdr[_H_COUNT] < self.capacity:
+            self._hdr[_H_COUNT] += 1
+
+    def flush(self):
+        self.data.flush()
+        self._hdr.flush()
+
+    def close(self):
+        # memmap'ler son referansla birlikte kapanır
+        self.flush()
+        del self.data
+        del self._hdr
+
+    # ---- readers ----
+    def _segments(self):
+        """Kronolojik sırada (eski, yeni) iki view; halka dolmadıysa eski boştur."""
+        head = int(self._hdr[_H_HEAD])
+        count = int(self._hdr[_H_COUNT])
+        if count < self.capacity:
+            return self.data[:0], self.data[:count]
+        return self.data[head:], self.data[:head]
+
+    def since(self, t0):
+        """t >= t0 olan kayıtlar (kronolojik, structured array kopyası)."""
+        old, new = self._segments()
+        if len(new) and new["t"][0] <= t0:
+            return np.array(new[np.searchsorted(new["t"], t0):])
+        if len(old):
+            part = old[np.searchsorted(old["t"], t0):]
+            return np.concatenate([part, new]) if len(part) else np.array(new)
+        return np.array(new)
+
+    def last(self, seconds, feature=None, now=None, client=None):
+        """Son `seconds` saniyenin kayıtları; feature / client verilirse sadece onlar."""
+        now = self.clock() if now is None else now
+        recs = self.since(now - seconds)
+        if feature is not None:
+            recs = recs[recs["feature"] == FEATURE_CODES.get(feature, 0)]
+        if client is not None:
+            recs = recs[recs["client"] == client]
+        return recs
+
+    def window_stats(self, feature, seconds, window=1.0, now=None):
+        """
+        Son `seconds` saniyeyi `window` saniyelik dilimlere böler.
+        Dönüş: {"start", "min", "mean", "count"} — her biri dilim başına numpy array (boş dilimler atlanır).
+        """
+        now = self.clock() if now is None else now
+        recs = self.last(seconds, feature, now)
+        recs = recs[~np.isnan(recs["percent"])]
+        if len(recs) == 0:
+            empty = np.array([])
+            return {"start": empty, "min": empty, "mean": empty, "count": empty}
+        t = recs["t"]
+        p = recs["percent"].astype(np.float64)
+        bins = np.floor((t - (now - seconds)) / window).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        counts = np.diff(np.r_[starts, len(p)])
+        return {
+            "start": now - seconds + bins[starts] * window,
+            "min": np.minimum.reduceat(p, starts),
+            "mean": np.add.reduceat(p, starts) / counts,
+            "count": counts,
+        }
+
+    def summary(self, seconds, now=None):
+        """{feature: {"min", "mean", "n", "actions"}} — son `seconds` saniye için."""
+        now = self.clock() if now is None else now
+        recs = self.last(seconds, now=now)
+        out = {}
+        for code, name in FEATURE_NAMES.items():
+            sel = recs[recs["feature"] == code]
+            vals = sel["percent"][~np.isnan(sel["percent"])]
+            if len(vals) == 0:
+                continue
+            out[name] = {"min": float(vals.min()), "mean": float(vals.mean()), "n": int(len(vals)),
+                         "actions": int(np.count_nonzero(sel["action"]))}
+        return out
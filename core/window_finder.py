@@ -1,25 +1,27 @@
-import win32gui
+# Platform-specific work (win32gui / X11 properties) lives in core.backends; importing this
+# module stays cheap and the backend is only loaded when a window is looked up.
+from core.backends import get_backend
+
 
 def find_window_by_title(substring):
     """
     Finds first visible window whose title contains the substring (case-insensitive).
     Returns dict: {"hwnd": hwnd, "left": left, "top": top, "width": w, "height": h} or None.
     """
-    substring = substring.lower()
-    found = {"hwnd": None}
+    wins = find_windows_by_title(substring)
+    return wins[0] if wins else None
+
 
-    def _enum(h, _):
-        try:
-            title = win32gui.GetWindowText(h)
-            if title and substring in title.lower() and win32gui.IsWindowVisible(h):
-                found["hwnd"] = h
-        except Exception:
-            pass
+def find_windows_by_title(substring):
+    """
+    All visible windows whose title contains the substring (case-insensitive), in Z order.
+    Returns list of dicts like find_window_by_title (empty list if none).
+    """
+    return get_backend().find_windows(substring)
 
-    win32gui.EnumWindows(_enum, None)
-    hwnd = found.get("hwnd")
-    if not hwnd:
-        return None
-    rect = win32gui.GetWindowRect(hwnd)
-    left, top, right, bottom = rect
-    return {"hwnd": hwnd, "left": left, "top": top, "width": right - left, "height": bottom - top}
+def focus_window(hwnd):
+    """Brings the window to the foreground so that global key events reach it."""
+    try:
+        get_backend().focus_window(hwnd)
+    except Exception as e:
+        print("[Window] odaklanamadı:", e)
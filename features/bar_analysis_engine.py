@@ -0,0 +1,174 @@
+import cv2
+import numpy as np
+from features.health_checker import morph_kernel
+
+
+def _norm_range(rng):
+    lower, upper = rng
+    return (tuple(int(v) for v in lower), tuple(int(v) for v in upper))
+
+
+class _Canvas:
+    """
+    Bar'ların yan yana dizildiği tek bir görüntü düzeni: bar i kendi sütunlarına y=0'dan yazılır,
+    bar'ların arasında ve altında `pad` piksellik boşluk (gutter) kalır; her sütun en fazla bir
+    bar'a aittir, böylece tek bir sütun toplamı (ve reduceat) tüm bar'ların sayılarını verir.
+    hsv: bar'ların HSV pikselleri; light/dark sınırları: piksel başına inRange alt/üst değerleri
+    (her bar kendi feature'ının aralığı, gutter'da boş aralık). Morfoloji tüm canvas'ta tek seferde
+    yapılır: gutter her erode öncesi 255, her dilate öncesi 0 yapılır — bu, cv2'nin görüntü
+    kenarındaki nötr border'ıyla aynı etkidir, sonuç bar başına clean_mask ile birebir aynıdır.
+    """
+    def __init__(self, sizes, ranges, thresholds, pad):
+        height = max(h for h, _ in sizes) + pad
+        width = sum(w for _, w in sizes) + pad * (len(sizes) - 1)
+        self.cols = []          # (x0, x1, h) per bar
+        gutter = np.full((height, width), 255, dtype=np.uint8)
+        x = 0
+        for h, w in sizes:
+            self.cols.append((x, x + w, h))
+            gutter[:h, x:x + w] = 0
+            x += w + pad
+        self.gutter = gutter
+        self.starts = np.array([x0 for x0, _, _ in self.cols])
+        # projection: per-column bar height and the owning checker's col_thresh (gutter: never filled)
+        self.col_h = np.ones(width)
+        self.col_thresh = np.full(width, np.inf)
+        for (x0, x1, h), thr in zip(self.cols, thresholds):
+            self.col_h[x0:x1] = h
+            self.col_thresh[x0:x1] = thr
+        self.inside = cv2.bitwise_not(gutter)
+        self.hsv = np.zeros((height, width, 3), dtype=np.uint8)
+        self.light = np.zeros((height, width), dtype=np.uint8)
+        self.dark = np.zeros_like(self.light)
+        self.bounds = {}
+        for name, k in (("light", 0), ("dark", 1)):
+            lo = np.full((height, width, 3), 255, dtype=np.uint8)
+            hi = np.zeros((height, width, 3), dtype=np.uint8)
+            for (x0, x1, h), rng in zip(self.cols, ranges):
+                lo[:h, x0:x1] = rng[k][0]
+                hi[:h, x0:x1] = rng[k][1]
+            self.bounds[name] = (lo, hi)
+
+    def mask(self, name, kernel):
+        """Tüm bar'lar için inRange + clean_mask (open + close); gutter 0 bırakılır."""
+        out = getattr(self, name)
+        lo, hi = self.bounds[name]
+        cv2.inRange(self.hsv, lo, hi, dst=out)
+        for op, neutral in ((cv2.erode, 255), (cv2.dilate, 0), (cv2.dilate, 0), (cv2.erode, 255)):
+            if neutral:
+                cv2.bitwise_or(out, self.gutter, dst=out)
+            else:
+                cv2.bitwise_and(out, self.inside, dst=out)
+            op(out, kernel, dst=out)
+        cv2.bitwise_and(out, self.inside, dst=out)
+        return out
+
+    def counts(self, mask):
+        """Tek sütun toplamından bar başına (mask piksel sayısı, col_thresh'i geçen sütun sayısı) dizileri."""
+        sums = cv2.reduce(mask, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0] // 255
+        # same per-column formula as HealthChecker.analyze_masks (projection)
+        filled = np.add.reduceat(sums / self.col_h > self.col_thresh, self.starts)
+        return np.add.reduceat(sums, self.starts).tolist(), filled.tolist()
+
+
+class BarAnalysisEngine:
+    """
+    Tüm bar'ları (Health/Mana/Stamina, ileride parti üyeleri, hedef HP...) tek geçişte analiz eder.
+
+    Bar'ların birleşik dikdörtgeni bir kez HSV'ye çevrilir (tek cvtColor); her bar'ın HSV view'i
+    ortak bir canvas'a (bar'lar yan yana) yazılır ve her feature'ın light/dark aralığı piksel
+    başına sınırlarla tek bir inRange'de uygulanır. Open/close morfolojisi ve sütun sayımı da canvas üzerinde bar
+    sayısından bağımsız sayıda çağrıyla yapılır; bar başına kalan iş bir view kopyası ve
+    checker'ın yüzde formülü (projection_percent / pixel_percent; contour için analyze_masks). Sonuçlar
+    HealthChecker.analyze_roi ile birebir aynıdır. Ölçümler: python -m benchmarks.bench_bar_engine
+
+    scanline / track_edge checker'ları sadece birkaç satır okur, use_lut checker'ları HSV'ye
+    hiç çevirmez; bunlar ortak dönüşüme girmez, kendi analyze_roi'lerini çalıştırır.
+
+    checkers: {feature: HealthChecker} — aralıklar her analyze()'da checker'lardan okunur.
+    version: herhangi bir feature'ın aralığı değişince artar (ROI cache'i geçersiz olsun).
+    """
+    def __init__(self, checkers, ksize=3):
+        self.checkers = checkers
+        self.kernel = morph_kernel(ksize)
+        self._ranges = {}
+        self._raw = None        # checkers' (light, dark) as last seen, to skip normalizing every tick
+        self._canvas = None
+        self._canvas_key = None
+        self.version = 0
+        self.refresh()
+
+    def refresh(self):
+        raw = [(feat, ch.light_hsv, ch.dark_hsv) for feat, ch in self.checkers.items()]
+        if raw == self._raw:
+            return
+        self._raw = raw
+        ranges = {feat: (_norm_range(light), _norm_range(dark)) for feat, light, dark in raw}
+        if ranges != self._ranges:
+            self._ranges = ranges
+            self.version += 1
+
+    def _canvas_for(self, feats, rects):
+        sizes = tuple((rects[f][3] - rects[f][1], rects[f][2] - rects[f][0]) for f in feats)
+        ranges = tuple(self._ranges[f] for f in feats)
+        thresholds = tuple(self.checkers[f].col_thresh for f in feats)
+        key = (sizes, ranges, thresholds)
+        if self._canvas_key != key:
+            self._canvas = _Canvas(sizes, ranges, thresholds, pad=self.kernel.shape[0] // 2)
+            self._canvas_key = key
+        return self._canvas
+
+    def analyze(self, frame, rects):
+        """
+        frame: paylaşılan bölge (BGR veya BGRA), ör. MultiRegionCapture.grab() çıktısı.
+        rects: {feature: (x0, y0, x1, y1)} frame-lokal bar dikdörtgenleri.
+        Dönüş: {feature: percent or None}
+        """
+        self.refresh()
+        out = {}
+        if frame is None or frame.size == 0 or not rects:
+            return out
+        shared = []
+        for feat, (x0, y0, x1, y1) in rects.items():
+            checker = self.checkers.get(feat)
+            if checker is None or x1 <= x0 or y1 <= y0:
+                out[feat] = None
+            elif checker.track_edge or checker.method == "scanline" or checker.use_lut:
+                out[feat] = checker.analyze_roi(frame[y0:y1, x0:x1])
+            else:
+                shared.append(feat)
+        if not shared:
+            return out
+        if len(shared) == 1:
+            # nothing to share: the canvas' fixed cost only pays off from two bars on
+            x0, y0, x1, y1 = rects[shared[0]]
+            out[shared[0]] = self.checkers[shared[0]].analyze_roi(frame[y0:y1, x0:x1])
+            return out
+
+        # only convert the bars' bounding box (frame may be a multi-client union region)
+        bx0 = min(rects[f][0] for f in shared)
+        by0 = min(rects[f][1] for f in shared)
+        bx1 = max(rects[f][2] for f in shared)
+        by1 = max(rects[f][3] for f in shared)
+        hsv = cv2.cvtColor(frame[by0:by1, bx0:bx1], cv2.COLOR_BGR2HSV)
+
+        canvas = self._canvas_for(shared, rects)
+        for (cx0, cx1, h), feat in zip(canvas.cols, shared):
+            x0, y0, x1, y1 = rects[feat]
+            canvas.hsv[:h, cx0:cx1] = hsv[y0 - by0:y1 - by0, x0 - bx0:x1 - bx0]
+        methods = [self.checkers[f].method for f in shared]
+        light = canvas.mask("light", self.kernel)
+        lp, filled = canvas.counts(light)
+        dp = canvas.counts(canvas.mask("dark", self.kernel))[0] if "pixel" in methods else None
+
+        for i, feat in enumerate(shared):
+            x0, y0, x1, y1 = rects[feat]
+            checker = self.checkers[feat]
+            if methods[i] == "projection":
+                out[feat] = checker.projection_percent(filled[i], lp[i], y1 - y0, x1 - x0)
+            elif methods[i] == "pixel":
+                out[feat] = checker.pixel_percent(lp[i], dp[i], frame[y0:y1, x0:x1])
+            else:
+                cx0, cx1, h = canvas.cols[i]
+                out[feat] = checker.analyze_masks(light[:h, cx0:cx1], None, frame[y0:y1, x0:x1], clean=False)
+        return out
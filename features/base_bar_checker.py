@@ -69,6 +69,9 @@ class BaseBarChecker:
 
         # Eşik altı aksiyon (opsiyonel)
         if self.key_on_low and percent < self.low_threshold and self.input_controller:
-            self.input_controller.press_key(self.key_on_low)
+            try:
+                self.input_controller.press_key(self.key_on_low)
+            except Exception as e:
+                print(f"Error pressing {self.key_on_low}: {e}")
 
         return float(percent)
\ No newline at end of file
@@ -1,74 +1,148 @@
 import cv2
 import numpy as np
+from core.color_lut import ColorClassLUT
+
+_kernels = {}
+
+def morph_kernel(ksize=3):
+    """Elliptic structuring element (cached per size)."""
+    kernel = _kernels.get(ksize)
+    if kernel is None:
+        kernel = _kernels[ksize] = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (ksize, ksize))
+    return kernel
+
+def clean_mask(mask, ksize=3):
+    """Open + close with an elliptic kernel (kernels are cached per size)."""
+    kernel = morph_kernel(ksize)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=1)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=1)
+    return mask
 
 class HealthChecker:
-    def __init__(self, light_hsv, dark_hsv, low_threshold=30.0, key_on_low=None, input_ctrl=None, method="projection"):
+    def __init__(self, light_hsv, dark_hsv, low_threshold=30.0, key_on_low=None, input_ctrl=None, method="projection",
+                 track_edge=False, use_lut=False):
         self.light_hsv = light_hsv
         self.dark_hsv = dark_hsv
         self.low_threshold = low_threshold
         self.key_on_low = key_on_low
         self.input_ctrl = input_ctrl
         self.active = True
-        self.method = method  # 'pixel', 'projection', 'contour'
+        self.method = method  # 'pixel', 'projection', 'contour', 'scanline'
+        self.col_thresh = 0.35  # projection: a column is filled when this fraction of it is light
+        self.scan_rows = 3  # scanline: sampled rows through the bar's vertical center
+        # track_edge: after one full reading, only a band of columns around the last fill edge
+        # is examined (scanline rows); the full method runs again when the band is inconclusive
+        self.track_edge = track_edge
+        self.track_band = 8       # columns on each side of the last edge
+        self.track_verify = 60    # full re-check after this many band readings (drift guard)
+        self.track_stats = {"band": 0, "full": 0}
+        # precompiled BGR->{light,dark} table instead of cvtColor + inRange + morphology
+        # (pixel / projection / contour; see core/color_lut.py for the tolerance)
+        self.lut = None
+        self.use_lut = use_lut
+        self.reset_tracking()
+
+    @property
+    def use_lut(self):
+        return self.lut is not None
+
+    @use_lut.setter
+    def use_lut(self, value):
+        if value and self.lut is None:
+            self.lut = ColorClassLUT(self.light_hsv, self.dark_hsv)
+        elif not value:
+            self.lut = None
 
     def set_light_hsv(self, lower, upper):
         self.light_hsv = (tuple(lower), tuple(upper))
+        self.reset_tracking()
+        if self.lut is not None:
+            self.lut.set_light_hsv(lower, upper)
 
     def set_dark_hsv(self, lower, upper):
         self.dark_hsv = (tuple(lower), tuple(upper))
+        self.reset_tracking()
+        if self.lut is not None:
+            self.lut.set_dark_hsv(lower, upper)
+
+    def reset_tracking(self):
+        """Son kenar bilgisini unutur; sıradaki okuma tam analiz yapar."""
+        self._track = None      # (roi width, fill edge in columns)
+        self._band_reads = 0
 
     def _clean_mask(self, mask, ksize=3):
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (ksize, ksize))
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=1)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=1)
-        return mask
+        return clean_mask(mask, ksize)
 
     def analyze_roi(self, roi_bgr):
         """
-        roi_bgr: small BGR image of the bar.
+        roi_bgr: small BGR (or BGRA, e.g. a zero-copy capture view) image of the bar.
         returns percent (0..100) or None
         """
         if roi_bgr is None or roi_bgr.size == 0:
             return None
+        if not self.track_edge:
+            return self._analyze_full(roi_bgr)
+
+        percent = self._analyze_band(roi_bgr)
+        if percent is not None:
+            self.track_stats["band"] += 1
+            return percent
+        self.track_stats["full"] += 1
+        percent = self._analyze_full(roi_bgr)
+        w = roi_bgr.shape[1]
+        self._track = None if percent is None else (w, percent / 100.0 * w)
+        self._band_reads = 0
+        return percent
+
+    def _analyze_full(self, roi_bgr):
+        if self.method == "scanline":
+            # only a few rows are classified; no full masks, no morphology
+            light, strip, value = self._scan_light(roi_bgr[self._scan_rows(roi_bgr.shape[0])])
+            return self._scanline_percent(light, strip, value)
+
+        if self.lut is not None:
+            # one table gather per pixel; the masks skip clean_mask (core/color_lut.py)
+            mask_light, mask_dark = self.lut.masks(roi_bgr, dark=self.method == "pixel")
+            return self.analyze_masks(mask_light, mask_dark, roi_bgr, clean=False)
 
         hsv = cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2HSV)
         l1, u1 = self.light_hsv
         l2, u2 = self.dark_hsv
-
         mask_light = cv2.inRange(hsv, np.array(l1, dtype=np.uint8), np.array(u1, dtype=np.uint8))
-        mask_light = self._clean_mask(mask_light, ksize=3)
-        mask_dark = cv2.inRange(hsv, np.array(l2, dtype=np.uint8), np.array(u2, dtype=np.uint8))
-        mask_dark = self._clean_mask(mask_dark, ksize=3)
+        mask_dark = None
+        if self.method == "pixel":
+            mask_dark = cv2.inRange(hsv, np.array(l2, dtype=np.uint8), np.array(u2, dtype=np.uint8))
+        return self.analyze_masks(mask_light, mask_dark, roi_bgr)
 
-        h, w = mask_light.shape[:2]
-        percent = None
+    def analyze_masks(self, mask_light, mask_dark, roi_bgr, clean=True):
+        """
+        light/dark masks of roi_bgr -> percent (0..100) or None.
+        clean=False: masks are already cleaned (BarAnalysisEngine cleans all bars in one pass)
+        or deliberately left as is (use_lut).
+        Only the "pixel" method reads mask_dark.
+        """
+        if self.method == "scanline":
+            rows = self._scan_rows(mask_light.shape[0])
+            return self._scanline_percent(mask_light[rows], roi_bgr[rows])
+
+        if clean:
+            mask_light = self._clean_mask(mask_light, ksize=3)
+            if self.method == "pixel":
+                mask_dark = self._clean_mask(mask_dark, ksize=3)
 
         if self.method == "pixel":
-            lp = int(cv2.countNonZero(mask_light))
-            dp = int(cv2.countNonZero(mask_dark))
-            total = lp + dp
-            if total == 0:
-                gray = cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2GRAY)
-                bright = int(cv2.countNonZero(cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)[1]))
-                total = h * w
-                if total == 0:
-                    return None
-                percent = (bright / total) * 100.0
-            else:
-                percent = (lp / total) * 100.0
-
-        elif self.method == "projection":
-            col_counts = np.sum(mask_light > 0, axis=0).astype(float)
-            col_frac = col_counts / float(h) if h>0 else col_counts
-            col_thresh = 0.35
-            filled_cols = np.count_nonzero(col_frac > col_thresh)
-            percent = (filled_cols / float(w)) * 100.0 if w>0 else 0.0
-            if np.sum(col_counts) < 3:
-                lp = int(cv2.countNonZero(mask_light))
-                total = h * w
-                percent = (lp / total) * 100.0 if total>0 else 0.0
-
-        elif self.method == "contour":
+            return self.pixel_percent(int(cv2.countNonZero(mask_light)), int(cv2.countNonZero(mask_dark)), roi_bgr)
+        if self.method == "projection":
+            h, w = mask_light.shape[:2]
+            # masks are 0/255: column sums / 255 = light pixels per column
+            col_counts = cv2.reduce(mask_light, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0] // 255
+            col_frac = col_counts / float(h)
+            filled_cols = int(np.count_nonzero(col_frac > self.col_thresh))
+            return self.projection_percent(filled_cols, int(col_counts.sum()), h, w)
+
+        h, w = mask_light.shape[:2]
+        percent = None
+        if self.method == "contour":
             contours, _ = cv2.findContours(mask_light, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             if not contours:
                 percent = 0.0
@@ -88,3 +162,102 @@ class HealthChecker:
             return None
         percent = max(0.0, min(100.0, float(percent)))
         return percent
+
+    # "pixel" / "projection" read only these counts from the cleaned masks; BarAnalysisEngine
+    # computes them for all bars at once and calls the same formulas
+
+    def pixel_percent(self, lp, dp, roi_bgr):
+        """lp / dp: light / dark piksel sayıları -> percent (hiçbiri yoksa parlak piksel oranı)."""
+        total = lp + dp
+        if total == 0:
+            h, w = roi_bgr.shape[:2]
+            gray = cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2GRAY)
+            bright = int(cv2.countNonZero(cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)[1]))
+            total = h * w
+            if total == 0:
+                return None
+            percent = (bright / total) * 100.0
+        else:
+            percent = (lp / total) * 100.0
+        return max(0.0, min(100.0, float(percent)))
+
+    def projection_percent(self, filled_cols, lp, h, w):
+        """filled_cols: light oranı col_thresh'i geçen sütun sayısı; lp: toplam light piksel."""
+        percent = (filled_cols / float(w)) * 100.0 if w>0 else 0.0
+        if lp < 3:
+            total = h * w
+            percent = (lp / total) * 100.0 if total>0 else 0.0
+        return max(0.0, min(100.0, float(percent)))
+
+    def _scan_rows(self, h):
+        """Bar'ın dikey ortasından geçen en fazla scan_rows satır (eşit aralıklı, kopyasız slice)."""
+        n = max(1, min(int(self.scan_rows), h))
+        step = max(1, h // (n + 1))
+        start = (h - step * (n - 1)) // 2
+        return slice(start, start + step * (n - 1) + 1, step)
+
+    def _scan_light(self, strip):
+        """Örnek satırlar -> (light maskesi, strip, V kanalı veya None)."""
+        if strip.shape[2] == 4:
+            strip = cv2.cvtColor(strip, cv2.COLOR_BGRA2BGR)
+        hsv = cv2.cvtColor(strip, cv2.COLOR_BGR2HSV)
+        l1, u1 = self.light_hsv
+        mask_light = cv2.inRange(hsv, np.array(l1, dtype=np.uint8), np.array(u1, dtype=np.uint8))
+        return mask_light, strip, hsv[..., 2]
+
+    def _analyze_band(self, roi_bgr):
+        """
+        Son kenarın ±track_band sütunluk bandını scanline satırlarında inceler.
+        Bandın solu dolu ve sağı boşsa (veya bant bar'ın ucuna dayanıyorsa) kenar bant içindedir;
+        değilse (büyük hasar, tam heal, genişlik değişti) None -> tam analiz. Maliyet bar
+        genişliğinden bağımsızdır.
+        """
+        h, w = roi_bgr.shape[:2]
+        if self._track is None or self._track[0] != w or self._band_reads >= self.track_verify:
+            return None
+        edge = int(self._track[1])
+        lo, hi = max(0, edge - self.track_band), min(w, edge + self.track_band + 1)
+        light, strip, value = self._scan_light(roi_bgr[self._scan_rows(h), lo:hi])
+        k = light.shape[0]
+        counts = cv2.reduce(light, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0]
+        if (lo > 0 and 2 * counts[0] <= 255 * k) or (hi < w and 2 * counts[-1] > 255 * k):
+            return None
+        filled = lo + self._scanline_edge(light, strip, value)
+        self._track = (w, filled)
+        self._band_reads += 1
+        return max(0.0, min(100.0, filled / w * 100.0))
+
+    def _scanline_percent(self, light_rows, strip=None, value=None):
+        """Örnek satırların light maskesi -> yüzde (bkz. _scanline_edge)."""
+        w = light_rows.shape[1]
+        if w == 0:
+            return None
+        return max(0.0, min(100.0, self._scanline_edge(light_rows, strip, value) / w * 100.0))
+
+    def _scanline_edge(self, light_rows, strip=None, value=None):
+        """
+        light_rows: örneklenen satırların light maskesi (k x w); strip: aynı satırların BGR(A)
+        pikselleri veya value: hazır V kanalı. Dönüş: dolu sütun sayısı (alt-piksel, float).
+        Dolu kısım soldan sürekli bir run kabul edilir: kenar, (light: +1, değil: -1) sütun
+        skorlarının prefix toplamını en büyük yapan sütundur (tek geçiş, O(k*w); tekil
+        gürültülü pikseller kenarı kaydırmaz). Kenar sütununda parlaklık (V) dolu ve boş
+        kısmın ortalamaları arasında lineer interpole edilerek alt-piksel kesir eklenir.
+        """
+        k, w = light_rows.shape[:2]
+        counts = cv2.reduce(light_rows, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0]
+        gain = np.cumsum(2 * counts - 255 * k)  # light: +255k, not light: -255k per column
+        edge = int(np.argmax(gain)) + 1
+        if gain[edge - 1] <= 0:
+            return 0.0
+        filled = float(edge)
+        if edge < w - 1:
+            if value is None:
+                if strip.shape[2] == 4:
+                    strip = cv2.cvtColor(strip, cv2.COLOR_BGRA2BGR)
+                value = cv2.cvtColor(strip, cv2.COLOR_BGR2HSV)[..., 2]
+            v_full = cv2.mean(value[:, :edge])[0]
+            v_empty = cv2.mean(value[:, edge + 1:])[0]
+            if v_full - v_empty > 1.0:
+                v_edge = cv2.mean(value[:, edge:edge + 1])[0]
+                filled += min(1.0, max(0.0, (v_edge - v_empty) / (v_full - v_empty)))
+        return filled
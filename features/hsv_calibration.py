@@ -0,0 +1,139 @@
+import cv2
+import numpy as np
+
+
+def otsu_threshold(hist):
+    """
+    1D histogram -> sınıflar arası varyansı en büyük yapan eşik t (sınıflar: <= t ve > t).
+    Histogram üzerinde 2-means ile aynı sonucu verir; O(bin sayısı).
+    """
+    hist = np.asarray(hist, dtype=np.float64)
+    total = hist.sum()
+    if total <= 0:
+        return None
+    bins = np.arange(len(hist), dtype=np.float64)
+    w0 = np.cumsum(hist)
+    m0 = np.cumsum(hist * bins)
+    w1 = total - w0
+    mean_all = m0[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mean_all * w0 - m0 * total) ** 2 / (w0 * w1)
+    between[(w0 == 0) | (w1 == 0)] = -1.0
+    t = int(np.argmax(between))
+    return t if between[t] >= 0 else None
+
+
+def _quantiles(hist, lo_q, hi_q):
+    """Histogramın lo_q / hi_q yüzdelik bin'leri."""
+    c = np.cumsum(hist)
+    total = c[-1]
+    lo = int(np.searchsorted(c, lo_q * total, side="right"))
+    hi = int(np.searchsorted(c, hi_q * total, side="left"))
+    return lo, max(lo, hi)
+
+
+def _hue_range(hist, lo_q, hi_q):
+    """
+    Hue (0..179) dairesel: histogram en büyük boş aralık kenara gelecek şekilde döndürülür,
+    yüzdelikler orada alınır. Aralık 0/180 sınırını geçerse (ör. kırmızı) inRange tek aralık
+    tutabildiği için kütlesi büyük olan taraf seçilir.
+    """
+    n = len(hist)
+    empty = hist == 0
+    shift = 0
+    if empty.any() and not empty.all():
+        # longest circular run of empty bins -> its end becomes bin 0
+        doubled = np.concatenate([empty, empty])
+        best_len, best_end, run = 0, 0, 0
+        for i, e in enumerate(doubled):
+            run = run + 1 if e else 0
+            if run > best_len:
+                best_len, best_end = min(run, n), i
+        shift = (best_end + 1) % n
+    lo, hi = _quantiles(np.roll(hist, -shift), lo_q, hi_q)
+    lo, hi = lo + shift, hi + shift
+    if hi < n:
+        return lo, hi
+    if lo >= n:
+        return lo - n, hi - n
+    # wraps: keep the side with more mass
+    if hist[lo:].sum() >= hist[:hi - n + 1].sum():
+        return lo, n - 1
+    return 0, hi - n
+
+
+class HsvCalibrator:
+    """
+    Bar ROI'lerinden akış halinde HSV kalibrasyonu; bellek frame sayısından bağımsız sabittir.
+
+    Her frame için V'ye göre koşullu H ve S histogramları (256x180 ve 256x256 sayaç) birikir.
+    suggest(): V histogramında Otsu eşiği açık (dolu) ve koyu (boş) pikselleri ayırır; her
+    sınıfın H/S/V aralığı kendi histogramının lo_q..hi_q yüzdeliklerinden + margin ile çıkar.
+    Koyu aralığın V üst sınırı eşiğin altında, açığınki üstünde kalır (örtüşmez).
+    """
+    def __init__(self, lo_q=0.02, hi_q=0.98, margins=(4, 25, 25), min_fraction=0.05):
+        self.lo_q = float(lo_q)
+        self.hi_q = float(hi_q)
+        self.margins = margins
+        self.min_fraction = float(min_fraction)  # bundan küçük sınıf (bar tam dolu/boş) önerilmez
+        self.hist_vh = np.zeros((256, 180), dtype=np.float64)
+        self.hist_vs = np.zeros((256, 256), dtype=np.float64)
+        self.frames = 0
+
+    @property
+    def count(self):
+        return int(self.hist_vh.sum())
+
+    def reset(self):
+        self.hist_vh[:] = 0
+        self.hist_vs[:] = 0
+        self.frames = 0
+
+    def add(self, roi_bgr):
+        """BGR/BGRA ROI'yi histogramlara ekler."""
+        if roi_bgr is None or roi_bgr.size == 0:
+            return
+        if roi_bgr.shape[2] == 4:
+            roi_bgr = cv2.cvtColor(roi_bgr, cv2.COLOR_BGRA2BGR)
+        hsv = cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2HSV)
+        self.hist_vh += cv2.calcHist([hsv], [2, 0], None, [256, 180], [0, 256, 0, 180])
+        self.hist_vs += cv2.calcHist([hsv], [2, 1], None, [256, 256], [0, 256, 0, 256])
+        self.frames += 1
+
+    def _class_range(self, v_lo, v_hi):
+        """V bin'leri [v_lo, v_hi] olan piksellerin ((h,s,v), (h,s,v)) aralığı; piksel yoksa None."""
+        hh = self.hist_vh[v_lo:v_hi + 1].sum(axis=0)
+        if hh.sum() <= 0:
+            return None
+        sh = self.hist_vs[v_lo:v_hi + 1].sum(axis=0)
+        vh = np.zeros(256)
+        vh[v_lo:v_hi + 1] = self.hist_vh[v_lo:v_hi + 1].sum(axis=1)
+        mh, ms, mv = self.margins
+        h0, h1 = _hue_range(hh, self.lo_q, self.hi_q)
+        s0, s1 = _quantiles(sh, self.lo_q, self.hi_q)
+        v0, v1 = _quantiles(vh, self.lo_q, self.hi_q)
+        lower = (max(0, h0 - mh), max(0, s0 - ms), max(v_lo, v0 - mv))
+        upper = (min(179, h1 + mh), min(255, s1 + ms), min(v_hi, v1 + mv))
+        return lower, upper
+
+    def suggest(self):
+        """
+        Dönüş: {"light": range or None, "dark": range or None, "threshold_v", "light_fraction", "count"}
+        veya hiç piksel yoksa None.
+        """
+        v_hist = self.hist_vh.sum(axis=1)
+        total = v_hist.sum()
+        if total <= 0:
+            return None
+        t = otsu_threshold(v_hist)
+        if t is None:
+            # single brightness level: everything is one class
+            t = int(np.argmax(v_hist)) - 1
+        light_frac = float(v_hist[t + 1:].sum() / total)
+        return {
+            "light": self._class_range(t + 1, 255) if light_frac >= self.min_fraction else None,
+            "dark": self._class_range(0, t) if (1.0 - light_frac) >= self.min_fraction else None,
+            "threshold_v": int(t),
+            "light_fraction": light_frac,
+            "count": int(total),
+        }
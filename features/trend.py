@@ -0,0 +1,46 @@
+class TrendEstimator:
+    """
+    Bar yüzdesinin değişim hızını (yüzde puanı / saniye) zaman damgalı örneklerden tahmin eder.
+
+    Ardışık örnekler arasındaki eğim üstel hareketli ortalama (EMA) ile yumuşatılır; bu sayede
+    tek bir gürültülü okuma tahmini bozmaz. Değer yükselirse (pot içildi, regen) kayıp serisi
+    bitmiş sayılır ve eğim sıfırlanır. max_gap'ten uzun aralıklar (bot duraklatıldı vb.)
+    geçmişi geçersiz kılar.
+    """
+    def __init__(self, alpha=0.5, max_gap=2.0, rise_eps=0.5):
+        self.alpha = float(alpha)
+        self.max_gap = float(max_gap)
+        self.rise_eps = float(rise_eps)
+        self.reset()
+
+    def reset(self):
+        self.last_t = None
+        self.last_value = None
+        self.slope = 0.0
+
+    def update(self, t, value):
+        """Yeni okuma; dönüş: güncel eğim (%/s, düşüşte negatif)."""
+        if value is None:
+            return self.slope
+        if self.last_t is None or t - self.last_t > self.max_gap:
+            self.slope = 0.0
+        elif t > self.last_t:
+            inst = (value - self.last_value) / (t - self.last_t)
+            if value > self.last_value + self.rise_eps:
+                self.slope = 0.0
+            else:
+                self.slope += self.alpha * (inst - self.slope)
+        self.last_t = t
+        self.last_value = value
+        return self.slope
+
+    def project(self, horizon):
+        """horizon saniye sonra beklenen değer (sadece düşüş yönünde ekstrapole edilir)."""
+        if self.last_value is None:
+            return None
+        return self.last_value + min(self.slope, 0.0) * max(horizon, 0.0)
+
+    def will_cross(self, threshold, horizon):
+        """Değer horizon içinde threshold'un altına inecek mi (şu an altındaysa da True)."""
+        projected = self.project(horizon)
+        return projected is not None and projected < threshold
@@ -0,0 +1,158 @@
+"""
+Arayüzsüz (PyQt5 yüklemeden) bot:
+
+  python -m headless                  # general_settings.json + hsv_settings.json ile çalışır
+  python -m headless --dry-run -v     # tuşlara basmaz, yüzdeleri yazdırır
+  python -m headless --duration 60    # 60 sn sonra durur
+  python -m headless --multi          # başlığı eşleşen tüm pencereler (çoklu istemci)
+  python -m headless --multi --workers 4   # istemcileri 4 process'te analiz et
+  python -m headless --backend x11    # Linux / X11 (MIT-SHM yakalama, XTest tuş); Xvfb altında da
+
+Pencereyi bulur, menü ve bar'ları bir kez tarar, sonra core.bot_engine.BotEngine
+döngüsünü Ctrl+C'ye (veya --duration'a) kadar çalıştırır.
+"""
+import argparse
+import sys
+import threading
+
+import config
+from core.settings import load_json, load_or_create_general_settings, load_hsv_ranges
+from core.bot_engine import BotEngine, Client
+from core.timeseries import TimeSeriesStore
+from features.health_checker import HealthChecker
+
+FEATURES = ("Health", "Mana", "Stamina")
+
+
+class PrintInput:
+    """--dry-run input sink: tuşa basmak yerine sadece yazdırır."""
+    def press_key(self, key, target=None):
+        print(f"[dry-run] press {key}" + ("" if target is None else f" -> {target}"))
+
+
+def build_checkers(hsv_data=None, method="projection", track_edge=False):
+    """hsv_settings.json (yoksa config varsayılanları) -> {feature: HealthChecker}"""
+    if hsv_data is None:
+        hsv_data = load_json(config.SETTINGS_PATH) or {}
+    checkers = {}
+    for feat in FEATURES:
+        light, dark = load_hsv_ranges(feat, hsv_data)
+        checkers[feat] = HealthChecker(light, dark, method=method, track_edge=track_edge)
+    return checkers
+
+
+def scan(title):
+    """Pencere + menü + bar taraması; dönüş: (win_info, bar_positions, bar_matchers) veya None."""
+    from core.window_finder import find_window_by_title
+
+    win_info = find_window_by_title(title)
+    if not win_info:
+        print(f"[Headless] pencere bulunamadı: '{title}'")
+        return None
+    return scan_window(win_info)
+
+
+def scan_window(win_info):
+    """Tek pencerede menü + bar taraması; dönüş: (win_info, bar_positions, bar_matchers) veya None."""
+    from core.screen import ScreenCapture
+    from core.bar_scanner import find_menu, find_bars
+
+    frame = ScreenCapture(region=win_info).capture()
+    hit = find_menu(frame)
+    if not hit:
+        print("[Headless] menü bulunamadı. menu.png doğru kırpılmış mı kontrol et.")
+        return None
+    bar_positions, bar_matchers = find_bars(frame, hit, win_info)
+    if not bar_positions:
+        print("[Headless] menüde bar bulunamadı.")
+        return None
+    print(f"[Headless] pencere: {win_info} | bars: {list(bar_positions.keys())}")
+    return win_info, bar_positions, bar_matchers
+
+
+def client_settings(gs, index):
+    """general_settings["clients"]["<index>"] içindeki eşik/tuş ayarları genel ayarların üzerine yazılır."""
+    override = (gs.get("clients") or {}).get(str(index)) or {}
+    return dict(gs, **override)
+
+
+def scan_clients(title, gs, method, track_edge=False):
+    """Başlığı eşleşen her pencere için bir Client; bar'ı bulunamayan pencereler atlanır."""
+    from core.window_finder import find_windows_by_title
+
+    clients = []
+    for i, win_info in enumerate(find_windows_by_title(title)):
+        found = scan_window(win_info)
+        if found is None:
+            print(f"[Headless] pencere {win_info['hwnd']} atlandı")
+            continue
+        win_info, bar_positions, bar_matchers = found
+        checkers = build_checkers(method=method, track_edge=track_edge)
+        clients.append(Client(f"client{i}", win_info, bar_positions, checkers, client_settings(gs, i), bar_matchers,
+                              target=win_info["hwnd"]))
+    if not clients:
+        print(f"[Headless] pencere bulunamadı: '{title}'")
+    return clients
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless game bot (no UI)")
+    ap.add_argument("--window", default=config.WINDOW_TITLE_SUBSTRING, help="pencere başlığı alt dizgesi")
+    ap.add_argument("--duration", type=float, default=0.0, help="saniye; 0 = Ctrl+C'ye kadar")
+    ap.add_argument("--method", default="projection", help="pixel / projection / contour / scanline")
+    ap.add_argument("--track-edge", action="store_true", help="sadece son dolum kenarı çevresini incele")
+    ap.add_argument("--dry-run", action="store_true", help="tuşlara basma, sadece yazdır")
+    ap.add_argument("--multi", action="store_true", help="başlığı eşleşen tüm pencereleri tek capture ile izle")
+    ap.add_argument("--workers", type=int, default=0, help="--multi: analiz process sayısı (0 = bot thread'inde)")
+    ap.add_argument("--backend", choices=("windows", "x11"), help="platform backend'i (varsayılan: platforma göre)")
+    ap.add_argument("-v", "--verbose", action="store_true", help="değişen yüzdeleri yazdır")
+    ap.add_argument("--timeseries", nargs="?", const=config.TIMESERIES_PATH,
+                    help="okumaları halka dosyasına kaydet (varsayılan yol: config.TIMESERIES_PATH)")
+    ap.add_argument("--metrics", help="aşama sürelerini periyodik olarak bu dosyaya yaz (Prometheus text formatı)")
+    args = ap.parse_args(argv)
+    if args.backend:
+        config.BACKEND = args.backend
+
+    gs = load_or_create_general_settings()
+    on_percent = (lambda f, p: print(f"[{f}] {p:.1f} %")) if args.verbose else None
+    kwargs = dict(input_sink=PrintInput() if args.dry_run else None, on_percent=on_percent,
+                  timeseries=TimeSeriesStore(args.timeseries, config.TIMESERIES_CAPACITY) if args.timeseries else None)
+    if args.multi:
+        clients = scan_clients(args.window, gs, args.method, args.track_edge)
+        if not clients:
+            return 1
+        print(f"[Headless] {len(clients)} istemci")
+        engine = BotEngine.for_clients(clients, gs.get("loop_delay_ms", 250), workers=args.workers, **kwargs)
+    else:
+        found = scan(args.window)
+        if found is None:
+            return 1
+        win_info, bar_positions, bar_matchers = found
+        checkers = build_checkers(method=args.method, track_edge=args.track_edge)
+        engine = BotEngine(win_info, bar_positions, gs.get("loop_delay_ms", 250), checkers, gs,
+                           bar_matchers=bar_matchers, **kwargs)
+    engine.input.verbose = args.verbose
+    if args.metrics:
+        engine.scheduler.add_job("metrics", 5.0, lambda now: engine.metrics.export_prometheus(args.metrics),
+                                 start_delay=5.0)
+    if args.duration > 0:
+        timer = threading.Timer(args.duration, engine.stop)
+        timer.daemon = True
+        timer.start()
+    print("[Headless] bot çalışıyor... (Ctrl+C ile durdur)")
+    try:
+        engine.run()
+    except KeyboardInterrupt:
+        engine.stop()
+    if args.metrics:
+        engine.metrics.export_prometheus(args.metrics)
+    if engine.timeseries is not None:
+        engine.timeseries.close()
+    st = engine.roi_cache_stats()
+    print(f"[Headless] durduruldu. ROI cache: {st['hits']} hit / {st['misses']} miss (%{st['hit_ratio'] * 100:.0f})"
+          f" | input: {engine.input.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
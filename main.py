@@ -4,14 +4,42 @@ this_dir = os.path.dirname(os.path.abspath(__file__))
 if this_dir not in sys.path:
     sys.path.append(this_dir)
 
-from PyQt5.QtWidgets import QApplication
-from ui.main_ui import MainUI
-
 def main():
+    from PyQt5.QtWidgets import QApplication
+    from ui.main_ui import MainUI
     app = QApplication(sys.argv)
     w = MainUI()
     w.show()
     sys.exit(app.exec_())
 
+def profile_startup(out_path=None):
+    """
+    Import ve init maliyetini ölçer, pencere ilk kez çizildikten sonra çıkar.
+      python main.py --profile-startup [startup.jsonl]
+    """
+    from core.startup_profile import StartupProfiler
+    with StartupProfiler() as prof:
+        with prof.step("import PyQt5"):
+            from PyQt5.QtWidgets import QApplication
+        with prof.step("import ui.main_ui"):
+            from ui.main_ui import MainUI
+        with prof.step("QApplication()"):
+            app = QApplication(sys.argv)
+        with prof.step("MainUI()"):
+            w = MainUI()
+        with prof.step("show + first paint"):
+            w.show()
+            app.processEvents()
+    summary = prof.report()
+    if out_path:
+        prof.save(out_path, summary)
+        print(f"[Startup] kaydedildi: {out_path}")
+    w.close()
+    return 0
+
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        i = sys.argv.index("--profile-startup")
+        out = sys.argv[i + 1] if i + 1 < len(sys.argv) and not sys.argv[i + 1].startswith("-") else None
+        sys.exit(profile_startup(out))
     main()
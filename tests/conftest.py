@@ -0,0 +1,8 @@
+import os
+import sys
+
+# tests run from the project root without installing the package; Qt needs no display
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -0,0 +1,91 @@
+import multiprocessing as mp
+import time
+
+import numpy as np
+import pytest
+
+import config
+from core.analysis_pool import AnalysisPool, checker_from_spec, checker_specs
+from features.bar_analysis_engine import BarAnalysisEngine
+from features.health_checker import HealthChecker
+from benchmarks.synthetic import make_bar
+
+
+def _clients(n=2):
+    return {ci: {"Health": HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV),
+                 "Mana": HealthChecker(config.MANA_LIGHT_HSV, config.MANA_DARK_HSV)} for ci in range(n)}
+
+
+def _frame():
+    rng = np.random.default_rng(2)
+    frame = np.ascontiguousarray(np.vstack([make_bar(120, 8, 0.4, rng, bgra=True),
+                                            make_bar(120, 8, 0.7, rng, bgra=True)]))
+    rects = {"Health": (0, 0, 120, 8), "Mana": (0, 8, 120, 16)}
+    return frame, rects
+
+
+@pytest.fixture
+def pool():
+    pools = []
+
+    def make(n_workers=1, timeout=5.0, **kwargs):
+        clients = _clients(kwargs.pop("n_clients", 2))
+        p = AnalysisPool(n_workers, clients, timeout=timeout, **kwargs)
+        pools.append(p)
+        return p, clients
+    yield make
+    for p in pools:
+        p.close()
+
+
+def test_specs_carry_checker_tuning():
+    ch = HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method="scanline", track_edge=True)
+    ch.scan_rows = 5
+    ch.track_band = 4
+    copy = checker_from_spec(checker_specs({"Health": ch})["Health"])
+    assert (copy.method, copy.track_edge, copy.scan_rows, copy.track_band) == ("scanline", True, 5, 4)
+
+
+def test_dead_worker_is_restarted(pool):
+    p, clients = pool()
+    frame, rects = _frame()
+    expected = {ci: BarAnalysisEngine(clients[ci]).analyze(frame, rects) for ci in clients}
+    jobs = {ci: rects for ci in clients}
+    assert p.analyze(frame, jobs) == expected
+    p._procs[0].kill()
+    p._procs[0].join(5)
+    assert p.analyze(frame, jobs) == expected     # this tick: serial, no BrokenPipeError
+    assert p._restarts[0] == 1 and p._procs[0].is_alive()
+    assert p.analyze(frame, jobs) == expected
+
+
+def test_serial_fallback_after_max_restarts(pool):
+    p, clients = pool()
+    p.MAX_RESTARTS = 0
+    frame, rects = _frame()
+    expected = {ci: BarAnalysisEngine(clients[ci]).analyze(frame, rects) for ci in clients}
+    p._procs[0].kill()
+    p._procs[0].join(5)
+    jobs = {ci: rects for ci in clients}
+    assert p.analyze(frame, jobs) == expected
+    assert p._conns[0] is None
+    assert p.analyze(frame, jobs) == expected
+
+
+def test_unanswered_worker_never_blocks(pool):
+    p, clients = pool(timeout=0.2)
+    frame, rects = _frame()
+    mine, theirs = mp.Pipe()          # a "worker" that never answers
+    real = p._conns[0]
+    p._conns[0] = theirs
+    t0 = time.perf_counter()
+    assert p.analyze(frame, {0: rects}) == {}
+    assert p._late[0] == 1
+    assert p.analyze(frame, {0: rects}) == {}     # still busy: skipped without waiting
+    assert time.perf_counter() - t0 < 1.0
+    mine.send(("result", {}))                    # the late answer finally arrives
+    assert p._drain(0)
+    assert p._late[0] == 0
+    p._conns[0] = real
+    mine.close()
+    theirs.close()
@@ -0,0 +1,25 @@
+import pytest
+
+import config
+from core import backends
+from core.backends.x11 import keysym_name
+
+
+def test_backend_name_precedence(monkeypatch):
+    monkeypatch.setattr(config, "BACKEND", None)
+    monkeypatch.setenv("PYBOT_BACKEND", "X11")
+    assert backends.backend_name() == "x11"
+    monkeypatch.setattr(config, "BACKEND", "windows")
+    assert backends.backend_name() == "windows"
+    assert backends.backend_name("x11") == "x11"
+    with pytest.raises(ValueError):
+        backends.backend_name("wayland")
+
+
+def test_keysym_names():
+    assert keysym_name("f1") == "F1"
+    assert keysym_name("F12") == "F12"
+    assert keysym_name("space") == "space"
+    assert keysym_name("Enter") == "Return"
+    assert keysym_name("1") == "1"
+    assert keysym_name("z") == "z"
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+import config
+from features.bar_analysis_engine import BarAnalysisEngine
+from features.health_checker import HealthChecker
+from benchmarks.synthetic import make_bar
+
+RANGES = {
+    "Health": (config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV),
+    "Mana": (config.MANA_LIGHT_HSV, config.MANA_DARK_HSV),
+    "Stamina": (config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV),
+}
+
+
+def _setup(method="projection"):
+    rng = np.random.default_rng(1)
+    checkers = {f: HealthChecker(*RANGES[f], method=method) for f in ("Health", "Mana")}
+    frame = np.ascontiguousarray(np.vstack([make_bar(120, 8, 0.4, rng, bgra=True),
+                                            make_bar(120, 8, 0.7, rng, feature="Mana", bgra=True)]))
+    rects = {"Health": (0, 0, 120, 8), "Mana": (0, 8, 120, 16)}
+    return checkers, frame, rects
+
+
+def _per_bar(checkers, frame, rects):
+    return {f: checkers[f].analyze_roi(frame[y0:y1, x0:x1]) for f, (x0, y0, x1, y1) in rects.items()}
+
+
+@pytest.mark.parametrize("method", ["projection", "pixel", "contour", "scanline"])
+def test_engine_matches_per_bar(method):
+    checkers, frame, rects = _setup(method)
+    assert BarAnalysisEngine(checkers).analyze(frame, rects) == _per_bar(checkers, frame, rects)
+
+
+def test_engine_matches_per_bar_random_layouts():
+    """Touching / unevenly sized bars on a noisy background: shared masks must equal per-bar ones."""
+    rng = np.random.default_rng(7)
+    feats = list(RANGES)
+    for _ in range(60):
+        method = ("projection", "pixel", "contour")[int(rng.integers(3))]
+        frame = rng.integers(0, 256, size=(60, 200, 4), dtype=np.uint8)
+        checkers, rects, y = {}, {}, 0
+        for i in range(int(rng.integers(2, 6))):
+            bw, bh = int(rng.integers(5, 200)), int(rng.integers(1, 9))
+            x = int(rng.integers(0, 200 - bw + 1))
+            if y + bh > 60:
+                break
+            feat = feats[i % 3]
+            frame[y:y + bh, x:x + bw] = make_bar(bw, bh, rng.uniform(), rng, feature=feat, noise=40, bgra=True)
+            checkers[f"b{i}"] = HealthChecker(*RANGES[feat], method=method)
+            rects[f"b{i}"] = (x, y, x + bw, y + bh)
+            y += bh + int(rng.integers(0, 3))
+        assert BarAnalysisEngine(checkers).analyze(frame, rects) == _per_bar(checkers, frame, rects)
+
+
+def test_engine_follows_range_changes():
+    checkers, frame, rects = _setup()
+    engine = BarAnalysisEngine(checkers)
+    v = engine.version
+    engine.refresh()
+    assert engine.version == v
+    before = engine.analyze(frame, rects)
+    checkers["Health"].set_light_hsv((100, 100, 100), (130, 255, 255))   # mana's blue: health reads empty
+    after = engine.analyze(frame, rects)
+    assert engine.version == v + 1
+    assert after["Health"] == 0.0 and after["Mana"] == before["Mana"]
+    assert after == _per_bar(checkers, frame, rects)
+    assert engine.analyze(frame, {"Health": (0, 0, 0, 8)}) == {"Health": None}
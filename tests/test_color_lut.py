@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+import pytest
+
+import config
+from core.analysis_pool import checker_from_spec, checker_specs
+from core.color_lut import ColorClassLUT, LUT_TOLERANCE
+from features.bar_analysis_engine import BarAnalysisEngine
+from features.health_checker import HealthChecker
+from benchmarks.synthetic import make_bar
+
+RANGES = {
+    "Health": (config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV),
+    "Mana": (config.MANA_LIGHT_HSV, config.MANA_DARK_HSV),
+    "Stamina": (config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV),
+}
+
+
+@pytest.mark.parametrize("method", ["projection", "pixel", "contour"])
+def test_lut_within_tolerance(method):
+    rng = np.random.default_rng(3)
+    for feat, (light, dark) in RANGES.items():
+        hsv = HealthChecker(light, dark, method=method)
+        lut = HealthChecker(light, dark, method=method, use_lut=True)
+        for _ in range(40):
+            w, h = int(rng.integers(40, 400)), int(rng.integers(4, 24))
+            roi = make_bar(w, h, rng.uniform(0.0, 1.0), rng, feature=feat, bgra=bool(rng.integers(2)))
+            assert abs(hsv.analyze_roi(roi) - lut.analyze_roi(roi)) <= LUT_TOLERANCE
+
+
+def test_lut_masks_match_inrange_away_from_bounds():
+    light, dark = RANGES["Health"]
+    lut = ColorClassLUT(light, dark)
+    roi = make_bar(120, 8, 0.5, bgra=True)
+    hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+    ml = cv2.inRange(hsv, np.array(light[0], dtype=np.uint8), np.array(light[1], dtype=np.uint8))
+    md = cv2.inRange(hsv, np.array(dark[0], dtype=np.uint8), np.array(dark[1], dtype=np.uint8))
+    ll, ld = lut.masks(roi)
+    assert (ll == ml).mean() > 0.97 and (ld == md).mean() > 0.97
+    assert lut.masks(roi, dark=False)[1] is None
+
+
+def test_slider_change_rebuilds_only_changed_class():
+    light, dark = RANGES["Health"]
+    checker = HealthChecker(light, dark, use_lut=True)
+    lut = checker.lut
+    dark_table, version = lut._dark, lut.version
+    checker.set_light_hsv((0, 0, 0), (179, 255, 255))
+    checker.set_dark_hsv(*dark)                  # unchanged: no rebuild
+    assert lut._dark is dark_table and lut.version == version + 1
+    assert checker.analyze_roi(make_bar(120, 8, 0.3, bgra=True)) == 100.0
+
+
+def test_lut_checkers_bypass_engine_and_survive_pool_specs():
+    checkers = {f: HealthChecker(*RANGES[f], use_lut=True) for f in ("Health", "Mana")}
+    frame = np.ascontiguousarray(np.vstack([make_bar(120, 8, 0.4, bgra=True),
+                                            make_bar(120, 8, 0.7, feature="Mana", bgra=True)]))
+    rects = {"Health": (0, 0, 120, 8), "Mana": (0, 8, 120, 16)}
+    expected = {f: checkers[f].analyze_roi(frame[y0:y1, x0:x1]) for f, (x0, y0, x1, y1) in rects.items()}
+    assert BarAnalysisEngine(checkers).analyze(frame, rects) == expected
+    copies = {f: checker_from_spec(spec) for f, spec in checker_specs(checkers).items()}
+    assert all(ch.use_lut for ch in copies.values())
@@ -0,0 +1,83 @@
+import threading
+import time
+
+from core.input_dispatcher import InputDispatcher, RecordingBackend
+
+
+class BlockingBackend(RecordingBackend):
+    """İlk basışta release set edilene kadar bekler (stop() ile yarış için)."""
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def press_key(self, key, target=None):
+        self.entered.set()
+        self.release.wait(2.0)
+        super().press_key(key, target)
+
+
+def test_presses_in_priority_order():
+    rec = RecordingBackend()
+    d = InputDispatcher(rec, key_interval=0.0, max_rate=0)
+    d.submit("pickup", "z")
+    d.submit("heal", "1")
+    assert d.flush(2.0)
+    d.stop()
+    assert set(rec.keys) == {"z", "1"}
+    assert d.stats["pressed"] == 2
+
+
+def test_no_presses_after_stop():
+    rec = BlockingBackend()
+    d = InputDispatcher(rec, key_interval=0.0, max_rate=0)
+    d.submit("heal", "1")
+    assert rec.entered.wait(2.0)
+    d.submit("mana", "2")             # queued behind the blocked press
+    d.submit("pickup", "z")
+    stopper = threading.Thread(target=d.stop, args=(2.0,))
+    stopper.start()
+    time.sleep(0.05)
+    rec.release.set()
+    stopper.join()
+    assert rec.keys == ["1"]
+    assert d.stats["pressed"] == 1
+
+
+def test_submit_after_stop_is_rejected_until_start():
+    rec = RecordingBackend()
+    d = InputDispatcher(rec, key_interval=0.0, max_rate=0)
+    d.stop()
+    assert d.submit("heal", "1") is False
+    assert d._thread is None and not d._running
+    assert d.stats["rejected"] == 1
+    d.start()
+    assert d.submit("heal", "1") is True
+    assert d.flush(2.0)
+    d.stop()
+    assert rec.keys == ["1"]
+
+
+class FailingBackend(RecordingBackend):
+    """İlk `fails` basışta hata verir (ör. sürücü cihazı kaybetti)."""
+    def __init__(self, fails=1):
+        super().__init__()
+        self.fails = fails
+
+    def press_key(self, key, target=None):
+        if self.fails:
+            self.fails -= 1
+            raise OSError("device lost")
+        super().press_key(key, target)
+
+
+def test_failed_press_counts_error_and_skips_cooldown():
+    rec = FailingBackend(fails=1)
+    d = InputDispatcher(rec, cooldowns={"heal": 0.5}, key_interval=0.0, max_rate=0)
+    assert d.submit("heal", "1")
+    assert d.flush(2.0)
+    assert d.stats["errors"] == 1 and d.ready("heal")
+    assert d.submit("heal", "1")                   # retried right away, not held by the 0.5 s cooldown
+    assert d.flush(2.0)
+    d.stop()
+    assert rec.keys == ["1"] and d.stats["pressed"] == 1 and not d.ready("heal")
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt5")
+from PyQt5.QtWidgets import QApplication
+
+from ui.preview_channel import PreviewChannel, to_pixmap
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_to_pixmap_sliced_roi(app):
+    frame = np.zeros((60, 200, 3), dtype=np.uint8)
+    frame[10:20, 30:130] = (30, 60, 200)          # BGR
+    roi = frame[10:20, 30:130]
+    assert not roi.flags["C_CONTIGUOUS"]
+    pm = to_pixmap(roi, 100, 10)
+    assert not pm.isNull()
+    c = pm.toImage().pixelColor(50, 5)
+    assert (c.red(), c.green(), c.blue()) == (200, 60, 30)
+
+
+def test_to_pixmap_sliced_mask(app):
+    mask = np.zeros((40, 80), dtype=np.uint8)
+    mask[:, 40:] = 255
+    pm = to_pixmap(mask[5:15, 20:60], 40, 10)
+    assert not pm.isNull()
+    assert pm.toImage().pixelColor(30, 5).value() == 255
+
+
+def test_push_rate_limited_holds_back_without_copy(monkeypatch):
+    import ui.preview_channel as pc
+    now = [100.0]
+    monkeypatch.setattr(pc.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(pc, "clean_mask", lambda m: m)
+    ch = PreviewChannel(max_fps=10)                # 100 ms
+    ch.set_visible(["Health"])
+    ch.set_mask("Health", (0, 0, 0), (179, 255, 255))
+    bgra = np.zeros((10, 100, 4), dtype=np.uint8)
+
+    assert ch.push("Health", bgra) is False        # published (copy + mask here, bot thread)
+    for v in (1, 2, 3):                            # within the interval: held back, caller resends
+        bgra[:] = v
+        assert ch.push("Health", bgra) is True
+    assert (ch.pushed, ch.skipped) == (1, 3)
+    calls = []
+    monkeypatch.setattr(pc, "clean_mask", lambda m: calls.append(m) or m)
+    out = ch.take()
+    assert out["Health"][0].shape == (10, 100, 3) and out["Health"][0].max() == 0
+    assert out["Health"][1] is not None
+
+    now[0] += 0.2
+    assert ch.take() == {} and calls == []         # take() never does image work
+    assert ch.push("Health", bgra) is False        # engine resent the unchanged bar: now due
+    assert ch.take()["Health"][0].max() == 3 and len(calls) == 1
+
+
+def test_push_invisible_does_nothing():
+    ch = PreviewChannel()
+    assert ch.push("Mana", np.zeros((4, 4, 3), dtype=np.uint8)) is False
+    assert (ch.pushed, ch.skipped, ch.take()) == (0, 0, {})
@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+import pytest
+
+import config
+from core.bot_engine import BotEngine
+from core.template_matcher import TemplateMatcher
+from features.health_checker import HealthChecker
+
+
+class FrameSource:
+    """Tek bir sahte pencere görüntüsü; capture sayıları tutulur."""
+    def __init__(self, frame):
+        self.frame = frame
+        self.full = 0
+
+    def capture(self, region=None):
+        r = region
+        if (r["width"], r["height"]) == (self.frame.shape[1], self.frame.shape[0]):
+            self.full += 1
+        return self.frame[r["top"]:r["top"] + r["height"], r["left"]:r["left"] + r["width"]]
+
+    def capture_bgra(self, region=None):
+        return cv2.cvtColor(np.ascontiguousarray(self.capture(region)), cv2.COLOR_BGR2BGRA)
+
+
+@pytest.fixture
+def template(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "TEMPLATE_CACHE_DIR", str(tmp_path / "cache"))
+    rng = np.random.default_rng(5)
+    tpl = rng.integers(0, 256, size=(16, 48, 3), dtype=np.uint8)
+    path = str(tmp_path / "bar.png")
+    cv2.imwrite(path, tpl)
+    return path, tpl
+
+
+def _engine(frame, matcher, pos):
+    win = {"left": 0, "top": 0, "width": frame.shape[1], "height": frame.shape[0]}
+    checkers = {"Health": HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV)}
+    return BotEngine(win, {"can": pos}, 50, checkers, {}, bar_matchers={"can": matcher},
+                     frame_source=FrameSource(frame), input_sink=object())
+
+
+def _relocate_until_idle(engine, rounds):
+    for _ in range(rounds):
+        engine._relocate_bars()
+        for fut, _ in list(engine._searches.values()):
+            fut.result(timeout=10)
+
+
+def test_scale_change_found_off_thread(template):
+    path, tpl = template
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    big = cv2.resize(tpl, (72, 24), interpolation=cv2.INTER_LINEAR)    # UI scale 1.5
+    frame[150:174, 200:272] = big
+    matcher = TemplateMatcher(path, threshold=0.8)
+    engine = _engine(frame, matcher, {"left": 20, "top": 20, "width": 48, "height": 16})
+
+    engine._relocate_bars()                      # local miss: whole-window search started, not awaited
+    assert engine.bar_positions["can"]["left"] == 20 and engine._searches
+    _relocate_until_idle(engine, 2)
+    pos = engine.bar_positions["can"]
+    assert (pos["left"], pos["top"], pos["width"], pos["height"]) == (200, 150, 72, 24)
+    assert engine._capture_rects()
+    engine._relocate_bars()                      # verified locally at the new size
+    assert not engine._searches and not engine.clients[0].relocate_backoff
+    engine.stop()
+
+
+def test_lost_bar_backs_off(template):
+    path, _ = template
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    matcher = TemplateMatcher(path, threshold=0.8)
+    engine = _engine(frame, matcher, {"left": 10, "top": 10, "width": 48, "height": 16})
+    src = engine.sc
+    _relocate_until_idle(engine, 40)
+    # miss k waits 2^k calls (capped at 16): searches at calls 1, 4, 9, 18, 35
+    assert src.full == 5
+    assert engine.clients[0].relocate_backoff["can"][0] == 5
+    engine.stop()
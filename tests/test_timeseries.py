@@ -0,0 +1,17 @@
+import config
+from core.timeseries import TimeSeriesStore
+
+
+def test_default_path_is_under_data_dir():
+    assert config.TIMESERIES_PATH.startswith(config.DATA_DIR)
+    assert config.DEFAULT_GENERAL_SETTINGS["record_readings"] is False
+
+
+def test_store_creates_parent_directory(tmp_path):
+    path = tmp_path / "data" / "readings.ts"
+    ts = TimeSeriesStore(str(path), capacity=16, clock=lambda: 1.0)
+    ts.append("Health", 50.0)
+    ts.close()
+    reopened = TimeSeriesStore(str(path), capacity=16)
+    assert len(reopened) == 1
+    reopened.close()
@@ -1,16 +1,12 @@
 import sys
 import os
-import time
-import json
-import cv2
-import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
     QSlider, QGroupBox, QGridLayout, QComboBox, QMessageBox, QTabWidget,
-    QCheckBox, QSpinBox, QLineEdit
+    QCheckBox, QSpinBox, QLineEdit, QTableWidget, QTableWidgetItem
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+import numpy as np
 
 # ensure project root importable
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,137 +17,73 @@ if proj_root not in sys.path:
 import config
 from core.window_finder import find_window_by_title
 from core.screen import ScreenCapture
-from core.template_matcher import TemplateMatcher
-from core.input_controller import InputController
+from core.bar_scanner import find_menu, find_bars
+from core.settings import save_json, load_json, load_or_create_general_settings, load_hsv_ranges
+from core.bot_engine import BotEngine
+from core.metrics import Metrics
+from core.timeseries import TimeSeriesStore
 from features.health_checker import HealthChecker
+from features.hsv_calibration import HsvCalibrator
+from ui.preview_channel import PreviewChannel, to_pixmap
 
-# load/save helpers
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-def load_json(path):
-    if not os.path.isfile(path):
-        return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-# default general settings loader -> ensure file exists
-def load_or_create_general_settings():
-    data = load_json(config.GENERAL_SETTINGS_PATH)
-    if data is None:
-        data = config.DEFAULT_GENERAL_SETTINGS.copy()
-        save_json(config.GENERAL_SETTINGS_PATH, data)
-    # ensure all keys exist
-    for k, v in config.DEFAULT_GENERAL_SETTINGS.items():
-        if k not in data:
-            data[k] = v
-    return data
-
-# Bot thread
+# Bot thread: Qt wrapper around core.bot_engine.BotEngine (callbacks -> signals)
 class BotThread(QThread):
     percent_signal = pyqtSignal(str, float)  # name, percent
     preview_signal = pyqtSignal(str, object)  # name, roi_bgr
+    positions_signal = pyqtSignal(object)  # bar_positions after live re-localization
 
-    def __init__(self, win_info, bar_positions, loop_delay_ms, checkers, general_settings):
+    def __init__(self, win_info, bar_positions, loop_delay_ms, checkers, general_settings, bar_matchers=None,
+                 input_ctrl=None, preview_channel=None, metrics=None, timeseries=None):
         super().__init__()
-        self.win_info = win_info
-        self.bar_positions = bar_positions  # dict of abs positions
-        self.loop_delay = max(10, int(loop_delay_ms)) / 1000.0
-        self.checkers = checkers  # dict of Feature->Checker
-        self.general_settings = general_settings
-        self._running = False
-        self.sc = ScreenCapture(region=self.win_info)
-        self.input_ctrl = InputController()
-        self._last_pickup = 0.0
-        self._last_heal = 0.0
-        self._heal_cooldown = 0.5  # seconds between auto-heal keypresses
-        self._mana_cooldown = 0.5
+        # with a PreviewChannel, previews bypass the Qt event queue (latest frame per bar only)
+        self.engine = BotEngine(win_info, bar_positions, loop_delay_ms, checkers, general_settings,
+                                bar_matchers=bar_matchers, input_sink=input_ctrl,
+                                on_percent=self.percent_signal.emit,
+                                on_preview=preview_channel.push if preview_channel else self._emit_preview,
+                                on_positions=self.positions_signal.emit,
+                                metrics=metrics, timeseries=timeseries)
+
+    def _emit_preview(self, feature, roi):
+        # roi is a view into the capture buffer: hand a BGR copy to the GUI thread
+        self.preview_signal.emit(feature, np.array(roi[..., :3], order="C"))
 
     def run(self):
-        self._running = True
-        while self._running:
-            try:
-                frame = self.sc.capture()
-            except Exception as e:
-                print("[BotThread] capture hata:", e)
-                time.sleep(0.2)
-                continue
-
-            tnow = time.time()
-
-            # process bars
-            for key, pos in self.bar_positions.items():
-                # pos has absolute screen coords; convert to window-local region coords
-                lx = int(pos["left"] - self.win_info["left"])
-                ly = int(pos["top"] - self.win_info["top"])
-                w = int(pos["width"]); h = int(pos["height"])
-                ih, iw = frame.shape[:2]
-                x0 = max(0, min(iw-1, lx)); y0 = max(0, min(ih-1, ly))
-                x1 = max(0, min(iw, x0 + w)); y1 = max(0, min(ih, y0 + h))
-                if x1 <= x0 or y1 <= y0:
-                    continue
-                roi = frame[y0:y1, x0:x1]
-
-                # map bar key naming: can -> Health, mana -> Mana, stamina -> Stamina
-                feature = "Health" if key == "can" else ("Mana" if key == "mana" else "Stamina")
-
-                checker = self.checkers.get(feature)
-                if checker:
-                    percent = checker.analyze_roi(roi)
-                else:
-                    percent = None
-
-                if percent is not None:
-                    # emit percent for UI only for Health and Mana
-                    self.percent_signal.emit(feature, percent)
-
-                    # if Health auto enabled & below threshold -> press heal key (respect cooldown)
-                    gs = self.general_settings
-                    if feature == "Health" and gs.get("health_enabled", False):
-                        thr = float(gs.get("health_threshold", 50))
-                        if percent < thr and (tnow - self._last_heal) > self._heal_cooldown:
-                            key = gs.get("health_key", "h")
-                            try:
-                                self.input_ctrl.press_key(key)
-                                self._last_heal = tnow
-                                print(f"[AutoHeal] pressed '{key}' because {percent:.1f}% < {thr}")
-                            except Exception as e:
-                                print("[AutoHeal] hata:", e)
-                    # Mana similar
-                    if feature == "Mana" and gs.get("mana_enabled", False):
-                        thr = float(gs.get("mana_threshold", 40))
-                        if percent < thr and (tnow - self._last_mana) > self._mana_cooldown:
-                            key = gs.get("mana_key", "m")
-                            try:
-                                self.input_ctrl.press_key(key)
-                                self._last_mana = tnow
-                                print(f"[AutoMana] pressed '{key}' because {percent:.1f}% < {thr}")
-                            except Exception as e:
-                                print("[AutoMana] hata:", e)
-
-                # send preview to UI (so mask preview etc. can be rendered)
-                self.preview_signal.emit(feature, roi.copy())
-
-            # pickup job (z key) if enabled
-            gs = self.general_settings
-            if gs.get("pickup_enabled", False):
-                interval = max(10, int(gs.get("pickup_interval_ms", 1000))) / 1000.0
-                if (tnow - self._last_pickup) >= interval:
-                    key = gs.get("pickup_key", "z")
-                    try:
-                        self.input_ctrl.press_key(key)
-                        self._last_pickup = tnow
-                        print(f"[Pickup] pressed '{key}'")
-                    except Exception as e:
-                        print("[Pickup] hata:", e)
+        self.engine.run()
 
-            time.sleep(self.loop_delay)
+    def roi_cache_stats(self):
+        return self.engine.roi_cache_stats()
 
     def stop(self):
-        self._running = False
+        self.engine.stop()
         self.wait()
 
+# HSV calibration thread: streams ROI frames into HsvCalibrator histograms, GUI stays responsive
+class CalibrationThread(QThread):
+    progress_signal = pyqtSignal(int, int)  # done, total
+    result_signal = pyqtSignal(str, object)  # feature, HsvCalibrator.suggest() or None
+
+    def __init__(self, feature, roi_abs, frames=60, interval_ms=30):
+        super().__init__()
+        self.feature = feature
+        self.roi_abs = dict(roi_abs)
+        self.frames = int(frames)
+        self.interval_ms = int(interval_ms)
+
+    def run(self):
+        # mss handles are per-thread: capture object is created here
+        sc = ScreenCapture()
+        cal = HsvCalibrator()
+        for i in range(self.frames):
+            if self.isInterruptionRequested():
+                break
+            try:
+                cal.add(sc.capture(region=self.roi_abs))
+            except Exception as e:
+                print("[Calibration] capture hata:", e)
+            self.progress_signal.emit(i + 1, self.frames)
+            self.msleep(self.interval_ms)
+        self.result_signal.emit(self.feature, cal.suggest())
+
 class MainUI(QWidget):
     def __init__(self):
         super().__init__()
@@ -162,16 +94,32 @@ class MainUI(QWidget):
         self.win_info = None
         self.menu_hit = None
         self.bar_positions = {}
+        self.bar_matchers = {}
         self.bot_thread = None
+        self.calib_thread = None
+
+        # bot thread -> GUI previews: coalesced, rendered by a timer at most PREVIEW_FPS times a second
+        self.preview = PreviewChannel()
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setInterval(self.preview.interval_ms)
+        self.preview_timer.timeout.connect(self._render_previews)
+
+        # per-stage timings of the bot loop (shared across runs until reset), shown in the Stats tab
+        self.metrics = Metrics()
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(1000)
+        self.stats_timer.timeout.connect(self._refresh_stats)
+        # bar readings + actions ring file (opened on first start)
+        self.timeseries = None
 
-        # input controller
-        self.input_ctrl = InputController()
+        # input: BotEngine opens the shared InputController on the first keypress (no driver at startup)
+        self.input_ctrl = None
 
         # checkers for Health/Mana/Stamina
         self.checkers = {
-            "Health": HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method="projection"),
-            "Mana": HealthChecker(config.MANA_LIGHT_HSV, config.MANA_DARK_HSV, method="projection"),
-            "Stamina": HealthChecker(config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV, method="projection")
+            "Health": HealthChecker(config.HEALTH_LIGHT_HSV, config.HEALTH_DARK_HSV, method="projection", use_lut=True),
+            "Mana": HealthChecker(config.MANA_LIGHT_HSV, config.MANA_DARK_HSV, method="projection", use_lut=True),
+            "Stamina": HealthChecker(config.STAMINA_LIGHT_HSV, config.STAMINA_DARK_HSV, method="projection", use_lut=True)
         }
 
         # load general settings (or create defaults)
@@ -194,6 +142,10 @@ class MainUI(QWidget):
         self.tab_botsettings = QWidget()
         self.tabs.addTab(self.tab_general, "Genel")
         self.tabs.addTab(self.tab_botsettings, "Bot Ayarları")
+        self.tab_stats = QWidget()
+        self.tabs.addTab(self.tab_stats, "İstatistik")
+        self.tabs.currentChanged.connect(lambda _: self._update_preview_visibility())
+        self.tabs.currentChanged.connect(lambda _: self._refresh_stats())
         root.addWidget(self.tabs)
 
         # --- General tab ---
@@ -254,6 +206,10 @@ class MainUI(QWidget):
         }
         # set health default enabled true (if general settings default says so)
         # add to boxes
+        # predictive heal (Health only): trigger before the threshold is crossed, based on the loss trend
+        self.chk_health_predictive = QCheckBox("Tahmine dayalı")
+        self.chk_health_predictive.setChecked(self.general_settings.get("health_predictive", False))
+        self.feature_panels["Health"]["group"].layout().insertWidget(1, self.chk_health_predictive)
         boxes.addWidget(self.feature_panels["Health"]["group"])
         boxes.addWidget(self.feature_panels["Mana"]["group"])
         boxes.addWidget(self.feature_panels["Stamina"]["group"])
@@ -290,6 +246,13 @@ class MainUI(QWidget):
         self.lbl_loop_val = QLabel(str(self.sld_loop.value()) + " ms")
         self.sld_loop.valueChanged.connect(lambda v: self.lbl_loop_val.setText(str(v) + " ms"))
         bottom_row.addWidget(self.lbl_loop_val)
+        self.chk_adaptive = QCheckBox("Adaptif örnekleme")
+        self.chk_adaptive.setChecked(self.general_settings.get("adaptive_sampling", True))
+        bottom_row.addWidget(self.chk_adaptive)
+        self.chk_record = QCheckBox("Okumaları kaydet")
+        self.chk_record.setToolTip(f"Bar okumaları {config.TIMESERIES_PATH} dosyasına yazılır (~63 MB)")
+        self.chk_record.setChecked(self.general_settings.get("record_readings", False))
+        bottom_row.addWidget(self.chk_record)
         self.btn_save_general = QPushButton("Genel Ayarları Kaydet")
         self.btn_save_general.clicked.connect(self.on_save_general)
         bottom_row.addWidget(self.btn_save_general)
@@ -350,10 +313,31 @@ class MainUI(QWidget):
 
         self.tab_botsettings.setLayout(b_layout)
 
+        # --- İstatistik tab (stage timings p50/p95/p99 + FPS, CSV / Prometheus export) ---
+        s_layout = QVBoxLayout()
+        self.lbl_fps = QLabel("FPS: -")
+        s_layout.addWidget(self.lbl_fps)
+        self.tbl_stats = QTableWidget(0, 6)
+        self.tbl_stats.setHorizontalHeaderLabels(["count", "mean ms", "p50 ms", "p95 ms", "p99 ms", "max ms"])
+        s_layout.addWidget(self.tbl_stats)
+        self.lbl_series = QLabel("Son 60 sn: -")
+        s_layout.addWidget(self.lbl_series)
+        stats_row = QHBoxLayout()
+        self.btn_stats_reset = QPushButton("Sıfırla")
+        self.btn_stats_reset.clicked.connect(lambda: (self.metrics.reset(), self._refresh_stats()))
+        stats_row.addWidget(self.btn_stats_reset)
+        self.btn_export_csv = QPushButton("CSV Dışa Aktar")
+        self.btn_export_csv.clicked.connect(self.on_export_csv)
+        stats_row.addWidget(self.btn_export_csv)
+        self.btn_export_prom = QPushButton("Prometheus Dışa Aktar")
+        self.btn_export_prom.clicked.connect(self.on_export_prometheus)
+        stats_row.addWidget(self.btn_export_prom)
+        s_layout.addLayout(stats_row)
+        self.tab_stats.setLayout(s_layout)
+
         self.setLayout(root)
 
-        # connect features preview updates via existing preview slot
-        # (BotThread will emit preview_signal, handled by _on_preview)
+        # bot previews arrive through self.preview (PreviewChannel), drawn by _render_previews
         # initialize sliders from defaults or saved hsv_settings
         self._on_bot_feature_changed(0)
 
@@ -364,6 +348,7 @@ class MainUI(QWidget):
         self.feature_panels["Health"]["enable"].setChecked(gs.get("health_enabled", False))
         self.feature_panels["Health"]["threshold"].setValue(int(gs.get("health_threshold", 50)))
         self.feature_panels["Health"]["key_edit"].setText(str(gs.get("health_key", "h")))
+        self.chk_health_predictive.setChecked(gs.get("health_predictive", False))
 
         self.feature_panels["Mana"]["enable"].setChecked(gs.get("mana_enabled", False))
         self.feature_panels["Mana"]["threshold"].setValue(int(gs.get("mana_threshold", 40)))
@@ -377,6 +362,8 @@ class MainUI(QWidget):
         self.le_pickup_key.setText(str(gs.get("pickup_key", "z")))
         self.sld_pickup.setValue(int(gs.get("pickup_interval_ms", 1500)))
         self.sld_loop.setValue(int(gs.get("loop_delay_ms", 250)))
+        self.chk_adaptive.setChecked(gs.get("adaptive_sampling", True))
+        self.chk_record.setChecked(gs.get("record_readings", False))
 
     def on_scan(self):
         found = find_window_by_title(config.WINDOW_TITLE_SUBSTRING)
@@ -386,62 +373,34 @@ class MainUI(QWidget):
             return
         self.win_info = found
         self.info_label.setText(f"Pencere bulundu: left={found['left']} top={found['top']} w={found['width']} h={found['height']}")
-        # capture once and find menu & bars
+        # capture once and find menu & bars (same frame is reused for the previews)
         sc = ScreenCapture(region=self.win_info)
         frame = sc.capture()
-        menu_matcher = TemplateMatcher(config.MENU_TEMPLATE, threshold=config.MENU_MATCH_THRESHOLD, auto_scale=True)
-        hit = menu_matcher.find_best(frame)
-        if not hit:
-            # try bottom region
-            h = frame.shape[0]; w = frame.shape[1]
-            bottom_region = frame[int(h*0.6):h, 0:w]
-            hitb = menu_matcher.find_best(bottom_region)
-            if hitb:
-                bx, by, bw, bh, score = hitb
-                hit = (bx, int(by + int(h*0.6)), bw, bh, score)
+        hit = find_menu(frame)
         if not hit:
             QMessageBox.warning(self, "Hata", "Menü bulunamadı. menu.png doğru kırpılmış mı kontrol et.")
             self.info_label.setText("Menü bulunamadı.")
             return
         mx, my, mw, mh, scv = hit
         self.menu_hit = {"x":mx, "y":my, "w":mw, "h":mh, "score":scv}
-        menu_img = frame[my:my+mh, mx:mx+mw]
-
-        # find bars inside menu_img
-        bars = {"can": config.CANBAR_TEMPLATE, "mana": config.MANABAR_TEMPLATE, "stamina": config.STAMINABAR_TEMPLATE}
-        found_bars = {}
-        for name, tpl in bars.items():
-            matcher = TemplateMatcher(tpl, threshold=config.BAR_MATCH_THRESHOLD, auto_scale=True)
-            bhit = matcher.find_best(menu_img)
-            if bhit:
-                bx, by, bw, bh, score = bhit
-                # absolute in full screen coordinates: win left/top + menu offset + bx/by
-                abs_left = self.win_info["left"] + mx + bx
-                abs_top  = self.win_info["top"] + my + by
-                found_bars[name] = {"left": abs_left, "top": abs_top, "width": bw, "height": bh, "score": score}
-        self.bar_positions = found_bars
+
+        # find bars inside the menu (concurrently, cached matchers)
+        self.bar_positions, self.bar_matchers = find_bars(frame, hit, self.win_info)
         self.lbl_positions = getattr(self, "lbl_positions", QLabel())  # if exists
         # update previews for each feature if present
         for feat_name, panel in [("Health", self.feature_panels["Health"]), ("Mana", self.feature_panels["Mana"]), ("Stamina", self.feature_panels["Stamina"])]:
             bar_key = "can" if feat_name=="Health" else ("mana" if feat_name=="Mana" else "stamina")
             if bar_key in self.bar_positions:
-                # grab a local ROI for showing preview
-                sc_local = ScreenCapture(region=self.win_info)
-                frame2 = sc_local.capture()
                 pos = self.bar_positions[bar_key]
                 lx = int(pos["left"] - self.win_info["left"]); ly = int(pos["top"] - self.win_info["top"])
                 w = int(pos["width"]); h = int(pos["height"])
-                ih, iw = frame2.shape[:2]
+                ih, iw = frame.shape[:2]
                 x0 = max(0, min(iw-1, lx)); y0 = max(0, min(ih-1, ly))
                 x1 = max(0, min(iw, x0 + w)); y1 = max(0, min(ih, y0 + h))
                 if x1>x0 and y1>y0:
-                    roi = frame2[y0:y1, x0:x1]
+                    roi = frame[y0:y1, x0:x1]
                     try:
-                        rgb = cv2.cvtColor(roi, cv2.COLOR_BGR2RGB)
-                        h0, w0 = rgb.shape[:2]
-                        qimg = QImage(rgb.data, w0, h0, 3*w0, QImage.Format_RGB888)
-                        pix = QPixmap.fromImage(qimg).scaled(panel["preview"].width(), panel["preview"].height(), Qt.KeepAspectRatio)
-                        panel["preview"].setPixmap(pix)
+                        panel["preview"].setPixmap(to_pixmap(roi, panel["preview"].width(), panel["preview"].height()))
                     except Exception:
                         pass
 
@@ -463,6 +422,7 @@ class MainUI(QWidget):
             "health_enabled": bool(self.feature_panels["Health"]["enable"].isChecked()),
             "health_threshold": int(self.feature_panels["Health"]["threshold"].value()),
             "health_key": str(self.feature_panels["Health"]["key_edit"].text() or "h"),
+            "health_predictive": bool(self.chk_health_predictive.isChecked()),
             "mana_enabled": bool(self.feature_panels["Mana"]["enable"].isChecked()),
             "mana_threshold": int(self.feature_panels["Mana"]["threshold"].value()),
             "mana_key": str(self.feature_panels["Mana"]["key_edit"].text() or "m"),
@@ -470,26 +430,51 @@ class MainUI(QWidget):
             "pickup_enabled": bool(self.chk_pickup.isChecked()),
             "pickup_key": str(self.le_pickup_key.text() or "z"),
             "pickup_interval_ms": int(self.sld_pickup.value()),
-            "loop_delay_ms": int(self.sld_loop.value())
+            "loop_delay_ms": int(self.sld_loop.value()),
+            "adaptive_sampling": bool(self.chk_adaptive.isChecked()),
+            "record_readings": bool(self.chk_record.isChecked())
         }
         # save current general settings in memory
         self.general_settings = gs
 
-        self.bot_thread = BotThread(self.win_info, self.bar_positions, loop_ms, self.checkers, gs)
+        if not gs["record_readings"] and self.timeseries is not None:
+            self.timeseries.close()
+            self.timeseries = None
+        if gs["record_readings"] and self.timeseries is None:
+            try:
+                self.timeseries = TimeSeriesStore(config.TIMESERIES_PATH, config.TIMESERIES_CAPACITY)
+            except Exception as e:
+                print("[TimeSeries] açılamadı:", e)
+        self.bot_thread = BotThread(self.win_info, self.bar_positions, loop_ms, self.checkers, gs,
+                                    bar_matchers=self.bar_matchers, input_ctrl=self.input_ctrl,
+                                    preview_channel=self.preview, metrics=self.metrics,
+                                    timeseries=self.timeseries)
         self.bot_thread.percent_signal.connect(self._on_percent)
-        self.bot_thread.preview_signal.connect(self._on_preview)
+        self.bot_thread.positions_signal.connect(self._on_positions)
+        self._update_preview_visibility()
+        self.preview_timer.start()
+        self.stats_timer.start()
         self.bot_thread.start()
         self.btn_start.setEnabled(False)
         self.btn_stop.setEnabled(True)
         self.info_label.setText("Bot çalışıyor...")
 
     def on_stop(self):
+        msg = "Bot durduruldu."
         if self.bot_thread:
             self.bot_thread.stop()
+            self.preview_timer.stop()
+            self.stats_timer.stop()
+            self._render_previews()
+            self._refresh_stats()
+            if self.timeseries is not None:
+                self.timeseries.flush()
+            st = self.bot_thread.roi_cache_stats()
+            msg += f" ROI cache: {st['hits']} hit / {st['misses']} miss (%{st['hit_ratio'] * 100:.0f})"
             self.bot_thread = None
         self.btn_start.setEnabled(True)
         self.btn_stop.setEnabled(False)
-        self.info_label.setText("Bot durduruldu.")
+        self.info_label.setText(msg)
 
     def on_save_general(self):
         # collect UI values and save to config.GENERAL_SETTINGS_PATH
@@ -497,6 +482,7 @@ class MainUI(QWidget):
             "health_enabled": bool(self.feature_panels["Health"]["enable"].isChecked()),
             "health_threshold": int(self.feature_panels["Health"]["threshold"].value()),
             "health_key": str(self.feature_panels["Health"]["key_edit"].text() or "h"),
+            "health_predictive": bool(self.chk_health_predictive.isChecked()),
             "mana_enabled": bool(self.feature_panels["Mana"]["enable"].isChecked()),
             "mana_threshold": int(self.feature_panels["Mana"]["threshold"].value()),
             "mana_key": str(self.feature_panels["Mana"]["key_edit"].text() or "m"),
@@ -504,7 +490,9 @@ class MainUI(QWidget):
             "pickup_enabled": bool(self.chk_pickup.isChecked()),
             "pickup_key": str(self.le_pickup_key.text() or "z"),
             "pickup_interval_ms": int(self.sld_pickup.value()),
-            "loop_delay_ms": int(self.sld_loop.value())
+            "loop_delay_ms": int(self.sld_loop.value()),
+            "adaptive_sampling": bool(self.chk_adaptive.isChecked()),
+            "record_readings": bool(self.chk_record.isChecked())
         }
         save_json(config.GENERAL_SETTINGS_PATH, data)
         QMessageBox.information(self, "Kaydedildi", "Genel ayarlar kaydedildi.")
@@ -513,29 +501,12 @@ class MainUI(QWidget):
     # ---------------- Bot Settings (HSV) handlers ----------------
     def _on_bot_feature_changed(self, idx):
         feat = self.cmb_feature.currentText()
-        # load from hsv_settings if present
-        hdata = load_json(config.SETTINGS_PATH) or {}
-        item = hdata.get(feat, None)
-        if item:
-            # set sliders
-            L = tuple(item.get("light", (0,0,0)))
-            LU = tuple(item.get("light_up", (0,0,0)))
-            D = tuple(item.get("dark", (0,0,0)))
-            DU = tuple(item.get("dark_up", (0,0,0)))
-        else:
-            # defaults
-            if feat == "Health":
-                L, LU = config.HEALTH_LIGHT_HSV
-                D, DU = config.HEALTH_DARK_HSV
-            elif feat == "Mana":
-                L, LU = config.MANA_LIGHT_HSV
-                D, DU = config.MANA_DARK_HSV
-            else:
-                L, LU = config.STAMINA_LIGHT_HSV
-                D, DU = config.STAMINA_DARK_HSV
+        # load from hsv_settings if present (config defaults otherwise)
+        (L, LU), (D, DU) = load_hsv_ranges(feat)
         self._set_hsv_sliders(L, LU, D, DU)
         # apply to checker immediately
         self._apply_current_hsv_to_checker()
+        self._update_preview_visibility()
 
     def _set_hsv_sliders(self, L, LU, D, DU):
         # L, LU, D, DU are tuples
@@ -549,6 +520,7 @@ class MainUI(QWidget):
         self._apply_current_hsv_to_checker()
 
     def _apply_current_hsv_to_checker(self):
+        # BotThread's analyzer picks the new ranges up on its next tick (and drops the cached percents)
         feat = self.cmb_feature.currentText()
         L = (self.hsv_sliders["L_H"].value(), self.hsv_sliders["L_S"].value(), self.hsv_sliders["L_V"].value())
         LU= (self.hsv_sliders["LU_H"].value(), self.hsv_sliders["LU_S"].value(), self.hsv_sliders["LU_V"].value())
@@ -556,8 +528,11 @@ class MainUI(QWidget):
         DU= (self.hsv_sliders["DU_H"].value(), self.hsv_sliders["DU_S"].value(), self.hsv_sliders["DU_V"].value())
         checker = self.checkers.get(feat)
         if checker:
+            # checker's color LUT only rebuilds the class (light/dark) whose range changed
             checker.set_light_hsv(L, LU)
             checker.set_dark_hsv(D, DU)
+        if self.tabs.currentWidget() is self.tab_botsettings:
+            self.preview.set_mask(feat, L, LU)
 
     def on_save_hsv(self):
         feat = self.cmb_feature.currentText()
@@ -576,27 +551,43 @@ class MainUI(QWidget):
         return mapping.get(feature_name.lower(), feature_name.lower())
 
     def on_suggest(self):
+        if self.calib_thread is not None:
+            return
         feat = self.cmb_feature.currentText()
         bar_key = self._feature_to_bar_key(feat)
         if bar_key not in self.bar_positions:
             QMessageBox.warning(self, "Hata", "Önce scan yap ve ilgili bar bulunmalı.")
             return
-        roi = self.bar_positions[bar_key]
-        sc = ScreenCapture(region=self.win_info)
-        stats = sample_hsv_stats_from_rois(sc, self.win_info, roi, n=10, delay=0.06)
-        if not stats:
+        # histograms are accumulated off the GUI thread; result arrives via _on_calibration_result
+        self.calib_thread = CalibrationThread(feat, self.bar_positions[bar_key],
+                                              frames=config.CALIBRATION_FRAMES,
+                                              interval_ms=config.CALIBRATION_INTERVAL_MS)
+        self.calib_thread.progress_signal.connect(
+            lambda done, total: self.btn_suggest.setText(f"Kalibrasyon {done}/{total}"))
+        self.calib_thread.result_signal.connect(self._on_calibration_result)
+        self.btn_suggest.setEnabled(False)
+        self.calib_thread.start()
+
+    def _on_calibration_result(self, feat, result):
+        self.calib_thread.wait()
+        self.calib_thread = None
+        self.btn_suggest.setText("Öneri Al (ROI'den)")
+        self.btn_suggest.setEnabled(True)
+        if not result:
             QMessageBox.warning(self, "Hata", "ROI'den örnek alınamadı.")
             return
-        low, up = suggest_range_from_stats(stats)
-        # apply to sliders
-        self._set_hsv_sliders(low, up, (low[0]+8, max(low[1],40), max(low[2],40)), (up[0]+8, up[1], up[2]))
-        # better: set light and dark systematically
-        L = low; LU = up
-        D = (max(0, low[0]-15), max(0, low[1]//2), max(0, low[2]//2))
-        DU= (min(180, up[0]+15), up[1], min(255, up[2]//2 + 60))
+        if self.cmb_feature.currentText() != feat:
+            self.cmb_feature.setCurrentText(feat)
+        # a class that was (almost) absent (bar full / empty while sampling) keeps its current sliders
+        L, LU = result["light"] or self._get_current_slider_light()
+        D, DU = result["dark"] or self._get_current_slider_dark()
         self._set_hsv_sliders(L, LU, D, DU)
         self._apply_current_hsv_to_checker()
-        QMessageBox.information(self, "Öneri Uygulandı", f"{feat} için öneri uygulandı.")
+        missing = [name for name, key in (("açık", "light"), ("koyu", "dark")) if result[key] is None]
+        msg = f"{feat} için öneri uygulandı ({result['count']} piksel, açık oran %{result['light_fraction'] * 100:.0f})."
+        if missing:
+            msg += f"\n{' ve '.join(missing)} renk bulunamadı (bar tam dolu/boş?); o aralık değiştirilmedi."
+        QMessageBox.information(self, "Öneri Uygulandı", msg)
 
     # ---------------- preview / percent callbacks ----------------
     def _on_percent(self, name, p):
@@ -605,88 +596,92 @@ class MainUI(QWidget):
             self.feature_panels["Health"]["threshold"]  # nothing
             # update percent label on Bot Settings side
             self.lbl_percent = getattr(self, "lbl_percent", None)
-            # display in main UI percent label
-            self.info_label.setText(f"Health: {p:.1f} %")
+            # display in main UI percent label (+ how often unchanged bars were skipped)
+            text = f"Health: {p:.1f} %"
+            if self.bot_thread:
+                text += f" | ROI cache hit: %{self.bot_thread.roi_cache_stats()['hit_ratio'] * 100:.0f}"
+            self.info_label.setText(text)
         # for Mana and Stamina you can add separate displays if desired
 
-    def _on_preview(self, name, img):
-        # show preview only for the currently selected feature in both tabs
-        # convert BGR->RGB and show in both relevant preview labels
+    def _on_positions(self, positions):
+        # bars were re-localized live by BotThread (menu moved / UI scale changed)
+        self.bar_positions = positions
+
+    def _update_preview_visibility(self):
+        # only widgets that are on screen get frames; the mask is computed only for the Bot Settings tab
+        if self.isMinimized():
+            self.preview.set_visible(())
+        elif self.tabs.currentWidget() is self.tab_botsettings:
+            feat = self.cmb_feature.currentText()
+            self.preview.set_visible((feat,))
+            self.preview.set_mask(feat, *self._get_current_slider_light())
+        else:
+            self.preview.set_visible(self.feature_panels.keys())
+            self.preview.set_mask(None)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if hasattr(self, "preview") and hasattr(self, "tabs"):
+            self._update_preview_visibility()
+
+    def _render_previews(self):
+        # GUI timer: draw the latest frame of each visible bar (mask already computed by the bot thread)
+        for name, (img, mask) in self.preview.take().items():
+            try:
+                if self.tabs.currentWidget() is self.tab_botsettings:
+                    if name != self.cmb_feature.currentText():
+                        continue
+                    self.lbl_bot_preview.setPixmap(to_pixmap(img, self.lbl_bot_preview.width(), self.lbl_bot_preview.height()))
+                    if mask is not None:
+                        self.lbl_bot_mask.setPixmap(to_pixmap(mask, self.lbl_bot_mask.width(), self.lbl_bot_mask.height()))
+                elif name in self.feature_panels:
+                    panel = self.feature_panels[name]
+                    panel["preview"].setPixmap(to_pixmap(img, panel["preview"].width(), panel["preview"].height()))
+            except Exception:
+                pass
+
+    # ---------------- stats tab ----------------
+    def _refresh_stats(self):
+        # only redraw while the tab is on screen; recording itself never waits for the UI
+        if self.tabs.currentWidget() is not self.tab_stats:
+            return
+        stats, fps = self.metrics.snapshot()
+        self.lbl_fps.setText(f"FPS: {fps:.1f}")
+        self.tbl_stats.setRowCount(len(stats))
+        self.tbl_stats.setVerticalHeaderLabels(list(stats.keys()))
+        cols = ("count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+        for r, s in enumerate(stats.values()):
+            for c, col in enumerate(cols):
+                text = str(s[col]) if col == "count" else f"{s[col]:.3f}"
+                self.tbl_stats.setItem(r, c, QTableWidgetItem(text))
+        if self.timeseries is not None:
+            parts = [f"{name}: min %{v['min']:.0f} ort %{v['mean']:.0f} ({v['actions']} tuş)"
+                     for name, v in self.timeseries.summary(60).items()]
+            self.lbl_series.setText("Son 60 sn: " + (" | ".join(parts) or "-"))
+
+    def on_export_csv(self):
         try:
-            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            h, w = rgb.shape[:2]
-            qimg = QImage(rgb.data, w, h, 3*w, QImage.Format_RGB888)
-            # If selected feature in Bot Settings matches this preview, show in bot preview
-            if self.cmb_feature.currentText().lower() == ("health" if name=="Health" else name.lower()):
-                pix = QPixmap.fromImage(qimg).scaled(self.lbl_bot_preview.width(), self.lbl_bot_preview.height(), Qt.KeepAspectRatio)
-                self.lbl_bot_preview.setPixmap(pix)
-                # also compute mask and show
-                low, up = self._get_current_slider_light()
-                hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-                mask = cv2.inRange(hsv, np.array(low, dtype=np.uint8), np.array(up, dtype=np.uint8))
-                kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3,3))
-                mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-                mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-                mask_rgb = cv2.cvtColor(mask, cv2.COLOR_GRAY2RGB)
-                qimg2 = QImage(mask_rgb.data, mask_rgb.shape[1], mask_rgb.shape[0], 3*mask_rgb.shape[1], QImage.Format_RGB888)
-                pix2 = QPixmap.fromImage(qimg2).scaled(self.lbl_bot_mask.width(), self.lbl_bot_mask.height(), Qt.KeepAspectRatio)
-                self.lbl_bot_mask.setPixmap(pix2)
-            # update small preview in General tab panels if matches
-            if (name=="Health" and "Health" in self.feature_panels) or (name=="Mana" and "Mana" in self.feature_panels) or (name=="Stamina" and "Stamina" in self.feature_panels):
-                panel = self.feature_panels["Health"] if name=="Health" else (self.feature_panels["Mana"] if name=="Mana" else self.feature_panels["Stamina"])
-                pix_small = QPixmap.fromImage(qimg).scaled(panel["preview"].width(), panel["preview"].height(), Qt.KeepAspectRatio)
-                panel["preview"].setPixmap(pix_small)
+            self.metrics.export_csv(config.METRICS_CSV_PATH)
+            QMessageBox.information(self, "Kaydedildi", f"İstatistikler kaydedildi: {config.METRICS_CSV_PATH}")
         except Exception as e:
-            pass
+            QMessageBox.warning(self, "Hata", f"CSV yazılamadı: {e}")
+
+    def on_export_prometheus(self):
+        try:
+            self.metrics.export_prometheus(config.METRICS_PROM_PATH)
+            QMessageBox.information(self, "Kaydedildi", f"İstatistikler kaydedildi: {config.METRICS_PROM_PATH}")
+        except Exception as e:
+            QMessageBox.warning(self, "Hata", f"Prometheus dosyası yazılamadı: {e}")
 
     def _get_current_slider_light(self):
         L = (self.hsv_sliders["L_H"].value(), self.hsv_sliders["L_S"].value(), self.hsv_sliders["L_V"].value())
         LU= (self.hsv_sliders["LU_H"].value(), self.hsv_sliders["LU_S"].value(), self.hsv_sliders["LU_V"].value())
         return L, LU
 
-# helper functions used (sampling and suggestion) - same as earlier implementation
-def sample_hsv_stats_from_rois(scapture, win_info, roi_abs, n=8, delay=0.06):
-    import numpy as np
-    all_pixels = []
-    for i in range(n):
-        try:
-            frame = scapture.capture()
-        except Exception as e:
-            time.sleep(delay)
-            continue
-        lx = int(roi_abs["left"] - win_info["left"])
-        ly = int(roi_abs["top"] - win_info["top"])
-        w = int(roi_abs["width"]); h = int(roi_abs["height"])
-        ih, iw = frame.shape[:2]
-        x0 = max(0, min(iw-1, lx)); y0 = max(0, min(ih-1, ly))
-        x1 = max(0, min(iw, x0 + w)); y1 = max(0, min(ih, y0 + h))
-        if x1 <= x0 or y1 <= y0:
-            time.sleep(delay)
-            continue
-        roi = frame[y0:y1, x0:x1]
-        if roi.size == 0:
-            time.sleep(delay)
-            continue
-        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
-        pixels = hsv.reshape(-1,3)
-        all_pixels.append(pixels)
-        time.sleep(delay)
-    if not all_pixels:
-        return None
-    all_pixels = np.vstack(all_pixels)
-    med = np.median(all_pixels, axis=0).astype(int)
-    std = np.std(all_pixels, axis=0).astype(int)
-    return {"median": tuple(med.tolist()), "std": tuple(std.tolist()), "count": int(all_pixels.shape[0])}
-
-def suggest_range_from_stats(stats, h_margin=12, s_margin=40, v_margin=40):
-    mh, ms, mv = stats["median"]
-    sh, ss, sv = stats["std"]
-    h_m = max(h_margin, int(1.2*sh))
-    s_m = max(s_margin, int(1.2*ss))
-    v_m = max(v_margin, int(1.2*sv))
-    low = (max(0, mh - h_m), max(0, ms - s_m), max(0, mv - v_m))
-    up  = (min(180, mh + h_m), min(255, ms + s_m), min(255, mv + v_m))
-    return low, up
+    def _get_current_slider_dark(self):
+        D = (self.hsv_sliders["D_H"].value(), self.hsv_sliders["D_S"].value(), self.hsv_sliders["D_V"].value())
+        DU= (self.hsv_sliders["DU_H"].value(), self.hsv_sliders["DU_S"].value(), self.hsv_sliders["DU_V"].value())
+        return D, DU
 
 # ---------- RUN ----------
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+import threading
+import time
+import cv2
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+
+from features.health_checker import clean_mask
+
+# Qt >= 5.14: BGR frames are wrapped without a per-frame BGR->RGB conversion
+_FORMAT_BGR888 = getattr(QImage, "Format_BGR888", None)
+
+PREVIEW_FPS = 15
+
+
+def to_pixmap(img, width, height):
+    """BGR (HxWx3) veya gri maske (HxW) -> label boyutuna ölçeklenmiş QPixmap."""
+    # QImage needs a contiguous buffer (e.g. a frame[y0:y1, x0:x1] slice is not)
+    img = np.ascontiguousarray(img)
+    h, w = img.shape[:2]
+    if img.ndim == 2:
+        qimg = QImage(img.data, w, h, img.strides[0], QImage.Format_Grayscale8)
+    elif _FORMAT_BGR888 is not None:
+        qimg = QImage(img.data, w, h, img.strides[0], _FORMAT_BGR888)
+    else:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        qimg = QImage(img.data, w, h, img.strides[0], QImage.Format_RGB888)
+    # fromImage kopyalar; numpy buffer'ının bundan sonra yaşaması gerekmez
+    return QPixmap.fromImage(qimg).scaled(width, height, Qt.KeepAspectRatio)
+
+
+class PreviewChannel:
+    """
+    Bot thread'i ile GUI arasında birleştirici (coalescing) önizleme kanalı.
+
+    Bot thread'i push() ile her bar için sadece en son frame'i bırakır (kuyruk yok, sinyal
+    yok); GUI bir QTimer ile en fazla max_fps kez take() çağırıp hazır olanları çizer.
+    Görünür olmayan bar'lar için push() hiçbir iş yapmaz; görünür olanlar bar başına en fazla
+    max_fps kez yayınlanır. Arada gelen frame'ler kopyalanmaz: push() True döner ve BotEngine
+    aynı bar'ın güncel view'ini (bar değişmemiş olsa da) sonraki tick'lerde tekrar gönderir, böylece
+    bir değişiklik serisinin son frame'i de gösterilir. Kopya ve maske (HSV + inRange + open/close)
+    push() içinde, yani bot thread'inde yapılır; take() sadece dict'leri değiştirir, GUI
+    thread'ine QPixmap'e sarma ve ölçekleme kalır.
+    """
+    def __init__(self, max_fps=PREVIEW_FPS):
+        self.interval_ms = max(1, int(1000 / max_fps))
+        self._lock = threading.Lock()
+        self._latest = {}          # feature -> (bgr, mask or None)
+        self._wanted = set()       # features with a visible preview widget
+        self._mask_feature = None
+        self._mask_range = None    # (lower, upper) light HSV
+        self._last_push = {}       # feature -> monotonic time of the last published frame
+        self.pushed = 0
+        self.dropped = 0           # frames overwritten before the GUI took them
+        self.skipped = 0           # pushes held back by the rate limit (no copy, no mask work)
+
+    def set_visible(self, features):
+        with self._lock:
+            self._wanted = set(features)
+            for feat in list(self._latest):
+                if feat not in self._wanted:
+                    del self._latest[feat]
+
+    def set_mask(self, feature, lower=None, upper=None):
+        """feature None ise maske hesaplanmaz (Bot Ayarları sekmesi görünmüyor)."""
+        with self._lock:
+            self._mask_feature = feature
+            self._mask_range = None if feature is None else (np.array(lower, dtype=np.uint8),
+                                                             np.array(upper, dtype=np.uint8))
+
+    def push(self, feature, roi_bgr):
+        """
+        Bot thread'inden çağrılır; roi'nin sahipliğini almaz (yayınlanırsa kopyalar). BGR veya BGRA kabul eder.
+        Dönüş: frame rate limit yüzünden bekletildiyse True — çağıran, aynı bar'ı bir sonraki
+        tick'te tekrar göndermelidir.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if feature not in self._wanted:
+                return False
+            if (now - self._last_push.get(feature, -1e9)) * 1000.0 < self.interval_ms:
+                self.skipped += 1
+                return True
+            self._last_push[feature] = now
+            rng = self._mask_range if feature == self._mask_feature else None
+        img = np.array(roi_bgr[..., :3], order="C")
+        mask = None
+        if rng is not None:
+            mask = clean_mask(cv2.inRange(cv2.cvtColor(img, cv2.COLOR_BGR2HSV), rng[0], rng[1]))
+        with self._lock:
+            if feature not in self._wanted:
+                return False
+            if feature in self._latest:
+                self.dropped += 1
+            self._latest[feature] = (img, mask)
+            self.pushed += 1
+        return False
+
+    def take(self):
+        """GUI thread'inden: {feature: (bgr, mask)} — son take()'ten beri yayınlanan en son frame'ler."""
+        with self._lock:
+            out, self._latest = self._latest, {}
+        return out